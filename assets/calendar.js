@@ -0,0 +1,115 @@
+// Month navigation on /events/calendar over /calendar-index.json (written at
+// ingest by scripts/fetch_meetup.py, see pyzgz/calendar_index.py). The page
+// is prerendered with one month; the index is fetched on the first move and
+// every other month is rendered from it, one lookup per month.
+// Cell markup and styles must match events_page._month_grid.
+(() => {
+  if (window.pyzgzCalendar) return; // the page may load this more than once
+  window.pyzgzCalendar = true;
+  const INDEX_URL = "/calendar-index.json";
+  const DETAIL_DIR = "/event/"; // event_details.detail_url
+  const MONTH_NAMES = [
+    "enero", "febrero", "marzo", "abril", "mayo", "junio",
+    "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre",
+  ];
+  const WEEKDAYS = ["L", "M", "X", "J", "V", "S", "D"];
+  const WEEKDAY_STYLE = "text-align:center;font-weight:bold;opacity:0.7";
+  const DAY_STYLE =
+    "min-height:5rem;padding:4px;border:1px solid var(--gray-a5);" +
+    "border-radius:6px;font-size:0.85rem;overflow:hidden";
+  const EVENT_STYLE = "display:block;margin-top:2px";
+  const MONTH_RE = /^\d{4}-\d{2}$/;
+
+  let loading = null;
+  let index = null;
+
+  function load() {
+    loading ??= fetch(INDEX_URL)
+      .then((r) => (r.ok ? r.json() : null))
+      .then((data) => {
+        if (data && data.v === 1) index = data;
+      })
+      .catch(() => {});
+    return loading;
+  }
+
+  const monthKey = (y, m) => `${y}-${String(m).padStart(2, "0")}`;
+  const title = (y, m) =>
+    `${MONTH_NAMES[m - 1][0].toUpperCase()}${MONTH_NAMES[m - 1].slice(1)} ${y}`;
+
+  function shift(key, delta) {
+    const [y, m] = key.split("-").map(Number);
+    const total = y * 12 + (m - 1) + delta;
+    return monthKey(Math.floor(total / 12), (total % 12) + 1);
+  }
+
+  function cell(style, ...children) {
+    const div = document.createElement("div");
+    if (style) div.style.cssText = style;
+    div.append(...children);
+    return div;
+  }
+
+  function renderGrid(grid, key) {
+    const [y, m] = key.split("-").map(Number);
+    const byDay = new Map();
+    for (const row of index.months[key] || []) {
+      if (!byDay.has(row[0])) byDay.set(row[0], []);
+      byDay.get(row[0]).push(row);
+    }
+    const firstWeekday = (new Date(Date.UTC(y, m - 1, 1)).getUTCDay() + 6) % 7;
+    const days = new Date(Date.UTC(y, m, 0)).getUTCDate();
+    const cells = WEEKDAYS.map((d) => cell(WEEKDAY_STYLE, d));
+    for (let i = 0; i < firstWeekday; i++) cells.push(cell(""));
+    for (let day = 1; day <= days; day++) {
+      const number = document.createElement("strong");
+      number.textContent = String(day);
+      const links = (byDay.get(day) || []).map(([, hhmm, name, eventKey]) => {
+        const a = document.createElement("a");
+        a.href = `${DETAIL_DIR}${encodeURIComponent(eventKey)}.html`;
+        a.style.cssText = EVENT_STYLE;
+        a.textContent = `${hhmm} ${name}`;
+        return a;
+      });
+      cells.push(cell(DAY_STYLE, number, ...links));
+    }
+    grid.replaceChildren(...cells);
+  }
+
+  async function show(key) {
+    const root = document.getElementById("calendar");
+    const grid = document.getElementById("calendar-grid");
+    if (!root || !grid || !MONTH_RE.test(key)) return;
+    if (!index) await load();
+    if (!index) return;
+    // Months with events, plus the one shown (the page may open on an empty one)
+    const bounds = [...Object.keys(index.counts), root.dataset.month].sort();
+    if (key < bounds[0] || key > bounds[bounds.length - 1]) return;
+    const [y, m] = key.split("-").map(Number);
+    renderGrid(grid, key);
+    root.dataset.month = key;
+    const heading = document.getElementById("calendar-title");
+    if (heading) heading.textContent = title(y, m);
+    const select = document.getElementById("calendar-month");
+    if (select && select.querySelector(`option[value="${key}"]`)) select.value = key;
+    history.replaceState(null, "", `#${key}`);
+  }
+
+  // Delegated listeners: React may re-create the page on navigation
+  document.addEventListener("click", (e) => {
+    const button = e.target.closest && e.target.closest("#calendar-prev, #calendar-next");
+    const root = document.getElementById("calendar");
+    if (!button || !root) return;
+    show(shift(root.dataset.month, button.id === "calendar-prev" ? -1 : 1));
+  });
+  document.addEventListener("change", (e) => {
+    if (e.target.id === "calendar-month") show(e.target.value);
+  });
+  const fromHash = () => show(location.hash.slice(1));
+  window.addEventListener("hashchange", fromHash);
+  if (document.readyState === "loading") {
+    document.addEventListener("DOMContentLoaded", fromHash);
+  } else {
+    fromHash();
+  }
+})();
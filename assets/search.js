@@ -0,0 +1,147 @@
+// Site search over /search-index.json (built by scripts/build_search_index.py).
+// The index is fetched on first focus of the search box; queries run locally.
+// fold(), tokens and ranking must match build_search_index.py.
+(() => {
+  if (window.pyzgzSearch) return; // the page head may load this more than once
+  window.pyzgzSearch = true;
+  const INDEX_URL = "/search-index.json";
+  const INPUT_ID = "site-search";
+  const RESULTS_ID = "site-search-results";
+  const MAX_EXPANSIONS = 64;
+  const MAX_RESULTS = 8;
+
+  let loading = null;
+  let index = null;
+  let stop = new Set();
+  const decoded = new Map(); // term position -> doc*2 + in_title values
+
+  const fold = (s) =>
+    s.normalize("NFD").replace(/\p{Mn}/gu, "").toLowerCase();
+
+  function load() {
+    loading ??= fetch(INDEX_URL)
+      .then((r) => (r.ok ? r.json() : null))
+      .then((data) => {
+        if (data && data.v === 1) {
+          index = data;
+          stop = new Set(data.stop);
+        }
+      })
+      .catch(() => {});
+    return loading;
+  }
+
+  function postings(i) {
+    let values = decoded.get(i);
+    if (!values) {
+      let total = 0;
+      values = index.postings[i].map((d) => (total += d));
+      decoded.set(i, values);
+    }
+    return values;
+  }
+
+  function lowerBound(terms, token) {
+    let lo = 0;
+    let hi = terms.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (terms[mid] < token) lo = mid + 1;
+      else hi = mid;
+    }
+    return lo;
+  }
+
+  function search(query) {
+    const tokens = fold(query)
+      .split(/[^a-z0-9]+/)
+      .filter((t) => t && !stop.has(t));
+    const terms = index.terms;
+    let scores = null;
+    for (const token of tokens) {
+      const found = new Map();
+      let i = lowerBound(terms, token);
+      const end = Math.min(terms.length, i + MAX_EXPANSIONS);
+      for (; i < end && terms[i].startsWith(token); i++) {
+        const exact = terms[i] === token;
+        for (const value of postings(i)) {
+          const doc = value >> 1;
+          const score = (exact ? 2 : 1) * (value & 1 ? 2 : 1);
+          found.set(doc, Math.max(found.get(doc) || 0, score));
+        }
+      }
+      if (scores === null) {
+        scores = found;
+      } else {
+        for (const [doc, score] of scores) {
+          if (found.has(doc)) scores.set(doc, score + found.get(doc));
+          else scores.delete(doc);
+        }
+      }
+    }
+    return [...(scores || [])]
+      .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+      .slice(0, MAX_RESULTS)
+      .map(([doc]) => index.docs[doc]);
+  }
+
+  function render(box, results, query) {
+    box.replaceChildren();
+    box.hidden = !query;
+    if (!query) return;
+    if (!results.length) {
+      const empty = document.createElement("div");
+      empty.textContent = "Sin resultados";
+      empty.style.padding = "0.5rem 0.75rem";
+      box.append(empty);
+      return;
+    }
+    for (const [title, url, subtitle, kind] of results) {
+      const link = document.createElement("a");
+      link.href = url;
+      if (/^https?:/.test(url)) link.rel = "noopener";
+      link.style.cssText = "display:block;padding:0.5rem 0.75rem";
+      const name = document.createElement("div");
+      name.textContent = title;
+      const meta = document.createElement("small");
+      meta.textContent = [kind, subtitle].filter(Boolean).join(" · ");
+      meta.style.opacity = "0.7";
+      link.append(name, meta);
+      box.append(link);
+    }
+  }
+
+  async function update(input) {
+    const box = document.getElementById(RESULTS_ID);
+    if (!box) return;
+    const query = input.value.trim();
+    if (query && !index) await load();
+    if (input.value.trim() !== query) return; // a newer keystroke took over
+    render(box, query && index ? search(query) : [], query);
+  }
+
+  // Delegated listeners: React may re-create the nav on navigation
+  document.addEventListener("focusin", (e) => {
+    if (e.target.id === INPUT_ID) load();
+  });
+  document.addEventListener("input", (e) => {
+    if (e.target.id === INPUT_ID) update(e.target);
+  });
+  document.addEventListener("keydown", (e) => {
+    if (e.target.id !== INPUT_ID) return;
+    const box = document.getElementById(RESULTS_ID);
+    if (e.key === "Escape") {
+      e.target.value = "";
+      if (box) render(box, [], "");
+    } else if (e.key === "Enter") {
+      const first = box && box.querySelector("a");
+      if (first) first.click();
+    }
+  });
+  document.addEventListener("click", (e) => {
+    const box = document.getElementById(RESULTS_ID);
+    if (box && !box.hidden && !e.target.closest(`#${RESULTS_ID}, #${INPUT_ID}`)) {
+      box.hidden = true;
+    }
+  });
+})();
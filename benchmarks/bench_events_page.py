@@ -0,0 +1,141 @@
+"""
+Benchmark the events page data path on a synthetic events.json.
+
+Compares the previous dict-based path (load, split with repeated
+_parse_when calls, then per-card parsing/formatting) with the normalized
+Event loader (cold: first load; warm: cached on the file's mtime).
+
+    uv run python benchmarks/bench_events_page.py --events 50000
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from stub_server import ROOT_DIR, START_MS, synthetic_api_events
+
+sys.path.insert(0, ROOT_DIR)
+
+from pyzgz import events_page  # noqa: E402
+
+
+# Previous implementation, kept as the baseline (see git history)
+def _parse_when(ev: dict) -> datetime | None:
+    """Parse event date from common fields (iso string or epoch ms)."""
+    # Accept 'time' (ms since epoch) or 'date'/'local_date' (ISO-like)
+    t = ev.get("time")
+    if isinstance(t, (int, float)):
+        try:
+            return datetime.fromtimestamp(float(t) / 1000.0, tz=timezone.utc)
+        except Exception:
+            pass
+    for key in ("date", "local_date", "utc_time", "iso_time"):
+        val = ev.get(key)
+        if isinstance(val, str):
+            try:
+                # Try full ISO first
+                return datetime.fromisoformat(val.replace("Z", "+00:00"))
+            except Exception:
+                try:
+                    # Try date only
+                    return datetime.strptime(val, "%Y-%m-%d").replace(
+                        tzinfo=timezone.utc
+                    )
+                except Exception:
+                    pass
+    return None
+
+
+def _format_when(dt: datetime | None) -> str:
+    if not dt:
+        return ""
+    local = dt.astimezone()  # viewer local time
+    return local.strftime("%d %b %Y, %H:%M")
+
+
+def legacy_split(events: list[dict]) -> tuple[list[dict], list[dict]]:
+    now = datetime.now(timezone.utc)
+    enriched: list[tuple[dict, datetime | None]] = [(e, _parse_when(e)) for e in events]
+    upcoming = [e for e, d in enriched if d and d >= now]
+    past = [e for e, d in enriched if d and d < now]
+    # sort
+    upcoming.sort(key=lambda e: _parse_when(e) or now)
+    past.sort(key=lambda e: _parse_when(e) or now, reverse=True)
+    return upcoming, past
+
+
+def legacy_card_fields(ev: dict) -> tuple[Any, ...]:
+    title = ev.get("name") or ev.get("title") or "Evento"
+    url = ev.get("link") or ev.get("url") or "#"
+    when = _format_when(_parse_when(ev))
+    venue = (
+        ev.get("venue", {}).get("name")
+        if isinstance(ev.get("venue"), dict)
+        else ev.get("venue")
+    )
+    return title, url, when, venue
+
+
+def legacy(path: str) -> int:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    upcoming, past = legacy_split(data)
+    return len([legacy_card_fields(ev) for ev in upcoming + past])
+
+
+def normalized() -> int:
+    upcoming, past = events_page._split_events(events_page._load_events())
+    return len([(e.title, e.url, e.when_display, e.venue) for e in upcoming + past])
+
+
+def _best(fn: Callable[[], int], repeat: int) -> tuple[float, int]:
+    best, n = float("inf"), 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        n = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, n
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Half of the synthetic events are in the future
+    offset = args.events // 2 * 7 * 24 * 3600 * 1000
+    events = [
+        {**ev, "time": ev["time"] + offset, "description": ev["name"]}
+        for ev in synthetic_api_events("bench_group", args.events)
+    ]
+    assert events[0]["time"] > START_MS
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "events.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(events, f)
+        events_page.ASSETS_EVENTS = path
+
+        def cold() -> int:
+            events_page._events_cache.clear()
+            return normalized()
+
+        runs = {
+            "legacy dicts     ": lambda: legacy(path),
+            "normalized (cold)": cold,
+            "normalized (warm)": normalized,
+        }
+        for label, fn in runs.items():
+            dt, n = _best(fn, args.repeat)
+            print(f"{label}: {dt * 1000:9.1f} ms  ({n} events)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
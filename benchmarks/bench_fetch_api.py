@@ -0,0 +1,61 @@
+"""
+Benchmark the paginated Meetup API fetch against the local stub server.
+
+Compares the old single-request fetch (one page of 200, the rest is lost)
+with the paginated fetcher at several concurrency limits.
+
+    uv run python benchmarks/bench_fetch_api.py --events 10000 --latency 0.05
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from stub_server import import_fetch_meetup, serve
+
+
+def _single_request(base_url: str, group: str) -> int:
+    with httpx.Client(timeout=20.0) as client:
+        r = client.get(
+            f"{base_url}/{group}/events",
+            params={"status": "upcoming,past", "desc": "true", "page": 200},
+        )
+        r.raise_for_status()
+        return len(r.json())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    fm = import_fetch_meetup()
+    group = "bench_group"
+    with serve(events=args.events, latency=args.latency) as base_url:
+        fm.API_BASE = base_url
+
+        t0 = time.perf_counter()
+        got = _single_request(base_url, group)
+        dt = time.perf_counter() - t0
+        print(
+            f"single request   : {got:>6} events in {dt:6.3f}s (lost {args.events - got})"
+        )
+
+        for c in args.concurrency:
+            t0 = time.perf_counter()
+            events = asyncio.run(fm.fetch_api_async(group, "token", concurrency=c))
+            dt = time.perf_counter() - t0
+            print(
+                f"paginated c={c:<3} : {len(events):>6} events in {dt:6.3f}s "
+                f"({len(events) / dt:,.0f} events/s)"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
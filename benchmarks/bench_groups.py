@@ -0,0 +1,77 @@
+"""
+Load-test the multi-group fetch against the local stub server.
+
+Fetches API + iCal for many groups over one shared client at several group
+concurrency limits, and checks from the stub's request log that no second
+saw more requests to the (single) stub host than the rate limit allows
+(with 10% slack: the limiter spaces requests when they are sent, and
+arrivals at the server jitter a little).
+
+    uv run python benchmarks/bench_groups.py --groups 60 --events 400 --rate 50
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import time
+from bisect import bisect_left
+from typing import List, Tuple
+
+from stub_server import import_fetch_meetup, serve
+
+
+def _peak_rate(log: List[Tuple[float, str]]) -> int:
+    """Most requests that started within any one-second window."""
+    times = sorted(t for t, _ in log)
+    return max(
+        (i - bisect_left(times, t - 1.0) + 1 for i, t in enumerate(times)), default=0
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--groups", type=int, default=60)
+    parser.add_argument("--events", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--rate", type=float, default=50.0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    fm = import_fetch_meetup()
+    groups = [f"group_{i:03d}" for i in range(args.groups)]
+    failed = False
+    for c in args.concurrency:
+        log: List[Tuple[float, str]] = []
+        with serve(args.events, args.latency, request_log=log) as base_url:
+            fm.API_BASE = fm.ICAL_BASE = base_url
+            t0 = time.perf_counter()
+            results = asyncio.run(
+                fm.fetch_groups(groups, "token", group_concurrency=c, rate=args.rate)
+            )
+            dt = time.perf_counter() - t0
+        errors = [
+            f"{g}:{name}"
+            for g, by_source in results.items()
+            for name, r in by_source.items()
+            if isinstance(r, Exception)
+        ]
+        events = sum(
+            len(r)
+            for by_source in results.values()
+            for r in by_source.values()
+            if not isinstance(r, Exception)
+        )
+        peak = _peak_rate(log)
+        limit = f"{args.rate:g}" if args.rate else "off"
+        ok = not errors and (not args.rate or peak <= args.rate * 1.1 + 1)
+        failed |= not ok
+        print(
+            f"groups={args.groups} c={c:<3}: {dt:6.2f}s, {len(log)} requests, "
+            f"{events} events, peak {peak} req/s (limit {limit}), "
+            f"{len(errors)} errors{'' if ok else '  FAIL'}"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
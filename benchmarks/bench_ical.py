@@ -0,0 +1,192 @@
+"""
+Benchmark the streaming iCal parser against the previous implementation.
+
+Reports parse throughput (events/s) on an in-memory feed and, end to end
+against the local stub server, wall time and peak traced memory.
+
+    uv run python benchmarks/bench_ical.py --events 20000
+"""
+
+from __future__ import annotations
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+import httpx
+
+from stub_server import import_fetch_meetup, serve, synthetic_ical
+
+
+def legacy_parse(text: str) -> List[Dict[str, Any]]:
+    """The pre-streaming fetch_ical parsing code, kept as the baseline."""
+    raw_lines = text.splitlines()
+
+    # Unfold folded lines per RFC 5545 (lines starting with space continue previous)
+    lines: List[str] = []
+    for raw in raw_lines:
+        if raw.startswith(" ") and lines:
+            lines[-1] += raw[1:]
+        else:
+            lines.append(raw)
+
+    events: List[Dict[str, Any]] = []
+    cur: Dict[str, Any] | None = None
+
+    for raw in lines:
+        line = raw.strip()
+        if line == "BEGIN:VEVENT":
+            cur = {}
+            continue
+        if line == "END:VEVENT":
+            if cur:
+                # DTSTART may appear as DTSTART or DTSTART;TZID=...
+                dt = cur.get("DTSTART")
+                tzid = cur.get("DTSTART_TZID")
+                time_ms = None
+                if isinstance(dt, str) and dt:
+                    from datetime import datetime, timezone
+                    from zoneinfo import ZoneInfo
+
+                    # Try several common formats
+                    fmts = [
+                        "%Y%m%dT%H%M%SZ",  # UTC with Z
+                        "%Y%m%dT%H%M%S",  # no Z
+                        "%Y%m%dT%H%M",  # minutes precision
+                    ]
+                    for fmt in fmts:
+                        try:
+                            dt_obj = datetime.strptime(dt, fmt)
+                            # If the string ends with Z, it's already UTC.
+                            # If no Z and TZID provided, localize with that tz.
+                            if dt.endswith("Z"):
+                                dt_obj = dt_obj.replace(tzinfo=timezone.utc)
+                            elif tzid:
+                                try:
+                                    dt_obj = dt_obj.replace(tzinfo=ZoneInfo(tzid))
+                                except Exception:
+                                    # Fallback to Europe/Madrid if TZID unknown
+                                    dt_obj = dt_obj.replace(
+                                        tzinfo=ZoneInfo("Europe/Madrid")
+                                    )
+                            else:
+                                # No tz info; assume Europe/Madrid as Meetup feed usually emits local time
+                                dt_obj = dt_obj.replace(
+                                    tzinfo=ZoneInfo("Europe/Madrid")
+                                )
+                            # Convert to UTC for storage
+                            dt_obj = dt_obj.astimezone(timezone.utc)
+                            time_ms = int(dt_obj.timestamp() * 1000)
+                            break
+                        except Exception:
+                            continue
+
+                events.append(
+                    {
+                        "name": cur.get("SUMMARY"),
+                        "link": cur.get("URL"),
+                        "time": time_ms,
+                        "venue": (
+                            {"name": cur.get("LOCATION")}
+                            if cur.get("LOCATION")
+                            else None
+                        ),
+                        # Per request: use SUMMARY as description in iCal too
+                        # "description": cur.get("SUMMARY"),
+                    }
+                )
+            cur = None
+            continue
+
+        if cur is None:
+            continue
+
+        # KEY:VALUE or KEY;PARAM=...:VALUE
+        if ":" in line:
+            left, value = line.split(":", 1)
+            value = value.strip()
+            # Extract base key and params
+            if ";" in left:
+                base, param_str = left.split(";", 1)
+                base_key = base.strip().upper()
+                # Very light param parsing (e.g., TZID=Europe/Madrid)
+                params = {}
+                for part in param_str.split(";"):
+                    if "=" in part:
+                        k, v = part.split("=", 1)
+                        params[k.strip().upper()] = v.strip()
+            else:
+                base_key = left.strip().upper()
+                params = {}
+
+            cur[base_key] = value
+            # Capture TZID for DTSTART if present
+            if base_key == "DTSTART" and "TZID" in params:
+                cur["DTSTART_TZID"] = params["TZID"]
+        else:
+            # No colon; ignore
+            pass
+
+    return events
+
+
+def legacy_fetch(base_url: str, group: str) -> List[Dict[str, Any]]:
+    with httpx.Client(timeout=20.0) as client:
+        r = client.get(f"{base_url}/{group}/events/ical/")
+        return legacy_parse(r.text)
+
+
+def _timed(fn: Callable[[], List[Dict[str, Any]]]) -> tuple[float, int]:
+    t0 = time.perf_counter()
+    n = len(fn())
+    return time.perf_counter() - t0, n
+
+
+def _peak(fn: Callable[[], List[Dict[str, Any]]]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    fm = import_fetch_meetup()
+    group = "bench_group"
+    text = synthetic_ical(group, args.events)
+    print(f"feed: {args.events} VEVENTs, {len(text.encode()) / 1e6:.1f} MB")
+
+    assert legacy_parse(text) == list(fm.iter_ical_events(text.splitlines()))
+
+    parsers = {
+        "legacy   ": lambda: legacy_parse(text),
+        "streaming": lambda: list(fm.iter_ical_events(text.splitlines())),
+    }
+    for label, fn in parsers.items():
+        dt, n = min(_timed(fn) for _ in range(args.repeat))
+        print(f"parse {label}: {dt:6.3f}s  {n / dt:>10,.0f} events/s")
+
+    with serve(events=args.events) as base_url:
+        fm.ICAL_BASE = base_url
+        fetchers = {
+            "legacy   ": lambda: legacy_fetch(base_url, group),
+            "streaming": lambda: fm.fetch_ical(group),
+        }
+        for label, fn in fetchers.items():
+            dt, n = min(_timed(fn) for _ in range(args.repeat))
+            peak = _peak(fn)
+            print(
+                f"fetch {label}: {dt:6.3f}s  {n / dt:>10,.0f} events/s  "
+                f"peak {peak / 1e6:6.1f} MB"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
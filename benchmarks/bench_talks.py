@@ -0,0 +1,309 @@
+"""
+Load-test the talk proposal backend (pyzgz/talk_proposals.py).
+
+Starts the endpoint under granian on a free port, with a throwaway SQLite
+database and upload directory, once per --batch size (1 is a transaction
+per proposal, the write queue off in effect). For --seconds, --clients
+concurrent clients post proposals, each from its own X-Forwarded-For
+address so the per-IP rate limit stays out of the way; a --pdf-ratio share
+of them attaches a --pdf-kb PDF. Reports sustained submissions/s, latency
+percentiles, status codes, the rows in the database against the accepted
+responses, and the server's peak RSS. A last phase posts from a single
+address and checks that the rate limit answers 429 past its burst.
+
+    uv run python benchmarks/bench_talks.py --clients 64 --seconds 10 --batch 1 64
+    uv run python benchmarks/bench_talks.py --url http://localhost:8000   # running backend
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+from urllib.parse import urlsplit
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SUBMIT_PATH = "/api/talks"
+BOUNDARY = "pyzgz-bench-boundary"
+RATE_BURST = 5  # talk_proposals.RATE_BURST (PYZGZ_TALKS_BURST)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _peak_rss_kb(pid: int) -> int:
+    """Largest VmHWM of ``pid`` and its children (granian forks its workers)."""
+    peak = 0
+    pids = [pid]
+    while pids:
+        p = pids.pop()
+        try:
+            with open(f"/proc/{p}/status") as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        peak = max(peak, int(line.split()[1]))
+            for task in os.listdir(f"/proc/{p}/task"):
+                with open(f"/proc/{p}/task/{task}/children") as f:
+                    pids.extend(int(c) for c in f.read().split())
+        except OSError:
+            continue
+    return peak
+
+
+@contextmanager
+def serve(workdir: str, batch: int) -> Iterator[tuple[str, subprocess.Popen]]:
+    port = _free_port()
+    env = dict(
+        os.environ,
+        PYZGZ_DB_URL=f"sqlite:///{os.path.join(workdir, 'talks.db')}",
+        PYZGZ_UPLOAD_DIR=os.path.join(workdir, "uploads"),
+        PYZGZ_TRUST_PROXY="1",
+        PYZGZ_TALKS_BATCH=str(batch),
+    )
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "granian",
+            "--interface",
+            "asgi",
+            "--factory",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+            "pyzgz.talk_proposals:api_app",
+        ],
+        cwd=ROOT_DIR,
+        env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 20
+        while True:
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                    break
+            except OSError:
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("granian did not start") from None
+                time.sleep(0.05)
+        yield url, proc
+    finally:
+        proc.terminate()
+        proc.wait(10)
+
+
+def _pdf(kb: int) -> bytes:
+    return b"%PDF-1.4\n" + b"0" * max(0, kb * 1024 - 9)
+
+
+def _fields(n: int) -> dict[str, str]:
+    return {
+        "title": f"Charla {n}",
+        "speaker": "Ponente de prueba",
+        "email": f"ponente{n}@example.com",
+        "level": "intro",
+        "duration": "30",
+        "summary": "Resumen de la charla. " * 20,
+    }
+
+
+def _body(n: int, pdf: bytes) -> bytes:
+    """The multipart body a browser posts, encoded by hand: on one core the
+    client's own encoding would otherwise cost more than the server's work."""
+    parts = [
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+        f"{value}\r\n".encode()
+        for name, value in _fields(n).items()
+    ]
+    # An empty file input is still sent, as a part with an empty filename
+    filename, ctype = ("charla.pdf", "application/pdf") if pdf else ("", "")
+    head = (
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="attachment"; '
+        f'filename="{filename}"\r\nContent-Type: {ctype or "application/octet-stream"}'
+        "\r\n\r\n"
+    )
+    parts.append(head.encode() + pdf + f"\r\n--{BOUNDARY}--\r\n".encode())
+    return b"".join(parts)
+
+
+class _Connection:
+    """One keep-alive HTTP/1.1 connection posting proposals.
+
+    A few lines over asyncio streams instead of httpx: with dozens of
+    clients on one core, httpx's own per-request work would be the
+    bottleneck and the numbers would measure the client.
+    """
+
+    def __init__(self, url: str) -> None:
+        parts = urlsplit(url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.path = parts.path.rstrip("/") + SUBMIT_PATH
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def post(self, n: int, pdf: bytes, ip: str) -> int:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+        assert self._reader is not None
+        body = _body(n, pdf)
+        head = (
+            f"POST {self.path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            "Accept: application/json\r\n"
+            f"Content-Type: multipart/form-data; boundary={BOUNDARY}\r\n"
+            f"Content-Length: {len(body)}\r\nX-Forwarded-For: {ip}\r\n\r\n"
+        )
+        self._writer.write(head.encode() + body)
+        await self._writer.drain()
+        status_line, *lines = (
+            (await self._reader.readuntil(b"\r\n\r\n")).decode().split("\r\n")
+        )
+        headers = dict(line.lower().split(": ", 1) for line in lines if ": " in line)
+        await self._reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection") == "close":
+            self.close()
+        return int(status_line.split()[1])
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+async def _load(
+    url: str, clients: int, seconds: float, pdf_ratio: float, pdf: bytes
+) -> tuple[Counter, List[float], float]:
+    statuses: Counter = Counter()
+    latencies: List[float] = []
+    counter = iter(range(10**9))
+    pdf_every = round(1 / pdf_ratio) if pdf_ratio > 0 else 0
+
+    async def worker() -> None:
+        conn = _Connection(url)
+        try:
+            while time.perf_counter() < end:
+                n = next(counter)
+                attached = pdf if pdf_every and n % pdf_every == 0 else b""
+                ip = f"10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}"
+                t0 = time.perf_counter()
+                status = await conn.post(n, attached, ip)
+                latencies.append(time.perf_counter() - t0)
+                statuses[status] += 1
+        finally:
+            conn.close()
+
+    start = time.perf_counter()
+    end = start + seconds
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    return statuses, latencies, time.perf_counter() - start
+
+
+async def _rate_limited(url: str, attempts: int) -> Counter:
+    """Statuses of ``attempts`` posts in a row from one new address."""
+    statuses: Counter = Counter()
+    ip = f"198.18.{random.randrange(256)}.{random.randrange(256)}"
+    conn = _Connection(url)
+    try:
+        for n in range(attempts):
+            statuses[await conn.post(n, b"", ip)] += 1
+    finally:
+        conn.close()
+    return statuses
+
+
+def _pct(values: List[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000 if values else 0
+
+
+def _report(
+    label: str,
+    statuses: Counter,
+    latencies: List[float],
+    elapsed: float,
+    rows: Optional[int],
+    rss_kb: Optional[int],
+) -> bool:
+    accepted = statuses.get(201, 0)
+    codes = ", ".join(f"{code}: {n}" for code, n in sorted(statuses.items()))
+    extra = ""
+    ok = set(statuses) <= {201}
+    if rows is not None:
+        extra += f", {rows} rows"
+        ok &= rows == accepted
+    if rss_kb is not None:
+        extra += f", peak RSS {rss_kb / 1024:.0f} MB"
+    print(
+        f"{label}: {accepted / elapsed:7.1f} subs/s, p50 {_pct(latencies, 0.5):6.1f} ms, "
+        f"p99 {_pct(latencies, 0.99):6.1f} ms ({codes}){extra}"
+        f"{'' if ok else '  FAIL'}"
+    )
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--pdf-ratio", type=float, default=0.1)
+    parser.add_argument("--pdf-kb", type=int, default=512)
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 64])
+    parser.add_argument(
+        "--url", help="an already running backend (started with PYZGZ_TRUST_PROXY=1)"
+    )
+    args = parser.parse_args()
+
+    pdf = _pdf(args.pdf_kb)
+    failed = False
+    if args.url:
+        statuses, latencies, elapsed = asyncio.run(
+            _load(args.url, args.clients, args.seconds, args.pdf_ratio, pdf)
+        )
+        failed |= not _report(args.url, statuses, latencies, elapsed, None, None)
+        limited = asyncio.run(_rate_limited(args.url, RATE_BURST * 2))
+    else:
+        for batch in args.batch:
+            with tempfile.TemporaryDirectory() as workdir:
+                with serve(workdir, batch) as (url, proc):
+                    statuses, latencies, elapsed = asyncio.run(
+                        _load(url, args.clients, args.seconds, args.pdf_ratio, pdf)
+                    )
+                    rss_kb = _peak_rss_kb(proc.pid)
+                    limited = asyncio.run(_rate_limited(url, RATE_BURST * 2))
+                with sqlite3.connect(os.path.join(workdir, "talks.db")) as db:
+                    (total,) = db.execute(
+                        "SELECT count(*) FROM talk_proposals"
+                    ).fetchone()
+                # Without the proposals of the rate-limit phase
+                rows = total - limited.get(201, 0)
+                label = f"clients={args.clients} batch={batch:<3}"
+                failed |= not _report(label, statuses, latencies, elapsed, rows, rss_kb)
+    ok = limited.get(201, 0) == RATE_BURST and limited.get(429, 0) == RATE_BURST
+    failed |= not ok
+    print(
+        f"rate limit, one address: {limited.get(201, 0)} accepted, "
+        f"{limited.get(429, 0)} x 429{'' if ok else '  FAIL'}"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
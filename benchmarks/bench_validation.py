@@ -0,0 +1,141 @@
+"""
+Benchmark bulk schema validation of events.json against per-field probing.
+
+Compares, on a synthetic events.json:
+- probe:  json.load, then the per-record/per-field isinstance checks;
+- bulk:   event_schema.validate_events_json (parse + validate in one pass
+          through one cached TypeAdapter);
+- the loader before event_schema (probe while building events_page.Event)
+  and now (bulk, then Event.from_record);
+- ingest: event_schema.validate_events on already parsed records, as
+  fetch_meetup.py does before syncing into the store.
+
+With --invalid-every N, one record in N gets a bad "time"; bulk validation
+then takes a second (lenient) pass to drop them.
+
+    uv run python benchmarks/bench_validation.py --events 100000
+    uv run python benchmarks/bench_validation.py --invalid-every 1000
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import timezone
+from typing import Callable
+
+from bench_events_page import _parse_when  # the previous isinstance probing
+from stub_server import ROOT_DIR, synthetic_api_events
+
+sys.path.insert(0, ROOT_DIR)
+
+from pyzgz import events_page  # noqa: E402
+from pyzgz.event_schema import validate_events, validate_events_json  # noqa: E402
+
+
+def probe(path: str) -> int:
+    """Records passing the checks the loader used to make (no events built)."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        return 0
+    n = 0
+    for ev in data:
+        if (
+            isinstance(ev, dict)
+            and isinstance(ev.get("time"), (int, float))
+            and (ev.get("venue") is None or isinstance(ev["venue"], dict))
+        ):
+            n += 1
+    return n
+
+
+def bulk(path: str) -> int:
+    with open(path, "rb") as f:
+        records, _invalid = validate_events_json(f.read())
+    return len(records)
+
+
+# Previous loader, kept as the baseline (see git history)
+def loader_before(path: str) -> int:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        return 0
+    events = []
+    for ev in data:
+        if not isinstance(ev, dict):
+            continue
+        when = _parse_when(ev)
+        if when and when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        venue = (
+            ev.get("venue", {}).get("name")
+            if isinstance(ev.get("venue"), dict)
+            else ev.get("venue")
+        )
+        events.append(
+            events_page.Event(
+                when=when,
+                when_display=events_page._format_when(when),
+                title=ev.get("name") or ev.get("title") or "Evento",
+                url=ev.get("link") or ev.get("url") or "#",
+                venue=str(venue) if venue is not None else None,
+                group=ev.get("group") or None,
+            )
+        )
+    return len(events)
+
+
+def loader_now(path: str) -> int:
+    with open(path, "rb") as f:
+        records, _invalid = validate_events_json(f.read())
+    return len([events_page.Event.from_record(ev) for ev in records])
+
+
+def _best(fn: Callable[[], int], repeat: int) -> tuple[float, int]:
+    best, n = float("inf"), 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        n = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, n
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--invalid-every", type=int, default=0)
+    args = parser.parse_args()
+
+    records = [
+        {**ev, "description": ev["name"], "group": "bench_group"}
+        for ev in synthetic_api_events("bench_group", args.events)
+    ]
+    if args.invalid_every:
+        for ev in records[:: args.invalid_every]:
+            ev["time"] = "not a timestamp"
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "events.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(records, f)
+        print(f"{args.events} events, {os.path.getsize(path) / 1e6:.1f} MB")
+        runs = {
+            "probe (json.load + isinstance)": lambda: probe(path),
+            "bulk (validate_events_json)": lambda: bulk(path),
+            "loader before (probe + Event)": lambda: loader_before(path),
+            "loader now (bulk + from_record)": lambda: loader_now(path),
+            "ingest (validate_events)": lambda: len(validate_events(records)[0]),
+        }
+        for label, fn in runs.items():
+            dt, n = _best(fn, args.repeat)
+            print(f"{label:<36}: {dt * 1000:9.1f} ms  ({n} events)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,299 @@
+"""
+Benchmark suite for the hot paths of the events pipeline and page build.
+
+Stages (all offline; HTTP goes to the in-process stub in stub_server.py):
+- ical_fetch[N]      fetch_ical + streaming parse of an N-VEVENT feed
+- api_normalize[N]   _normalize_api_event over N API records
+- api_fetch[N]       fetch_api, paginated, against the stub
+- load_events[N]     events_page._load_events (cold, i.e. cache cleared)
+- load_events_warm   the same, served from the mtime-keyed cache
+- split_events[N]    events_page._split_events on the loaded tuple
+- page[<route>]      component-tree construction for every page main.py
+                     registers, with the events pages registered from and
+                     reading a synthetic events.json so timings do not
+                     drift with real data
+
+Each run appends one JSON line to benchmarks/history.jsonl (commit, time,
+Python, and per-benchmark min/median seconds) and prints the change against
+the last recorded result of each benchmark; --check exits with 2 when
+something got slower by more than --threshold.
+
+    uv run python benchmarks/run.py
+    uv run python benchmarks/run.py --quick --filter ical --no-save
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from stub_server import ROOT_DIR, START_MS, import_fetch_meetup, serve
+from stub_server import synthetic_api_events
+
+HISTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.jsonl")
+ICAL_SIZES = [100, 1_000, 10_000, 100_000]
+API_SIZES = [1_000, 10_000]
+EVENTS_SIZES = [1_000, 10_000]
+PAGE_EVENTS = 200  # synthetic history behind the archive pages
+EXIT_REGRESSION = 2
+
+Bench = Callable[[], Any]
+
+
+def measure(fn: Bench, rounds: int, min_time: float = 0.05) -> Dict[str, Any]:
+    """Seconds per call: min and median over ``rounds``, looping fast calls."""
+    fn()  # warm-up (imports, server caches)
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - t0 >= min_time or number >= 1_000_000:
+            break
+        number *= 10
+    samples = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t0) / number)
+    return {
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "rounds": rounds,
+        "number": number,
+    }
+
+
+def _write_events_json(path: str, count: int) -> None:
+    # Half of the synthetic events are in the future
+    offset = count // 2 * 7 * 24 * 3600 * 1000
+    events = [
+        {**ev, "time": ev["time"] + offset, "description": ev["name"]}
+        for ev in synthetic_api_events("bench_group", count)
+    ]
+    assert not count or events[0]["time"] > START_MS
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(events, f)
+
+
+def fetch_benchmarks(quick: bool) -> Dict[str, tuple[Bench, int]]:
+    """ical_fetch, api_normalize and api_fetch; values are (fn, items)."""
+    fm = import_fetch_meetup()
+    group = "bench_group"
+    benches: Dict[str, tuple[Bench, int]] = {}
+    for n in ICAL_SIZES[:-1] if quick else ICAL_SIZES:
+        benches[f"ical_fetch[{n}]"] = (
+            _with_stub(n, lambda base: _set(fm, ICAL_BASE=base), fm.fetch_ical, group),
+            n,
+        )
+    for n in API_SIZES:
+        raw = synthetic_api_events(group, n)
+        benches[f"api_normalize[{n}]"] = (
+            lambda raw=raw: [fm._normalize_api_event(ev) for ev in raw],
+            n,
+        )
+        benches[f"api_fetch[{n}]"] = (
+            _with_stub(
+                n,
+                lambda base: _set(fm, API_BASE=base),
+                lambda g: fm.fetch_api(g, "token"),
+                group,
+            ),
+            n,
+        )
+    return benches
+
+
+def _set(module: Any, **values: Any) -> None:
+    for k, v in values.items():
+        setattr(module, k, v)
+
+
+def _with_stub(
+    events: int, configure: Callable[[str], None], fn: Callable[[str], Any], group: str
+) -> Bench:
+    """A benchmark that runs ``fn(group)`` against a stub serving ``events``."""
+    state: Dict[str, Any] = {}
+
+    def bench() -> Any:
+        # The server is started lazily and stopped by _close_stubs()
+        if "ctx" not in state:
+            state["ctx"] = serve(events=events)
+            state["base"] = state["ctx"].__enter__()
+            _open_stubs.append(state["ctx"])
+        configure(state["base"])
+        return fn(group)
+
+    return bench
+
+
+_open_stubs: List[Any] = []
+
+
+def _close_stubs() -> None:
+    while _open_stubs:
+        _open_stubs.pop().__exit__(None, None, None)
+
+
+def events_benchmarks(tmp: str) -> Dict[str, tuple[Bench, int]]:
+    """load_events/split_events over synthetic events.json files."""
+    from pyzgz import events_page
+
+    benches: Dict[str, tuple[Bench, int]] = {}
+    for n in EVENTS_SIZES:
+        path = os.path.join(tmp, f"events-{n}.json")
+        _write_events_json(path, n)
+
+        def cold(path: str = path) -> Any:
+            events_page.ASSETS_EVENTS = path
+            events_page._events_cache.clear()
+            return events_page._load_events()
+
+        def split(path: str = path) -> Any:
+            events_page.ASSETS_EVENTS = path
+            return events_page._split_events(events_page._load_events())
+
+        benches[f"load_events[{n}]"] = (cold, n)
+        benches[f"split_events[{n}]"] = (split, n)
+        if n == EVENTS_SIZES[-1]:
+
+            def warm(path: str = path) -> Any:
+                events_page.ASSETS_EVENTS = path
+                return events_page._load_events()
+
+            benches["load_events_warm"] = (warm, n)
+    return benches
+
+
+def page_benchmarks(tmp: str) -> Dict[str, tuple[Bench, int]]:
+    """Component construction for every page registered by pyzgz.main."""
+    from pyzgz import calendar_index, events_page
+
+    path = os.path.join(tmp, "events-pages.json")
+    _write_events_json(path, PAGE_EVENTS)
+    no_data = os.path.join(tmp, "no-data")
+
+    def use_synthetic_events() -> None:
+        events_page.ASSETS_EVENTS = path
+        events_page.ASSETS_SHARDS = no_data
+        # Built from the events when missing
+        calendar_index.INDEX_PATH = os.path.join(no_data, "calendar-index.json")
+
+    # pyzgz.main registers the archive routes (pages, years, groups) from the
+    # events when it is first imported, which must be here
+    use_synthetic_events()
+    from pyzgz.main import registered
+
+    def build(component: Callable[[], Any]) -> Any:
+        use_synthetic_events()
+        return component()
+
+    benches: Dict[str, tuple[Bench, int]] = {}
+    for route, entry in registered.items():
+        # Named like reflex names its routes, as in the recorded history
+        name = route.strip("/") or "index"
+        benches[f"page[{name}]"] = (lambda c=entry.page: build(c), 1)
+    return benches
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _previous_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """The most recent recorded result of every benchmark in the history."""
+    latest: Dict[str, Dict[str, Any]] = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    latest.update(json.loads(line).get("results") or {})
+                except (ValueError, AttributeError):
+                    continue
+    except OSError:
+        pass
+    return latest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--filter", default="", help="only benchmarks containing this")
+    parser.add_argument("--quick", action="store_true", help="skip the 100k feed")
+    parser.add_argument("--history", default=HISTORY_PATH)
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--check", action="store_true", help="exit 2 on regression")
+    args = parser.parse_args()
+
+    # Page functions must read the synthetic events.json, not a local store
+    os.environ["PYZGZ_DB_URL"] = "sqlite:///" + os.path.join(
+        tempfile.gettempdir(), "pyzgz-bench-missing.db"
+    )
+    sys.path.insert(0, ROOT_DIR)
+
+    previous = _previous_results(args.history)
+    results: Dict[str, Dict[str, Any]] = {}
+    regressions = []
+    with tempfile.TemporaryDirectory() as tmp:
+        benches = {
+            **fetch_benchmarks(args.quick),
+            **events_benchmarks(tmp),
+            **page_benchmarks(tmp),
+        }
+        try:
+            for name, (fn, items) in benches.items():
+                if args.filter not in name:
+                    continue
+                res = measure(fn, args.rounds)
+                res["items"] = items
+                results[name] = res
+                line = f"{name:<28} {res['median_s'] * 1000:10.3f} ms"
+                if items > 1:
+                    line += f"  {items / res['median_s']:>12,.0f} items/s"
+                before = previous.get(name)
+                if before and before.get("median_s"):
+                    change = res["median_s"] / before["median_s"] - 1
+                    line += f"  {change:+7.1%}"
+                    if change > args.threshold:
+                        line += "  REGRESSION"
+                        regressions.append(name)
+                print(line)
+        finally:
+            _close_stubs()
+
+    if not args.no_save and results:
+        run = {
+            "commit": _git("rev-parse", "--short", "HEAD"),
+            "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        }
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(run, sort_keys=True) + "\n")
+        print(f"[bench] Appended results to {os.path.relpath(args.history)}")
+    if regressions:
+        print(f"[bench] Slower than last recorded: {', '.join(regressions)}")
+        if args.check:
+            return EXIT_REGRESSION
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,229 @@
+"""
+Local stand-in for the Meetup endpoints used by scripts/fetch_meetup.py.
+
+Serves synthetic events so the fetcher can be exercised and benchmarked
+offline:
+
+- GET /<group>/events?page=N&offset=K[&no_earlier_than=ISO]
+  (JSON list, X-Total-Count, Link rel=next, ETag)
+- GET /<group>/events/ical/            (iCal feed with the same events, ETag)
+
+Any number of groups is served (the group is taken from the path), each
+with its own event ids, so multi-group fetches can be load-tested too.
+
+Usage:
+    with serve(events=10_000, latency=0.02) as base_url:
+        ...
+"""
+
+from __future__ import annotations
+import json
+import os
+import sys
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+from zoneinfo import ZoneInfo
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.join(ROOT_DIR, "scripts")
+
+# Newest synthetic event; older ones go back one week each
+START_MS = 1_767_225_600_000  # 2026-01-01T00:00:00Z
+WEEK_MS = 7 * 24 * 3600 * 1000
+MADRID = ZoneInfo("Europe/Madrid")
+
+
+def import_fetch_meetup():
+    """Import scripts/fetch_meetup.py as a module."""
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    import fetch_meetup
+
+    return fetch_meetup
+
+
+def _first_id(group: str) -> int:
+    """First event id of ``group``; ids are unique across groups, like Meetup's."""
+    return (zlib.crc32(group.encode("utf-8")) % 90_000 + 10_000) * 1_000_000
+
+
+def synthetic_api_events(group: str, count: int) -> List[Dict[str, Any]]:
+    """Events shaped like the Meetup API response, newest first."""
+    first = _first_id(group)
+    return [
+        {
+            "id": str(first + i),
+            "name": f"{group} meetup #{count - i}",
+            "link": f"https://www.meetup.com/{group}/events/{first + i}/",
+            "time": START_MS - i * WEEK_MS,
+            "status": "past",
+            "venue": {"name": f"Sala {i % 7}"} if i % 3 else None,
+        }
+        for i in range(count)
+    ]
+
+
+def _ical_text(value: str) -> str:
+    """Escape an RFC 5545 TEXT value."""
+    for ch in ("\\", ";", ","):
+        value = value.replace(ch, "\\" + ch)
+    return value.replace("\n", "\\n")
+
+
+def synthetic_ical(group: str, count: int) -> str:
+    """An iCal feed of the same events as the API, using the shapes Meetup emits.
+
+    Every VEVENT agrees with its API record: DTSTART is either a UTC ``Z``
+    stamp or Europe/Madrid local time under TZID, and SUMMARY and LOCATION
+    are the API's name and venue (escaped), so merging the two sources
+    changes nothing and repeated syncs are stable.
+    """
+    out = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//stub//EN"]
+    for i, ev in enumerate(synthetic_api_events(group, count)):
+        utc = time.strftime("%Y%m%dT%H%M%S", time.gmtime(ev["time"] / 1000))
+        if i % 4 == 0:
+            dtstart = f"DTSTART:{utc}Z"
+        else:
+            local = datetime.fromtimestamp(ev["time"] / 1000, tz=MADRID)
+            dtstart = f"DTSTART;TZID=Europe/Madrid:{local:%Y%m%dT%H%M%S}"
+        out += [
+            "BEGIN:VEVENT",
+            f"UID:event_{ev['id']}@meetup.com",
+            f"SUMMARY:{_ical_text(ev['name'])}",
+            dtstart,
+            f"DTSTAMP:{utc}Z",
+            # A long folded DESCRIPTION, like the real feed
+            "DESCRIPTION:" + "Charlas y networking en Zaragoza. " * 2,
+            " " + "Más detalles en la página del evento. " * 2,
+            " " + "Trae tu portátil.",
+            f"URL:{ev['link']}",
+        ]
+        if ev["venue"]:
+            out.append(f"LOCATION:{_ical_text(ev['venue']['name'])}")
+        out.append("END:VEVENT")
+    out.append("END:VCALENDAR")
+    return "\r\n".join(out) + "\r\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+    def do_GET(self) -> None:  # noqa: N802
+        log = self.server.request_log  # type: ignore[attr-defined]
+        if log is not None:
+            log.append((time.monotonic(), self.path))
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        if self.server.latency:  # type: ignore[attr-defined]
+            time.sleep(self.server.latency)  # type: ignore[attr-defined]
+        if len(parts) == 2 and parts[1] == "events":
+            self._api_events(parts[0], parse_qs(url.query))
+        elif len(parts) == 3 and parts[1:] == ["events", "ical"]:
+            self._ical(parts[0])
+        else:
+            self._send(404, b"not found", "text/plain")
+
+    def _api_events(self, group: str, query: Dict[str, List[str]]) -> None:
+        events = self.server.api_events(group)  # type: ignore[attr-defined]
+        if "no_earlier_than" in query:
+            since = datetime.fromisoformat(query["no_earlier_than"][0])
+            since_ms = since.replace(tzinfo=MADRID).timestamp() * 1000
+            events = [ev for ev in events if ev["time"] >= since_ms]
+        page = int(query.get("page", ["200"])[0])
+        offset = int(query.get("offset", ["0"])[0])
+        chunk = events[offset * page : (offset + 1) * page]
+        body = json.dumps(chunk).encode("utf-8")
+        etag = f'"{group}-{len(events)}-{page}-{offset}-{hash(body)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, b"", "application/json", {"ETag": etag})
+            return
+        headers = {"ETag": etag, "X-Total-Count": str(len(events))}
+        if (offset + 1) * page < len(events):
+            query = {k: v[0] for k, v in query.items()}
+            query["offset"] = str(offset + 1)
+            headers["Link"] = (
+                f'<{self.path.split("?")[0]}?{urlencode(query)}>; rel="next"'
+            )
+        self._send(200, body, "application/json", headers)
+
+    def _ical(self, group: str) -> None:
+        body = self.server.ical(group)  # type: ignore[attr-defined]
+        etag = f'"ical-{group}-{len(body)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, b"", "text/calendar", {"ETag": etag})
+            return
+        self._send(200, body, "text/calendar; charset=utf-8", {"ETag": etag})
+
+    def _send(
+        self,
+        status: int,
+        body: bytes,
+        content_type: str,
+        headers: Dict[str, str] | None = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        events: int,
+        latency: float,
+        request_log: List[Tuple[float, str]] | None = None,
+    ) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.events = events
+        self.latency = latency
+        self.request_log = request_log
+        self._api_cache: Dict[str, List[Dict[str, Any]]] = {}
+        self._ical_cache: Dict[str, bytes] = {}
+
+    def api_events(self, group: str) -> List[Dict[str, Any]]:
+        if group not in self._api_cache:
+            self._api_cache[group] = synthetic_api_events(group, self.events)
+        return self._api_cache[group]
+
+    def ical(self, group: str) -> bytes:
+        if group not in self._ical_cache:
+            feed = synthetic_ical(group, self.events)
+            self._ical_cache[group] = feed.encode("utf-8")
+        return self._ical_cache[group]
+
+
+@contextmanager
+def serve(
+    events: int = 10_000,
+    latency: float = 0.0,
+    request_log: List[Tuple[float, str]] | None = None,
+) -> Iterator[str]:
+    """Run the stub server in a background thread and yield its base URL.
+
+    With ``request_log``, (monotonic time, path) of every request is appended
+    to it.
+    """
+    server = StubServer(events, latency, request_log)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        yield f"http://{host}:{port}"
+    finally:
+        server.shutdown()
+        server.server_close()
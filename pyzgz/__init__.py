@@ -1,3 +1,13 @@
-from .main import app  # re-export app at package level
+from typing import Any
 
 __all__ = ["app"]
+
+
+def __getattr__(name: str) -> Any:
+    # Import the app (and reflex) on first use only, so scripts that just
+    # need pyzgz.event_store or pyzgz.event_schema start fast
+    if name == "app":
+        from .main import app
+
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,53 @@
+"""
+Atomic file writes for the generated data (caches, feeds, indexes, zips).
+
+A file is written to a fresh temp file in its own directory, flushed to disk
+and renamed over the target, so readers and a crashed or concurrent build
+see either the old file or the new one, never a partial write.
+"""
+
+from __future__ import annotations
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Any, Iterator
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = "w", **kwargs: Any) -> Iterator[IO[Any]]:
+    """Open a temp file next to ``path`` for writing; on a clean exit it is
+    synced and renamed to ``path``, on an error it is removed.
+
+    ``mode`` and ``kwargs`` are as for open(), e.g. "wb" or encoding="utf-8".
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.")
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file private (0600); keep the usual mode, as
+        # the exported files are served
+        os.chmod(tmp, _file_mode(path))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _file_mode(path: str) -> int:
+    try:
+        return os.stat(path).st_mode & 0o777
+    except OSError:
+        return 0o644
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Atomically replace ``path`` with ``data``."""
+    with atomic_open(path, "wb") as f:
+        f.write(data)
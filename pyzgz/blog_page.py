@@ -1,18 +1,422 @@
 import reflex as rx
+from .atomic_files import atomic_open
 from .layout import page_wrapper, styles
+from dataclasses import asdict, dataclass
+from datetime import date
+from typing import Callable
+import hashlib
+import json
+import os
+import re
 
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+# Posts are Markdown files with front matter: blog/<yyyy-mm-dd>-<slug>.md.
+# Files starting with "_" (templates, drafts in progress) are not published.
+BLOG_DIR = os.path.join(BASE_DIR, "blog")
+# Parsed posts keyed by file, with its stat and content hash (see _load_posts)
+CACHE_PATH = os.path.join(BASE_DIR, ".cache", "blog_posts.json")
+CACHE_VERSION = 1
 
-def blog():
+# /blog lists the latest POSTS_PER_PAGE posts; older ones are on /blog/page/<n>
+POSTS_PER_PAGE = 10
+SUMMARY_CHARS = 200
+WORDS_PER_MINUTE = 200
+SLUG_RE = re.compile(r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
+DATED_NAME_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})-(.+)$")
+RESERVED_SLUGS = {"page"}
+MONTHS = [
+    "ene", "feb", "mar", "abr", "may", "jun",
+    "jul", "ago", "sep", "oct", "nov", "dic",
+]  # fmt: skip
+
+
+@dataclass(frozen=True, slots=True)
+class Post:
+    """A post parsed once per content hash, ready to render."""
+
+    slug: str
+    title: str
+    date: str  # ISO date, yyyy-mm-dd
+    author: str | None
+    summary: str
+    tags: tuple[str, ...]
+    reading_minutes: int
+    body: str  # Markdown, without the front matter
+    sha256: str  # of the source file
+
+    @property
+    def date_display(self) -> str:
+        d = date.fromisoformat(self.date)
+        return f"{d.day} {MONTHS[d.month - 1]} {d.year}"
+
+
+# stat of every post file -> published posts, newest first
+_posts_cache: tuple[tuple, tuple[Post, ...]] | None = None
+# Posts parsed ("parsed") and taken from the cache ("reused") on the last load
+blog_stats: dict[str, int] = {"posts": 0, "parsed": 0, "reused": 0}
+
+
+def _warn(message: str) -> None:
+    print(f"[blog_page] Warning: {message}")
+
+
+def _front_matter_value(raw: str) -> str | bool | list[str]:
+    raw = raw.strip()
+    if raw.startswith("[") and raw.endswith("]"):
+        return [v.strip().strip("\"'") for v in raw[1:-1].split(",") if v.strip()]
+    if raw.lower() in ("true", "false"):
+        return raw.lower() == "true"
+    return raw.strip("\"'")
+
+
+def _split_front_matter(text: str) -> tuple[dict[str, str | bool | list[str]], str]:
+    """``key: value`` lines between two ``---`` lines, and the rest of the text.
+
+    Values may be quoted strings, true/false or ``[a, b]`` lists. Raises
+    ValueError on a malformed header.
+    """
+    lines = text.lstrip("\ufeff").splitlines()
+    if not lines or lines[0].strip() != "---":
+        raise ValueError("missing front matter (the file must start with ---)")
+    meta: dict[str, str | bool | list[str]] = {}
+    for n, line in enumerate(lines[1:], start=2):
+        if line.strip() == "---":
+            return meta, "\n".join(lines[n:]).strip("\n")
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        key, sep, value = line.partition(":")
+        if not sep or not key.strip():
+            raise ValueError(f"line {n}: expected 'key: value'")
+        meta[key.strip().lower()] = _front_matter_value(value)
+    raise ValueError("front matter is not closed with ---")
+
+
+def _summary(body: str) -> str:
+    """The first paragraph of text, without Markdown markup, shortened."""
+    for block in re.split(r"\n\s*\n", body):
+        block = block.strip()
+        if block and not block.startswith(("#", "```", "!", "<", ">", "|", "-")):
+            text = re.sub(r"\[([^\]]*)\]\([^)]*\)", r"\1", block)
+            text = re.sub(r"[*_`]", "", " ".join(text.split()))
+            if len(text) > SUMMARY_CHARS:
+                text = text[:SUMMARY_CHARS].rsplit(" ", 1)[0] + "…"
+            return text
+    return ""
+
+
+def parse_post(name: str, text: str, sha256: str) -> Post | None:
+    """The post in file ``name``; None for drafts. Raises ValueError if invalid."""
+    meta, body = _split_front_matter(text)
+    if meta.get("draft") is True:
+        return None
+    stem = os.path.splitext(name)[0]
+    dated = DATED_NAME_RE.match(stem)
+    title = meta.get("title")
+    if not isinstance(title, str) or not title:
+        raise ValueError("'title' is required")
+    when = meta.get("date") or (dated.group(1) if dated else None)
+    if not isinstance(when, str):
+        raise ValueError("'date' is required (or a yyyy-mm-dd- file name prefix)")
+    try:
+        when = date.fromisoformat(when).isoformat()
+    except ValueError:
+        raise ValueError(f"'date' is not a yyyy-mm-dd date: {when!r}") from None
+    slug = meta.get("slug") or (dated.group(2) if dated else stem)
+    if not isinstance(slug, str) or not SLUG_RE.match(slug) or slug in RESERVED_SLUGS:
+        raise ValueError(f"invalid slug {slug!r} (lowercase letters, digits and -)")
+    tags = meta.get("tags") or []
+    author = meta.get("author")
+    summary = meta.get("summary")
+    return Post(
+        slug=slug,
+        title=title,
+        date=when,
+        author=author if isinstance(author, str) and author else None,
+        summary=summary if isinstance(summary, str) else _summary(body),
+        tags=tuple(tags if isinstance(tags, list) else [str(tags)]),
+        reading_minutes=max(1, round(len(body.split()) / WORDS_PER_MINUTE)),
+        body=body,
+        sha256=sha256,
+    )
+
+
+def _read_cache() -> dict[str, dict]:
+    try:
+        with open(CACHE_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _write_cache(files: dict[str, dict]) -> None:
+    try:
+        with atomic_open(CACHE_PATH, encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "files": files}, f, ensure_ascii=False)
+    except OSError as e:
+        _warn(f"cannot write {CACHE_PATH}: {e}")
+
+
+def _cached_post(entry: dict | None) -> Post | None | bool:
+    """The post stored in a cache entry (None for a draft); False if unusable."""
+    if not isinstance(entry, dict) or "post" not in entry:
+        return False
+    if entry["post"] is None:
+        return None
+    try:
+        return Post(**{**entry["post"], "tags": tuple(entry["post"]["tags"])})
+    except (KeyError, TypeError):
+        return False
+
+
+def _post_files() -> list[tuple[str, tuple[int, int]]]:
+    """(file name, (mtime_ns, size)) of every publishable post file, sorted."""
+    try:
+        entries = list(os.scandir(BLOG_DIR))
+    except FileNotFoundError:
+        return []
+    files = []
+    for entry in entries:
+        if entry.name.endswith(".md") and not entry.name.startswith(("_", ".")):
+            st = entry.stat()
+            files.append((entry.name, (st.st_mtime_ns, st.st_size)))
+    return sorted(files)
+
+
+def _load_posts() -> tuple[Post, ...]:
+    """Published posts, newest first.
+
+    Only files whose stat changed are read, and only files whose content
+    hash changed are parsed again; the rest come from .cache/blog_posts.json,
+    so a build costs in proportion to the posts that changed. Invalid posts
+    are skipped with a warning.
+    """
+    global _posts_cache
+    files = _post_files()
+    stamp = tuple(files)
+    if _posts_cache is not None and _posts_cache[0] == stamp:
+        return _posts_cache[1]
+
+    cached = _read_cache()
+    entries: dict[str, dict] = {}
+    posts: list[Post] = []
+    parsed = reused = 0
+    for name, st in files:
+        entry = cached.get(name)
+        post = _cached_post(entry)
+        if post is False or entry.get("stat") != list(st):
+            try:
+                with open(os.path.join(BLOG_DIR, name), "rb") as f:
+                    raw = f.read()
+            except OSError as e:
+                _warn(f"cannot read {name}: {e}")
+                continue
+            sha = hashlib.sha256(raw).hexdigest()
+            if post is False or entry.get("sha256") != sha:
+                try:
+                    post = parse_post(name, raw.decode("utf-8"), sha)
+                except (UnicodeDecodeError, ValueError) as e:
+                    _warn(f"skipping {name}: {e}")
+                    continue
+                parsed += 1
+            else:
+                reused += 1
+            entry = {
+                "stat": list(st),
+                "sha256": sha,
+                "post": asdict(post) if post else None,
+            }
+        else:
+            reused += 1
+        entries[name] = entry
+        if post is not None:
+            posts.append(post)
+
+    if entries != cached:
+        _write_cache(entries)
+    seen: dict[str, Post] = {}
+    for post in sorted(posts, key=lambda p: (p.date, p.slug), reverse=True):
+        if post.slug in seen:
+            _warn(f"duplicate slug {post.slug!r}; keeping the newest post")
+            continue
+        seen[post.slug] = post
+    result = tuple(seen.values())
+    blog_stats.update(posts=len(result), parsed=parsed, reused=reused)
+    _posts_cache = (stamp, result)
+    return result
+
+
+def _page_count(posts: tuple[Post, ...]) -> int:
+    return max(1, -(-len(posts) // POSTS_PER_PAGE))
+
+
+def _page_posts(page: int) -> tuple[Post, ...]:
+    """Page ``page`` (1-based) of posts, newest first."""
+    offset = (page - 1) * POSTS_PER_PAGE
+    return _load_posts()[offset : offset + POSTS_PER_PAGE]
+
+
+def _page_route(page: int) -> str:
+    return "/blog" if page == 1 else f"/blog/page/{page}"
+
+
+def _post_route(post: Post) -> str:
+    return f"/blog/{post.slug}"
+
+
+def _byline(post: Post) -> str:
+    parts = [post.date_display, post.author, f"{post.reading_minutes} min de lectura"]
+    return " · ".join(p for p in parts if p)
+
+
+def _tags(post: Post) -> rx.Component:
+    return rx.hstack(*[rx.badge(tag) for tag in post.tags], spacing="2", wrap="wrap")
+
+
+def _post_card(post: Post) -> rx.Component:
+    return rx.card(
+        rx.vstack(
+            rx.link(post.title, href=_post_route(post), font_weight="bold"),
+            rx.text(_byline(post), color="gray"),
+            rx.cond(post.summary != "", rx.text(post.summary)),
+            rx.cond(len(post.tags) > 0, _tags(post)),
+            spacing="2",
+            align="start",
+        ),
+        width="100%",
+    )
+
+
+def _pager(page: int, pages: int) -> rx.Component:
+    links = []
+    if page > 1:
+        links.append(rx.link("← Más recientes", href=_page_route(page - 1)))
+    if page < pages:
+        links.append(rx.link("Anteriores →", href=_page_route(page + 1)))
+    return rx.hstack(*links, spacing="4", justify="center")
+
+
+def _blog_layout(*children: rx.Component) -> rx.Component:
     return page_wrapper(
         rx.section(
             rx.vstack(
-                rx.heading("Blog"),
-                rx.text(
-                    "Notas de charlas, tutoriales y crónicas.", text_align="center"
-                ),
-                spacing="3",
+                *children,
+                spacing="5",
                 align="center",
+                width="100%",
             ),
             style=styles["section"],
         )
     )
+
+
+def _index_page(page: int) -> rx.Component:
+    posts = _load_posts()
+    pages = _page_count(posts)
+    return _blog_layout(
+        rx.heading("Blog" if page == 1 else f"Blog · página {page}"),
+        rx.text("Notas de charlas, tutoriales y crónicas.", text_align="center"),
+        rx.vstack(
+            *[_post_card(post) for post in _page_posts(page)],
+            spacing="4",
+            width="100%",
+            max_width="760px",
+        ),
+        rx.cond(pages > 1, _pager(page, pages)),
+    )
+
+
+def blog():
+    if not _load_posts():
+        return _blog_layout(
+            rx.heading("Blog"),
+            rx.text("Notas de charlas, tutoriales y crónicas.", text_align="center"),
+        )
+    return _index_page(1)
+
+
+def _blog_index_page(page: int) -> Callable[[], rx.Component]:
+    def blog_index_page() -> rx.Component:
+        return _index_page(page)
+
+    blog_index_page.__name__ = f"blog_page_{page}"
+    return blog_index_page
+
+
+def _blog_post_page(slug: str) -> Callable[[], rx.Component]:
+    def blog_post_page() -> rx.Component:
+        posts = _load_posts()
+        i = next((i for i, p in enumerate(posts) if p.slug == slug), None)
+        if i is None:
+            # Removed (or made a draft) since the routes were registered
+            return _blog_layout(
+                rx.heading("Entrada no encontrada"),
+                rx.link("Volver al blog", href="/blog"),
+            )
+        post = posts[i]
+        # Newer post on the left, older on the right, as in the index pager
+        neighbours = []
+        if i > 0:
+            neighbours.append(
+                rx.link(f"← {posts[i - 1].title}", href=_post_route(posts[i - 1]))
+            )
+        if i + 1 < len(posts):
+            neighbours.append(
+                rx.link(f"{posts[i + 1].title} →", href=_post_route(posts[i + 1]))
+            )
+        return _blog_layout(
+            rx.vstack(
+                rx.heading(post.title, size="8"),
+                rx.text(_byline(post), color="gray"),
+                rx.cond(len(post.tags) > 0, _tags(post)),
+                rx.markdown(post.body),
+                rx.hstack(*neighbours, spacing="4", justify="between", width="100%"),
+                rx.link("Volver al blog", href="/blog"),
+                spacing="4",
+                align="start",
+                width="100%",
+                max_width="760px",
+            ),
+        )
+
+    blog_post_page.__name__ = f"blog_{slug.replace('-', '_')}"
+    return blog_post_page
+
+
+def _listing(posts: tuple[Post, ...]) -> list[tuple]:
+    return [(p.slug, p.title, p.date, p.summary, p.tags) for p in posts]
+
+
+def route_data(route: str) -> object:
+    """The data ``route`` renders: a post's content hash and its neighbours,
+    or the posts listed on an index page.
+
+    Hashed by scripts/export_if_changed.py to tell which routes changed.
+    """
+    posts = _load_posts()
+    if route == "/blog":
+        return _page_count(posts), _listing(_page_posts(1))
+    kind, _, arg = route.removeprefix("/blog/").partition("/")
+    if kind == "page" and arg.isdigit():
+        return _page_count(posts), _listing(_page_posts(int(arg)))
+    for i, post in enumerate(posts):
+        if post.slug == kind:
+            return post.sha256, _listing(posts[max(0, i - 1) : i + 2])
+    return None
+
+
+def blog_pages() -> list[tuple[str, Callable[[], rx.Component], str]]:
+    """(route, page, title) for /blog/page/<n> (n >= 2) and /blog/<slug>."""
+    posts = _load_posts()
+    routes = [
+        (_page_route(n), _blog_index_page(n), f"Blog · página {n} · PythonZgz")
+        for n in range(2, _page_count(posts) + 1)
+    ]
+    routes += [
+        (_post_route(p), _blog_post_page(p.slug), f"{p.title} · PythonZgz")
+        for p in posts
+    ]
+    return routes
@@ -0,0 +1,107 @@
+"""
+Month-bucketed calendar index of the events (assets/calendar-index.json).
+
+Built once at ingest: scripts/fetch_meetup.py writes it next to events.json.
+Events are bucketed by year and month in Europe/Madrid time, the zone the
+Meetup feeds are read in, and each bucket keeps its events in start order as
+compact rows. Rendering a month is one dict lookup, and the calendar page's
+client code (assets/calendar.js) moves between months with this file alone,
+without the full event list:
+
+    {"v": 1, "tz": "Europe/Madrid",
+     "counts": {"2025-12": 1, ...},
+     "months": {"2025-12": [[day, "HH:MM", title, key], ...], ...}}
+
+``counts`` lists every month with events, oldest first; ``key`` is
+event_store.event_key, the id of the event's /event/<key>.html page.
+"""
+
+from __future__ import annotations
+import json
+import os
+from datetime import datetime
+from typing import Any, Iterable
+from zoneinfo import ZoneInfo
+
+from . import event_store
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+INDEX_PATH = os.path.join(BASE_DIR, "assets", "calendar-index.json")
+INDEX_VERSION = 1
+SITE_TZ = "Europe/Madrid"
+
+# [day of month, "HH:MM" local time, title, event key]
+Row = list
+
+# (path, (mtime_ns, size), index) of the last load()
+_loaded: tuple[str, tuple[int, int], dict] | None = None
+
+
+def month_key(year: int, month: int) -> str:
+    return f"{year:04d}-{month:02d}"
+
+
+def build(events: Iterable[dict]) -> dict[str, Any]:
+    """The index of ``events`` (store/events.json records with an epoch-ms time)."""
+    tz = ZoneInfo(SITE_TZ)
+    buckets: dict[str, list[tuple[float, Row]]] = {}
+    for ev in events:
+        t = ev.get("time")
+        key = event_store.event_key(ev)
+        if not isinstance(t, (int, float)) or not key:
+            continue
+        local = datetime.fromtimestamp(t / 1000, tz=tz)
+        title = ev.get("name") or ev.get("title") or "Evento"
+        buckets.setdefault(month_key(local.year, local.month), []).append(
+            (t, [local.day, local.strftime("%H:%M"), title, key])
+        )
+    months = {
+        month: [row for _, row in sorted(rows, key=lambda r: r[0])]
+        for month, rows in sorted(buckets.items())
+    }
+    return {
+        "v": INDEX_VERSION,
+        "tz": SITE_TZ,
+        "counts": {month: len(rows) for month, rows in months.items()},
+        "months": months,
+    }
+
+
+def dumps(index: dict[str, Any]) -> bytes:
+    return json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def load(path: str | None = None) -> dict[str, Any] | None:
+    """The index at ``path`` (INDEX_PATH by default); None if missing or not
+    a valid index.
+
+    Cached on the file's mtime, like events_page's event loading.
+    """
+    global _loaded
+    path = path or INDEX_PATH
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    if _loaded is not None and _loaded[:2] == (path, stamp):
+        return _loaded[2]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not (
+        isinstance(index, dict)
+        and index.get("v") == INDEX_VERSION
+        and isinstance(index.get("counts"), dict)
+        and isinstance(index.get("months"), dict)
+    ):
+        return None
+    _loaded = (path, stamp, index)
+    return index
+
+
+def month_rows(index: dict[str, Any], year: int, month: int) -> list[Row]:
+    """Rows of the events in ``year``-``month``, in start order."""
+    return index["months"].get(month_key(year, month), [])
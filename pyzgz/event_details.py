@@ -0,0 +1,95 @@
+"""
+Per-event detail pages (assets/event/<key>.html, served as /event/<key>.html).
+
+Static HTML written by scripts/build_event_feeds.py in its pass over the
+events, next to the calendar and the JSON Feed: every dated event gets one
+small page with its content in the HTML, and only new and changed events are
+rendered again. They are not Reflex routes, so the number of routes, the
+build time and the bundle do not grow with the archive. scripts/prerender.py
+lists them in sitemap.xml with the date their event last changed (the feed's
+date_modified).
+
+``key`` is event_store.event_key (the Meetup event id); the calendar index
+(calendar_index) and assets/calendar.js link to the same URLs.
+"""
+
+from __future__ import annotations
+import re
+from html import escape, unescape
+
+DETAIL_DIR = "event"  # under assets/, exported at the site root
+SITE_NAME = "PythonZgz"
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n\s*")
+
+# Close to the site's light theme; the pages load no JS or CSS bundle
+_STYLE = (
+    "body{margin:0;font:16px/1.5 system-ui,sans-serif;color:#1c2024;"
+    "background:#fff}main{max-width:40em;margin:0 auto;padding:2rem 1rem}"
+    "h1{font-size:1.75rem;line-height:1.2;margin:1rem 0 .5rem}"
+    ".meta{color:#60646c;margin:0}.links{display:flex;gap:1rem;flex-wrap:wrap}"
+    "a{color:#0d74ce}"
+)
+
+
+def detail_url(key: str) -> str:
+    """Link to the detail page of the event ``key``."""
+    return f"/{DETAIL_DIR}/{key}.html"
+
+
+def plain_text(html: str) -> str:
+    """``html`` (a Meetup description) as plain text, paragraphs kept."""
+    text = unescape(_TAG_RE.sub("\n", html.replace("<br>", "\n")))
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return _BLANK_LINES_RE.sub("\n\n", "\n".join(lines)).strip()
+
+
+def page(
+    title: str,
+    when: str,
+    venue: str | None,
+    group: str | None,
+    url: str,
+    description: str,
+    canonical: str = "",
+) -> str:
+    """The detail page of an event; ``description`` is plain text and
+    ``canonical`` the page's absolute URL ("" to leave it out)."""
+    summary = f"{when} · {venue or SITE_NAME}"
+    head = [
+        "<!DOCTYPE html>",
+        '<html lang="es">',
+        "<head>",
+        '<meta charset="utf-8">',
+        '<meta name="viewport" content="width=device-width, initial-scale=1">',
+        f"<title>{escape(title)} · {SITE_NAME}</title>",
+        f'<meta name="description" content="{escape(summary)}">',
+    ]
+    if canonical:
+        head.append(f'<link rel="canonical" href="{escape(canonical)}">')
+    head += [f"<style>{_STYLE}</style>", "</head>"]
+    body = [
+        "<body>",
+        "<main>",
+        '<p><a href="/events">← Todos los eventos</a></p>',
+        f"<h1>{escape(title)}</h1>",
+        f'<p class="meta">{escape(when)}</p>',
+    ]
+    if venue:
+        body.append(f"<p>{escape(venue)}</p>")
+    if group:
+        body.append(f'<p class="meta">{escape(group)}</p>')
+    if description and description != title:
+        body += [
+            "<p>" + escape(paragraph).replace("\n", "<br>") + "</p>"
+            for paragraph in description.split("\n\n")
+        ]
+    links = []
+    if url.startswith(("https://", "http://")):
+        links.append(
+            f'<a href="{escape(url)}" rel="noopener">Apuntarse en Meetup →</a>'
+        )
+    links.append('<a href="/events.ics">Añadir al calendario (.ics)</a>')
+    body += [f'<p class="links">{" ".join(links)}</p>', "</main>", "</body>", "</html>"]
+    return "\n".join(head + body) + "\n"
@@ -0,0 +1,92 @@
+"""
+Schema of an event record as stored in assets/events.json.
+
+Records are validated in bulk with one cached pydantic TypeAdapter: by
+scripts/fetch_meetup.py before syncing into the event store, and by
+events_page when loading events.json. Invalid records are dropped and
+reported with the reasons pydantic gives, instead of vanishing silently.
+"""
+
+from __future__ import annotations
+from functools import lru_cache
+from typing import Any
+
+from pydantic import OnErrorOmit, TypeAdapter, ValidationError
+from typing_extensions import NotRequired, TypedDict
+
+
+class Venue(TypedDict):
+    name: str
+
+
+class EventRecord(TypedDict):
+    """One event, as written by fetch_meetup.py (other keys are dropped)."""
+
+    name: NotRequired[str | None]
+    link: NotRequired[str | None]
+    time: NotRequired[int | None]  # epoch ms, UTC
+    venue: NotRequired[Venue | str | None]
+    description: NotRequired[str | None]
+    group: NotRequired[str | None]  # Meetup group urlname
+    # Older files: title/url instead of name/link, ISO dates instead of time
+    title: NotRequired[str | None]
+    url: NotRequired[str | None]
+    date: NotRequired[str | None]
+    local_date: NotRequired[str | None]
+    utc_time: NotRequired[str | None]
+    iso_time: NotRequired[str | None]
+
+
+# (index of the record in the input, reasons it is invalid)
+Invalid = tuple[int, str]
+
+
+@lru_cache(maxsize=None)
+def events_adapter() -> TypeAdapter[list[EventRecord]]:
+    return TypeAdapter(list[EventRecord])
+
+
+@lru_cache(maxsize=None)
+def _lenient_adapter() -> TypeAdapter[list[EventRecord]]:
+    """Like events_adapter(), but leaves invalid records out of the list."""
+    return TypeAdapter(list[OnErrorOmit[EventRecord]])
+
+
+def _invalid(e: ValidationError) -> list[Invalid]:
+    """Group the errors of a list validation by record.
+
+    Raises ValueError if the input itself is not a list (or not JSON).
+    """
+    reasons: dict[int, list[str]] = {}
+    for err in e.errors(include_url=False, include_input=False):
+        loc = err["loc"]
+        if not loc or not isinstance(loc[0], int):
+            raise ValueError(err["msg"]) from None
+        field = ".".join(str(part) for part in loc[1:]) or "record"
+        reasons.setdefault(loc[0], []).append(f"{field}: {err['msg']}")
+    return [(i, "; ".join(r)) for i, r in sorted(reasons.items())]
+
+
+def validate_events(data: Any) -> tuple[list[EventRecord], list[Invalid]]:
+    """Validate a list of records; returns (valid records, invalid ones).
+
+    Raises ValueError if ``data`` is not a list at all.
+    """
+    try:
+        return events_adapter().validate_python(data), []
+    except ValidationError as e:
+        invalid = _invalid(e)
+    # Only on errors: a second pass that drops the invalid records
+    return _lenient_adapter().validate_python(data), invalid
+
+
+def validate_events_json(raw: bytes | str) -> tuple[list[EventRecord], list[Invalid]]:
+    """Parse and validate an events.json document in one pass.
+
+    Raises ValueError if it is not valid JSON (e.g. truncated) or not a list.
+    """
+    try:
+        return events_adapter().validate_json(raw), []
+    except ValidationError as e:
+        invalid = _invalid(e)
+    return _lenient_adapter().validate_json(raw), invalid
@@ -0,0 +1,349 @@
+"""
+SQLite event store backed by ``rxconfig.db_url``.
+
+scripts/fetch_meetup.py upserts fetched events here in batched transactions,
+keeps its delta-sync watermark in ``sync_state`` and exports
+assets/events.json from it; events_page reads upcoming and past events with
+indexed range queries.
+"""
+
+from __future__ import annotations
+import hashlib
+import os
+import re
+from functools import lru_cache
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import delete, func, inspect, text
+from sqlalchemy import event as sa_event
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine
+from sqlmodel import Field, Session, SQLModel, create_engine, select
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+DEFAULT_DB_URL = "sqlite:///pyzgz.db"
+BATCH_SIZE = 500
+# Columns an upsert updates on an existing event
+UPDATE_COLUMNS = ("name", "link", "time", "venue", "description", "group")
+
+_EVENT_ID_RE = re.compile(r"/events/(\d+)")
+
+
+class Event(SQLModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+    meetup_id: str = Field(index=True, unique=True)
+    name: str | None = None
+    link: str | None = None
+    time: int | None = Field(default=None, index=True)  # epoch ms, UTC
+    venue: str | None = None
+    description: str | None = None
+    group: str | None = Field(default=None, index=True)  # Meetup group urlname
+
+    def to_dict(self) -> dict[str, Any]:
+        """The event in the assets/events.json shape."""
+        return {
+            "name": self.name,
+            "link": self.link,
+            "time": self.time,
+            "venue": {"name": self.venue} if self.venue else None,
+            "description": self.description,
+            "group": self.group,
+        }
+
+
+class SyncState(SQLModel, table=True):
+    __tablename__ = "sync_state"
+
+    source: str = Field(primary_key=True)  # e.g. "api:python_zgz"
+    watermark: int | None = None  # latest past event time seen (epoch ms)
+    last_sync: int | None = None  # epoch ms
+    last_full_sync: int | None = None  # epoch ms
+
+
+def event_id(ev: dict) -> str | None:
+    """Stable key for an event: the Meetup id from its link, else link/name+time."""
+    link = ev.get("link") or ev.get("url")
+    if isinstance(link, str):
+        m = _EVENT_ID_RE.search(link)
+        if m:
+            return m.group(1)
+        return link
+    if ev.get("name") and ev.get("time") is not None:
+        return f"{ev['name']}@{ev['time']}"
+    return None
+
+
+def event_key(ev: dict) -> str:
+    """URL-safe form of event_id(): the Meetup id, else a short hash ("" if none)."""
+    key = event_id(ev)
+    if key is None:
+        return ""
+    return key if key.isdigit() else hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def db_url() -> str:
+    """The configured database URL (relative SQLite paths resolve to the repo root)."""
+    url = os.getenv("PYZGZ_DB_URL")
+    if not url:
+        try:
+            from rxconfig import config
+
+            url = config.db_url or DEFAULT_DB_URL
+        except Exception:
+            url = DEFAULT_DB_URL
+    prefix = "sqlite:///"
+    if url.startswith(prefix) and not os.path.isabs(url[len(prefix) :]):
+        url = prefix + os.path.join(os.path.abspath(BASE_DIR), url[len(prefix) :])
+    return url
+
+
+def db_path() -> str | None:
+    """Filesystem path of the SQLite database, or None for other backends."""
+    url = db_url()
+    return url[len("sqlite:///") :] if url.startswith("sqlite:///") else None
+
+
+def exists() -> bool:
+    """Whether the store has been created (avoids creating an empty db on read)."""
+    path = db_path()
+    return path is None or os.path.exists(path)
+
+
+@lru_cache(maxsize=None)
+def get_engine(url: str | None = None) -> Engine:
+    engine = create_engine(url or db_url())
+    if engine.dialect.name == "sqlite":
+
+        @sa_event.listens_for(engine, "connect")
+        def _sqlite_pragmas(dbapi_conn: Any, _record: Any) -> None:
+            cur = dbapi_conn.cursor()
+            cur.execute("PRAGMA journal_mode=WAL")
+            cur.execute("PRAGMA synchronous=NORMAL")
+            cur.close()
+
+    SQLModel.metadata.create_all(engine, tables=[Event.__table__, SyncState.__table__])
+    _add_missing_columns(engine)
+    return engine
+
+
+def _add_missing_columns(engine: Engine) -> None:
+    """Add columns introduced after a store was created (create_all skips them)."""
+    table = Event.__table__
+    existing = {c["name"] for c in inspect(engine).get_columns(table.name)}
+    missing = [c for c in table.columns if c.name not in existing]
+    if not missing:
+        return
+    with engine.begin() as conn:
+        for column in missing:
+            name = engine.dialect.identifier_preparer.quote(column.name)
+            ctype = column.type.compile(engine.dialect)
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {name} {ctype}"))
+            if column.index:
+                conn.execute(
+                    text(
+                        f"CREATE INDEX IF NOT EXISTS ix_{table.name}_{column.name} "
+                        f"ON {table.name} ({name})"
+                    )
+                )
+
+
+def _row(ev: dict) -> dict[str, Any] | None:
+    key = event_id(ev)
+    if key is None:
+        return None
+    venue = ev.get("venue")
+    if isinstance(venue, dict):
+        venue = venue.get("name")
+    t = ev.get("time")
+    return {
+        "meetup_id": key,
+        "name": ev.get("name"),
+        "link": ev.get("link"),
+        "time": int(t) if isinstance(t, (int, float)) else None,
+        "venue": venue if isinstance(venue, str) and venue else None,
+        "description": ev.get("description"),
+        "group": ev.get("group"),
+    }
+
+
+def upsert_events(
+    events: Iterable[dict], batch_size: int = BATCH_SIZE, partial: bool = False
+) -> int:
+    """Insert or update events keyed by Meetup id, one transaction per batch.
+
+    A record replaces the stored event, so a field the source cleared (a
+    removed venue) is cleared in the store too. With ``partial`` the records
+    come from a sparser source (the iCal feed has no description): a field
+    missing from them (None) keeps its stored value instead of erasing what
+    a richer source stored.
+    """
+    rows = [r for r in map(_row, events) if r is not None]
+    engine = get_engine()
+    table = Event.__table__
+    for start in range(0, len(rows), batch_size):
+        stmt = insert(Event).values(rows[start : start + batch_size])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Event.meetup_id],
+            set_={
+                c: (
+                    func.coalesce(stmt.excluded[c], table.c[c])
+                    if partial
+                    else stmt.excluded[c]
+                )
+                for c in UPDATE_COLUMNS
+            },
+        )
+        with engine.begin() as conn:
+            conn.execute(stmt)
+    return len(rows)
+
+
+def sync_events(
+    events: list[dict],
+    since_ms: int | None,
+    group: str | None = None,
+    batch_size: int = BATCH_SIZE,
+    partial: list[dict] | None = None,
+) -> int:
+    """Upsert ``events`` and prune stored events the source no longer returns.
+
+    ``events`` (complete records) and ``partial`` (records of a sparser
+    source, see upsert_events) must together be everything the sources have
+    starting at or after ``since_ms`` (or their whole history when None);
+    stored events in that window that are missing were cancelled or
+    deleted. With ``group`` only that group's events are pruned. Returns how
+    many events were removed.
+    """
+    partial = partial or []
+    upsert_events(events, batch_size)
+    upsert_events(partial, batch_size, partial=True)
+    seen = {event_id(ev) for ev in events} | {event_id(ev) for ev in partial}
+    stmt = select(Event.meetup_id)
+    if since_ms is not None:
+        stmt = stmt.where(Event.time >= since_ms)
+    if group is not None:
+        stmt = stmt.where(Event.group == group)
+    with get_engine().begin() as conn:
+        stale = [k for k in conn.execute(stmt).scalars() if k not in seen]
+        for start in range(0, len(stale), batch_size):
+            batch = stale[start : start + batch_size]
+            conn.execute(delete(Event).where(Event.meetup_id.in_(batch)))
+    return len(stale)
+
+
+def latest_time_before(now_ms: int, group: str | None = None) -> int | None:
+    """Start time of the most recent stored event (of ``group``) before ``now_ms``."""
+    stmt = select(func.max(Event.time)).where(Event.time < now_ms)
+    if group is not None:
+        stmt = stmt.where(Event.group == group)
+    with Session(get_engine()) as session:
+        return session.exec(stmt).one()
+
+
+def get_sync_state(source: str) -> SyncState | None:
+    with Session(get_engine()) as session:
+        return session.get(SyncState, source)
+
+
+def save_sync_state(
+    source: str, watermark: int | None, last_sync: int, full: bool = False
+) -> None:
+    with Session(get_engine()) as session:
+        state = session.get(SyncState, source) or SyncState(source=source)
+        state.watermark = watermark
+        state.last_sync = last_sync
+        if full:
+            state.last_full_sync = last_sync
+        session.add(state)
+        session.commit()
+
+
+def count() -> int:
+    with Session(get_engine()) as session:
+        return session.exec(select(func.count()).select_from(Event)).one()
+
+
+def upcoming(
+    now_ms: int, limit: int | None = None, group: str | None = None
+) -> list[dict]:
+    """Events starting at or after ``now_ms``, soonest first."""
+    stmt = select(Event).where(Event.time >= now_ms).order_by(Event.time).limit(limit)
+    if group is not None:
+        stmt = stmt.where(Event.group == group)
+    with Session(get_engine()) as session:
+        return [ev.to_dict() for ev in session.exec(stmt)]
+
+
+def past(
+    now_ms: int, limit: int | None = None, offset: int = 0, group: str | None = None
+) -> list[dict]:
+    """Events that started before ``now_ms``, most recent first."""
+    stmt = (
+        select(Event)
+        .where(Event.time < now_ms)
+        .order_by(Event.time.desc())  # type: ignore[union-attr]
+        .limit(limit)
+        .offset(offset)
+    )
+    if group is not None:
+        stmt = stmt.where(Event.group == group)
+    with Session(get_engine()) as session:
+        return [ev.to_dict() for ev in session.exec(stmt)]
+
+
+def between(start_ms: int, end_ms: int) -> list[dict]:
+    """Events starting in [start_ms, end_ms), most recent first."""
+    stmt = (
+        select(Event)
+        .where(Event.time >= start_ms, Event.time < end_ms)
+        .order_by(Event.time.desc())  # type: ignore[union-attr]
+    )
+    with Session(get_engine()) as session:
+        return [ev.to_dict() for ev in session.exec(stmt)]
+
+
+def times_before(now_ms: int) -> list[int]:
+    """Start times of past events, most recent first (an index-only scan)."""
+    newest_first = Event.time.desc()  # type: ignore[union-attr]
+    stmt = select(Event.time).where(Event.time < now_ms).order_by(newest_first)
+    with Session(get_engine()) as session:
+        return list(session.exec(stmt))
+
+
+def groups() -> list[str]:
+    """Groups with stored events, alphabetically."""
+    stmt = (
+        select(Event.group)
+        .where(Event.group.is_not(None))  # type: ignore[union-attr]
+        .distinct()
+        .order_by(Event.group)
+    )
+    with Session(get_engine()) as session:
+        return list(session.exec(stmt))
+
+
+def all_events() -> list[dict]:
+    """Every stored event, newest first (undated events last)."""
+    stmt = select(Event).order_by(
+        Event.time.is_(None),  # type: ignore[union-attr]
+        Event.time.desc(),  # type: ignore[union-attr]
+        Event.link,
+    )
+    with Session(get_engine()) as session:
+        return [ev.to_dict() for ev in session.exec(stmt)]
+
+
+def iter_events(batch_size: int = BATCH_SIZE) -> Iterator[dict]:
+    """Every stored event like all_events(), fetched ``batch_size`` rows at a time."""
+    stmt = (
+        select(Event)
+        .order_by(
+            Event.time.is_(None),  # type: ignore[union-attr]
+            Event.time.desc(),  # type: ignore[union-attr]
+            Event.link,
+        )
+        .execution_options(yield_per=batch_size)
+    )
+    with Session(get_engine()) as session:
+        for ev in session.exec(stmt):
+            yield ev.to_dict()
@@ -1,39 +1,229 @@
 import reflex as rx
+from . import calendar_index, event_store
+from .event_details import detail_url
+from .event_schema import EventRecord, validate_events_json
 from .layout import page_wrapper, styles
+from bisect import bisect_left
+from calendar import monthrange
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import Callable, Iterator
+from zoneinfo import ZoneInfo
 import json
 import os
+import time
 
 
 # Resolve assets/events.json relative to the project root (one level up from this file's dir)
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 ASSETS_EVENTS = os.path.join(BASE_DIR, "assets", "events.json")
+# Written by scripts/fetch_meetup.py --shards: upcoming events, one file per
+# year of past events and an index; preferred over events.json when present
+ASSETS_SHARDS = os.path.join(BASE_DIR, "assets", "data")
+SHARD_INDEX = "events-index.json"
+INVALID_SHOWN = 5  # invalid records listed per file when loading
 
+# /events shows upcoming events plus the latest PAST_PER_PAGE past ones; older
+# events live on /events/page/<n> and /events/<year> so every page stays small.
+# With events from several Meetup groups, /events/group/<group> filters by group.
+PAST_PER_PAGE = 12
+# Paged archive routes stop here; older events are only in the year archives
+MAX_PAST_PAGES = 20
+SITE_TZ = ZoneInfo("Europe/Madrid")
+MEETUP_URL = "https://www.meetup.com/es-ES/{group}/"
+DEFAULT_GROUP = "python_zgz"
+CALENDAR_ROUTE = "/events/calendar"
+MONTH_NAMES = [
+    "enero", "febrero", "marzo", "abril", "mayo", "junio",
+    "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre",
+]  # fmt: skip
+WEEKDAYS = ["L", "M", "X", "J", "V", "S", "D"]
 
-def _load_events() -> list[dict]:
-    """Load events from assets/events.json. Returns [] on any error."""
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    """An event normalized once at load time, ready to render."""
+
+    when: datetime | None  # UTC
+    when_display: str
+    title: str
+    url: str
+    venue: str | None
+    group: str | None  # Meetup group urlname
+    key: str = ""  # stable id for the detail page ("" if the event has none)
+    description: str = ""  # as fetched (Meetup sends HTML)
+
+    @property
+    def detail_route(self) -> str:
+        return detail_url(self.key) if self.key else ""
+
+    @classmethod
+    def from_record(cls, ev: EventRecord) -> "Event":
+        """Build from a record already validated by event_schema."""
+        when = _parse_when(ev)
+        if when and when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        venue = ev.get("venue")
+        if isinstance(venue, dict):  # Venue; older files have a plain name
+            venue = venue["name"]
+        return cls(
+            when=when,
+            when_display=_format_when(when),
+            title=ev.get("name") or ev.get("title") or "Evento",
+            url=ev.get("link") or ev.get("url") or "#",
+            venue=venue,
+            group=ev.get("group") or None,
+            key=event_store.event_key(ev),  # type: ignore[arg-type]
+            description=ev.get("description") or "",
+        )
+
+
+# path -> ((mtime_ns, size), dated events sorted by start time)
+_events_cache: dict[str, tuple[tuple[int, int], tuple[Event, ...]]] = {}
+
+
+def _warn(message: str) -> None:
+    print(f"[events_page] Warning: {message}")
+
+
+def _read_json(path: str) -> object | None:
+    """Parsed JSON of ``path``; None (with a warning) if it is unreadable."""
     try:
-        if not os.path.exists(ASSETS_EVENTS):
-            return []
-        with open(ASSETS_EVENTS, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data if isinstance(data, list) else []
-    except Exception:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        _warn(f"cannot read {path}: {e}")
+        return None
+
+
+def _read_events_json(path: str | None = None) -> list[EventRecord] | None:
+    """Load and validate events from ``path`` (assets/events.json by default).
+
+    Returns [] if the file does not exist and None (with a warning) if it is
+    corrupt, e.g. truncated, so callers can tell it apart from no events.
+    Invalid records are left out, with a warning giving the reasons.
+    """
+    path = path or ASSETS_EVENTS
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
         return []
+    except OSError as e:
+        _warn(f"cannot read {path}: {e}")
+        return None
+    try:
+        events, invalid = validate_events_json(raw)
+    except ValueError as e:
+        _warn(f"{path} is not a valid list of events: {e}")
+        return None
+    if invalid:
+        _warn(f"{len(invalid)} invalid events skipped in {path}")
+        for index, reason in invalid[:INVALID_SHOWN]:
+            _warn(f"  event #{index}: {reason}")
+    return events
 
 
-def _parse_when(ev: dict) -> datetime | None:
+def _load_events(path: str | None = None) -> tuple[Event, ...]:
+    """Dated events from ``path`` (assets/events.json), sorted by start time.
+
+    Normalized once and cached on the file's mtime, so repeated page builds
+    don't re-read or re-parse an unchanged file. If the file turns out to be
+    corrupt, the last good copy read in this process is kept.
+    """
+    path = path or ASSETS_EVENTS
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ()
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _events_cache.get(path)
+    if cached is None or cached[0] != stamp:
+        data = _read_events_json(path)
+        if data is None:
+            if cached is not None:
+                _warn(f"keeping the last good copy of {path}")
+            return cached[1] if cached else ()
+        normalized = (Event.from_record(e) for e in data)
+        events = tuple(sorted((e for e in normalized if e.when), key=lambda e: e.when))
+        cached = _events_cache[path] = (stamp, events)
+    return cached[1]
+
+
+def _shard_index() -> dict | None:
+    """The shard index written by fetch_meetup.py --shards, if there is one."""
+    path = os.path.join(ASSETS_SHARDS, SHARD_INDEX)
+    if not os.path.exists(path):
+        return None
+    index = _read_json(path)
+    if (
+        isinstance(index, dict)
+        and isinstance(index.get("years"), list)
+        and all(
+            isinstance(entry, dict)
+            and isinstance(entry.get("path"), str)
+            and isinstance(entry.get("count"), int)
+            for entry in [index.get("upcoming"), *index["years"]]
+        )
+    ):
+        return index
+    _warn(f"ignoring malformed {path}; using {ASSETS_EVENTS}")
+    return None
+
+
+def _load_shard(entry: dict) -> tuple[Event, ...]:
+    return _load_events(os.path.join(ASSETS_SHARDS, os.path.basename(entry["path"])))
+
+
+def _sharded_past(
+    index: dict,
+    offset: int = 0,
+    limit: int | None = None,
+    group: str | None = None,
+    years: set[int] | None = None,
+) -> list[Event]:
+    """Past events from the shards, latest first, reading only the shards needed.
+
+    Events of the upcoming shard that started since the export come first;
+    then the year shards, which are skipped by their indexed counts until
+    ``offset`` is reached.
+    """
+    chunks: list[tuple[int | None, Callable[[], list[Event]]]] = [
+        (None, lambda: _split_events(_load_shard(index["upcoming"]))[1])
+    ]
+    for entry in index["years"]:
+        if years is None or entry.get("year") in years:
+            chunks.append(
+                (entry["count"], lambda e=entry: list(reversed(_load_shard(e))))
+            )
+    past: list[Event] = []
+    for count, load in chunks:
+        if limit is not None and len(past) >= limit:
+            break
+        if group is None and count is not None and count <= offset:
+            offset -= count
+            continue
+        events = [e for e in load() if group is None or e.group == group]
+        if offset >= len(events):
+            offset -= len(events)
+            continue
+        past.extend(events[offset:])
+        offset = 0
+    return past[:limit]
+
+
+def _parse_when(ev: EventRecord) -> datetime | None:
     """Parse event date from common fields (iso string or epoch ms)."""
     # Accept 'time' (ms since epoch) or 'date'/'local_date' (ISO-like)
     t = ev.get("time")
-    if isinstance(t, (int, float)):
+    if t is not None:
         try:
-            return datetime.fromtimestamp(float(t) / 1000.0, tz=timezone.utc)
-        except Exception:
+            return datetime.fromtimestamp(t / 1000.0, tz=timezone.utc)
+        except (OverflowError, OSError, ValueError):
             pass
     for key in ("date", "local_date", "utc_time", "iso_time"):
         val = ev.get(key)
-        if isinstance(val, str):
+        if val:
             try:
                 # Try full ISO first
                 return datetime.fromisoformat(val.replace("Z", "+00:00"))
@@ -51,36 +241,174 @@ def _parse_when(ev: dict) -> datetime | None:
 def _format_when(dt: datetime | None) -> str:
     if not dt:
         return ""
-    local = dt.astimezone()  # viewer local time
-    return local.strftime("%d %b %Y, %H:%M")
-
-
-def _split_events(events: list[dict]) -> tuple[list[dict], list[dict]]:
-    now = datetime.now(timezone.utc)
-    enriched: list[tuple[dict, datetime | None]] = [(e, _parse_when(e)) for e in events]
-    upcoming = [e for e, d in enriched if d and d >= now]
-    past = [e for e, d in enriched if d and d < now]
-    # sort
-    upcoming.sort(key=lambda e: _parse_when(e) or now)
-    past.sort(key=lambda e: _parse_when(e) or now, reverse=True)
-    return upcoming, past
-
-
-def _event_card(ev: dict) -> rx.Component:
-    title = ev.get("name") or ev.get("title") or "Evento"
-    url = ev.get("link") or ev.get("url") or "#"
-    when = _format_when(_parse_when(ev))
-    venue = (
-        ev.get("venue", {}).get("name")
-        if isinstance(ev.get("venue"), dict)
-        else ev.get("venue")
-    )
+    # viewer local time; time.localtime is much cheaper than dt.astimezone()
+    return time.strftime("%d %b %Y, %H:%M", time.localtime(dt.timestamp()))
+
+
+def _split_events(
+    events: tuple[Event, ...], now: datetime | None = None
+) -> tuple[list[Event], list[Event]]:
+    """Split sorted events into upcoming (soonest first) and past (latest first)."""
+    now = now or datetime.now(timezone.utc)
+    i = bisect_left(events, now, key=lambda e: e.when)
+    return list(events[i:]), list(reversed(events[:i]))
+
+
+def _now_ms() -> int:
+    return int(datetime.now(timezone.utc).timestamp() * 1000)
+
+
+def _use_store() -> bool:
+    """Read the event store if it exists and has events, else events.json."""
+    try:
+        return event_store.exists() and event_store.count() > 0
+    except Exception:
+        return False
+
+
+def _from_store(rows: list[dict]) -> list[Event]:
+    return [Event.from_record(e) for e in rows]  # type: ignore[arg-type]
+
+
+def _upcoming_and_past(
+    past_limit: int | None = None, group: str | None = None
+) -> tuple[list[Event], list[Event]]:
+    """Upcoming and (up to ``past_limit``) past events, of ``group`` if given."""
+    if _use_store():
+        now_ms = _now_ms()
+        return (
+            _from_store(event_store.upcoming(now_ms, group=group)),
+            _from_store(event_store.past(now_ms, limit=past_limit, group=group)),
+        )
+    index = _shard_index()
+    if index is not None:
+        upcoming = _split_events(_load_shard(index["upcoming"]))[0]
+        if group is not None:
+            upcoming = [e for e in upcoming if e.group == group]
+        return upcoming, _sharded_past(index, limit=past_limit, group=group)
+    upcoming, past = _split_events(_load_events())
+    if group is not None:
+        upcoming = [e for e in upcoming if e.group == group]
+        past = [e for e in past if e.group == group]
+    return upcoming, past[:past_limit]
+
+
+def _groups() -> list[str]:
+    """Meetup groups with events, alphabetically."""
+    if _use_store():
+        return event_store.groups()
+    index = _shard_index()
+    if index is not None:
+        return sorted(index.get("groups") or [])
+    return sorted({e.group for e in _load_events() if e.group})
+
+
+def _past_page(page: int) -> list[Event]:
+    """Page ``page`` (1-based) of past events, most recent first."""
+    offset = (page - 1) * PAST_PER_PAGE
+    if _use_store():
+        return _from_store(event_store.past(_now_ms(), PAST_PER_PAGE, offset))
+    index = _shard_index()
+    if index is not None:
+        return _sharded_past(index, offset, PAST_PER_PAGE)
+    return _split_events(_load_events())[1][offset : offset + PAST_PER_PAGE]
+
+
+def _past_in_year(year: int) -> list[Event]:
+    """Past events of ``year`` (Europe/Madrid), most recent first."""
+    start = datetime(year, 1, 1, tzinfo=SITE_TZ)
+    end = min(datetime(year + 1, 1, 1, tzinfo=SITE_TZ), datetime.now(timezone.utc))
+    if _use_store():
+        return _from_store(
+            event_store.between(
+                int(start.timestamp() * 1000), int(end.timestamp() * 1000)
+            )
+        )
+    index = _shard_index()
+    if index is not None:
+        past = _sharded_past(index, years={year})
+        return [e for e in past if e.when and start <= e.when < end]
+    past = _split_events(_load_events(), end)[1]
+    return [e for e in past if e.when and e.when >= start]
+
+
+def _archive_index() -> tuple[int, list[int]]:
+    """Number of past-event pages (at most MAX_PAST_PAGES) and the years with
+    past events, latest first."""
+    index = None
+    if _use_store():
+        times = [
+            datetime.fromtimestamp(t / 1000, tz=timezone.utc)
+            for t in event_store.times_before(_now_ms())
+        ]
+    elif (index := _shard_index()) is not None:
+        # Events started since the export; the year shards are only counted
+        times = [e.when for e in _sharded_past(index, years=set()) if e.when]
+    else:
+        times = [e.when for e in _split_events(_load_events())[1] if e.when]
+    total = len(times)
+    indexed: set[int] = set()
+    if index is not None:
+        total += sum(entry["count"] for entry in index["years"])
+        indexed = {entry.get("year") for entry in index["years"] if entry["count"]}
+    pages = min(max(1, -(-total // PAST_PER_PAGE)), MAX_PAST_PAGES)
+    years = {t.astimezone(SITE_TZ).year for t in times} | indexed
+    return pages, sorted((y for y in years if isinstance(y, int)), reverse=True)
+
+
+def _record_start(ev: EventRecord) -> float:
+    when = _parse_when(ev)
+    return when.timestamp() if when else float("-inf")
+
+
+def records() -> Iterator[EventRecord]:
+    """Every event record from the current source, newest first, one at a time.
+
+    Store rows are streamed in batches; shards are read one file at a time.
+    """
+    if _use_store():
+        yield from event_store.iter_events()  # type: ignore[misc]
+        return
+    index = _shard_index()
+    if index is None:
+        paths = [ASSETS_EVENTS]
+    else:
+        # Upcoming first, then the year shards (latest first, as indexed)
+        paths = [
+            os.path.join(ASSETS_SHARDS, os.path.basename(entry["path"]))
+            for entry in [index["upcoming"], *index["years"]]
+        ]
+    for path in paths:
+        data = _read_events_json(path) or []
+        yield from sorted(data, key=_record_start, reverse=True)
+
+
+def _page_route(page: int) -> str:
+    return "/events" if page == 1 else f"/events/page/{page}"
+
+
+def _group_route(group: str) -> str:
+    return f"/events/group/{group}"
+
+
+def _event_card(ev: Event, show_group: bool = False) -> rx.Component:
     # desc = ev.get("description") or ev.get("short_description") or ""
     return rx.card(
         rx.vstack(
-            rx.link(title, href=url, is_external=True, font_weight="bold"),
-            rx.text(when, color="gray"),
-            rx.cond(venue is not None, rx.text(str(venue))),
+            rx.link(
+                ev.title,
+                href=ev.detail_route or ev.url,
+                is_external=not ev.detail_route,
+                # Detail pages are static files, not app routes
+                reload_document=True,
+                font_weight="bold",
+            ),
+            rx.text(ev.when_display, color="gray"),
+            rx.cond(ev.venue is not None, rx.text(str(ev.venue))),
+            rx.cond(
+                show_group and ev.group is not None,
+                rx.link(rx.badge(str(ev.group)), href=_group_route(str(ev.group))),
+            ),
             # rx.cond(bool(desc), rx.text(str(desc)) ),
             spacing="2",
             align="start",
@@ -90,9 +418,90 @@ def _event_card(ev: dict) -> rx.Component:
     )
 
 
+def _events_grid(
+    heading: str, events: list[Event], show_group: bool = False
+) -> rx.Component:
+    return rx.cond(
+        len(events) > 0,
+        rx.vstack(
+            rx.heading(heading, size="5"),
+            rx.grid(
+                *[_event_card(ev, show_group) for ev in events],
+                columns={"base": "1", "md": "2"},
+                gap="4",
+                width="100%",
+                justify="center",
+            ),
+            spacing="3",
+            width="100%",
+            align="center",
+        ),
+    )
+
+
+def _archive_nav(page: int | None, pages: int, years: list[int]) -> rx.Component:
+    """Links to the neighbouring past-event pages and to every year archive."""
+    pager = []
+    if page is not None and page > 1:
+        pager.append(rx.link("← Más recientes", href=_page_route(page - 1)))
+    if page is not None and page < pages:
+        pager.append(rx.link("Anteriores →", href=_page_route(page + 1)))
+    return rx.vstack(
+        rx.hstack(*pager, spacing="4", justify="center"),
+        rx.hstack(
+            rx.text("Archivo:"),
+            *[rx.link(str(y), href=f"/events/{y}") for y in years],
+            rx.link("Calendario", href=CALENDAR_ROUTE),
+            spacing="3",
+            wrap="wrap",
+            justify="center",
+        ),
+        spacing="2",
+        align="center",
+    )
+
+
+def _group_nav(current: str | None, groups: list[str]) -> rx.Component:
+    """Filter links: all groups, then one per group (the current one in bold)."""
+    links = [
+        rx.link(
+            label,
+            href=href,
+            font_weight="bold" if value == current else "normal",
+        )
+        for label, href, value in [("Todos", "/events", None)]
+        + [(g, _group_route(g), g) for g in groups]
+    ]
+    return rx.hstack(
+        rx.text("Grupos:"), *links, spacing="3", wrap="wrap", justify="center"
+    )
+
+
+def _events_layout(
+    title: str, *children: rx.Component, group: str = DEFAULT_GROUP
+) -> rx.Component:
+    return page_wrapper(
+        rx.section(
+            rx.vstack(
+                rx.heading(title),
+                *children,
+                rx.link(
+                    "Ver más en Meetup →",
+                    href=MEETUP_URL.format(group=group),
+                    is_external=True,
+                ),
+                spacing="5",
+                align="center",
+                width="100%",
+            ),
+            style=styles["section"],
+        )
+    )
+
+
 def events():
-    data = _load_events()
-    if not data:
+    upcoming, past = _upcoming_and_past(past_limit=PAST_PER_PAGE)
+    if not upcoming and not past:
         # Fallback view when there's no data yet
         return page_wrapper(
             rx.section(
@@ -114,53 +523,196 @@ def events():
             )
         )
 
-    upcoming, past = _split_events(data)
+    pages, years = _archive_index()
+    groups = _groups()
+    multi = len(groups) > 1
+    return _events_layout(
+        "Eventos",
+        rx.cond(multi, _group_nav(None, groups)),
+        _events_grid("Próximos", upcoming, multi),
+        _events_grid("Pasados", past, multi),
+        rx.cond(pages > 1 or len(years) > 0, _archive_nav(1, pages, years)),
+    )
 
-    return page_wrapper(
-        rx.section(
-            rx.vstack(
-                rx.heading("Eventos"),
-                rx.cond(
-                    len(upcoming) > 0,
-                    rx.vstack(
-                        rx.heading("Próximos", size="5"),
-                        rx.grid(
-                            *[_event_card(ev) for ev in upcoming],
-                            columns={"base": "1", "md": "2"},
-                            gap="4",
-                            width="100%",
-                            justify="center",
-                        ),
-                        spacing="3",
-                        width="100%",
-                        align="center",
-                    ),
-                ),
-                rx.cond(
-                    len(past) > 0,
-                    rx.vstack(
-                        rx.heading("Pasados", size="5"),
-                        rx.grid(
-                            *[_event_card(ev) for ev in past],
-                            columns={"base": "1", "md": "2"},
-                            gap="4",
-                            width="100%",
-                            justify="center",
-                        ),
-                        spacing="3",
-                        width="100%",
-                        align="center",
-                    ),
-                ),
-                rx.link(
-                    "Ver más en Meetup →",
-                    href="https://www.meetup.com/es-ES/python_zgz/",
-                    is_external=True,
-                ),
-                spacing="5",
-                align="center",
-                width="100%",
-            ),
-            style=styles["section"],
+
+def _archive_page(page: int) -> Callable[[], rx.Component]:
+    def events_archive_page() -> rx.Component:
+        pages, years = _archive_index()
+        return _events_layout(
+            f"Eventos pasados · página {page}",
+            _events_grid("Pasados", _past_page(page)),
+            _archive_nav(page, pages, years),
         )
+
+    events_archive_page.__name__ = f"events_page_{page}"
+    return events_archive_page
+
+
+def _year_page(year: int) -> Callable[[], rx.Component]:
+    def events_year_page() -> rx.Component:
+        pages, years = _archive_index()
+        return _events_layout(
+            f"Eventos {year}",
+            _events_grid("Pasados", _past_in_year(year)),
+            _archive_nav(None, pages, years),
+        )
+
+    events_year_page.__name__ = f"events_{year}"
+    return events_year_page
+
+
+def _group_page(group: str) -> Callable[[], rx.Component]:
+    def events_group_page() -> rx.Component:
+        upcoming, past = _upcoming_and_past(past_limit=PAST_PER_PAGE, group=group)
+        return _events_layout(
+            f"Eventos · {group}",
+            _group_nav(group, _groups()),
+            _events_grid("Próximos", upcoming),
+            _events_grid("Pasados", past),
+            group=group,
+        )
+
+    events_group_page.__name__ = f"events_group_{group}"
+    return events_group_page
+
+
+def _calendar_index() -> dict:
+    """The calendar index written at ingest; built from the events if missing."""
+    return calendar_index.load() or calendar_index.build(records())  # type: ignore[arg-type]
+
+
+def _initial_month(index: dict, now: datetime | None = None) -> tuple[int, int]:
+    """The month the calendar opens on: the next one with events, else the latest."""
+    local = (now or datetime.now(timezone.utc)).astimezone(SITE_TZ)
+    current = calendar_index.month_key(local.year, local.month)
+    months = list(index["counts"])
+    month = next((m for m in months if m >= current), months[-1] if months else current)
+    return int(month[:4]), int(month[5:])
+
+
+# Inline styles of the month grid; assets/calendar.js renders the same markup
+_GRID_STYLE = {
+    "display": "grid",
+    "gridTemplateColumns": "repeat(7, minmax(0, 1fr))",
+    "gap": "4px",
+    "width": "100%",
+}
+_WEEKDAY_STYLE = {"textAlign": "center", "fontWeight": "bold", "opacity": "0.7"}
+_DAY_STYLE = {
+    "minHeight": "5rem",
+    "padding": "4px",
+    "border": "1px solid var(--gray-a5)",
+    "borderRadius": "6px",
+    "fontSize": "0.85rem",
+    "overflow": "hidden",
+}
+_EVENT_STYLE = {"display": "block", "marginTop": "2px"}
+
+
+def _month_title(year: int, month: int) -> str:
+    return f"{MONTH_NAMES[month - 1].capitalize()} {year}"
+
+
+def _month_grid(index: dict, year: int, month: int) -> rx.Component:
+    """Monday-first grid of ``year``-``month`` with its events, one lookup."""
+    by_day: dict[int, list] = {}
+    for row in calendar_index.month_rows(index, year, month):
+        by_day.setdefault(row[0], []).append(row)
+    first_weekday, days = monthrange(year, month)
+    cells = [rx.el.div(d, style=_WEEKDAY_STYLE) for d in WEEKDAYS]
+    cells += [rx.el.div() for _ in range(first_weekday)]
+    for day in range(1, days + 1):
+        links = [
+            rx.el.a(f"{hhmm} {title}", href=detail_url(key), style=_EVENT_STYLE)
+            for _, hhmm, title, key in by_day.get(day, [])
+        ]
+        cells.append(rx.el.div(rx.el.strong(str(day)), *links, style=_DAY_STYLE))
+    return rx.el.div(*cells, id="calendar-grid", style=_GRID_STYLE)
+
+
+def calendar() -> rx.Component:
+    """/events/calendar: one month prerendered; calendar.js moves between months."""
+    index = _calendar_index()
+    year, month = _initial_month(index)
+    current = calendar_index.month_key(year, month)
+    months = list(index["counts"])
+    if current not in months:
+        months.append(current)
+    return _events_layout(
+        "Calendario",
+        rx.hstack(
+            rx.el.button("‹", id="calendar-prev", aria_label="Mes anterior"),
+            rx.heading(_month_title(year, month), size="5", id="calendar-title"),
+            rx.el.button("›", id="calendar-next", aria_label="Mes siguiente"),
+            spacing="4",
+            align="center",
+        ),
+        rx.el.select(
+            *[
+                rx.el.option(
+                    f"{_month_title(int(m[:4]), int(m[5:]))} "
+                    f"({index['counts'].get(m, 0)})",
+                    value=m,
+                )
+                for m in reversed(sorted(months))
+            ],
+            id="calendar-month",
+            default_value=current,
+            aria_label="Ir al mes",
+        ),
+        rx.box(
+            _month_grid(index, year, month),
+            id="calendar",
+            custom_attrs={"data-month": current},
+            width="100%",
+        ),
+        rx.link("← Todos los eventos", href="/events"),
+        rx.script(src="/calendar.js"),
     )
+
+
+def route_data(route: str) -> object:
+    """The data ``route`` renders (its events and the archive/group nav).
+
+    Hashed by scripts/export_if_changed.py to tell which routes changed.
+    """
+    nav = (_archive_index(), _groups())
+    if route == "/events":
+        return nav, _upcoming_and_past(past_limit=PAST_PER_PAGE)
+    kind, _, arg = route.removeprefix("/events/").partition("/")
+    if kind == "page" and arg.isdigit():
+        return nav, _past_page(int(arg))
+    if kind == "group":
+        return nav, _upcoming_and_past(past_limit=PAST_PER_PAGE, group=arg)
+    if route == CALENDAR_ROUTE:
+        return _calendar_index()
+    if kind.isdigit():
+        return nav, _past_in_year(int(kind))
+    return nav
+
+
+def archive_pages() -> list[tuple]:
+    """(route, page, title) for the archive and event routes.
+
+    /events/page/<n> (n >= 2), /events/<year>, /events/calendar and, when
+    there are events from more than one group, /events/group/<group>. The
+    event detail pages are static files (see event_details) and the paged
+    archive is capped, so the route count grows with the years and groups,
+    not the events.
+    """
+    pages, years = _archive_index()
+    routes: list[tuple] = [
+        (_page_route(n), _archive_page(n), f"Eventos · página {n} · PythonZgz")
+        for n in range(2, pages + 1)
+    ]
+    routes += [
+        (f"/events/{y}", _year_page(y), f"Eventos {y} · PythonZgz") for y in years
+    ]
+    routes.append((CALENDAR_ROUTE, calendar, "Calendario · PythonZgz"))
+    groups = _groups()
+    if len(groups) > 1:
+        routes += [
+            (_group_route(g), _group_page(g), f"Eventos · {g} · PythonZgz")
+            for g in groups
+        ]
+    return routes
@@ -0,0 +1,41 @@
+import json
+import os
+from functools import lru_cache
+
+import reflex as rx
+
+# Written by scripts/optimize_images.py
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+IMAGES_MANIFEST = os.path.join(BASE_DIR, "assets", "img", "manifest.json")
+
+
+@lru_cache(maxsize=1)
+def _manifest() -> dict:
+    """Load the optimized-variants manifest. Returns {} on any error."""
+    try:
+        with open(IMAGES_MANIFEST, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def responsive_image(src: str, sizes: str, **props) -> rx.Component:
+    """rx.image for an asset, with AVIF/WebP srcset/sizes when variants exist.
+
+    ``sizes`` is the rendered width (e.g. "200px"). Without optimized
+    variants (scripts/optimize_images.py not run) this is a plain rx.image.
+    """
+    entry = _manifest().get(src.lstrip("/"))
+    if not entry or not entry.get("sources"):
+        return rx.image(src=src, **props)
+    sources = [
+        rx.el.source(
+            type=mime,
+            src_set=", ".join(f"{url} {w}w" for url, w, *_ in variants),
+            sizes=sizes,
+        )
+        for mime, variants in entry["sources"].items()
+        if variants
+    ]
+    return rx.el.picture(*sources, rx.image(src=src, sizes=sizes, **props))
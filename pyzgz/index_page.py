@@ -1,4 +1,5 @@
 import reflex as rx
+from .images import responsive_image
 from .layout import page_wrapper, styles
 
 
@@ -6,8 +7,12 @@ def index():
     return page_wrapper(
         rx.section(
             rx.vstack(
-                rx.image(
-                    src="/logo.png", alt="Logo PythonZgz", width="200px", height="auto"
+                responsive_image(
+                    "/logo.png",
+                    sizes="200px",
+                    alt="Logo PythonZgz",
+                    width="200px",
+                    height="auto",
                 ),
                 rx.heading("Comunidad Python Zaragoza", size="8"),
                 # rx.text(
@@ -14,6 +14,9 @@ styles = {
 }
 
 EMAIL = "zaragoza@es.python.org"
+# Marks text the browser replaces (e.g. "Cargando…"); scripts/prerender.py
+# does not count it as a page's content
+PLACEHOLDER_ATTR = "data-placeholder"
 
 
 def dark_mode_toggle() -> rx.Component:
@@ -37,6 +40,41 @@ def dark_mode_toggle() -> rx.Component:
     )
 
 
+def search_box() -> rx.Component:
+    """Search over events, posts and pages, run in the browser by
+    assets/search.js on the index from scripts/build_search_index.py."""
+    return rx.box(
+        rx.input(
+            id="site-search",
+            type="search",
+            placeholder="Buscar…",
+            aria_label="Buscar en la web",
+            auto_complete=False,
+            width=["8rem", "12rem"],
+        ),
+        rx.box(
+            id="site-search-results",
+            hidden=True,
+            style={
+                "position": "absolute",
+                "top": "calc(100% + 0.25rem)",
+                "right": 0,
+                "width": "min(22rem, 90vw)",
+                "max_height": "70vh",
+                "overflow_y": "auto",
+                "border_radius": "8px",
+                "border": rx.color_mode_cond(
+                    light="#eaeaea 1px solid", dark="#222 1px solid"
+                ),
+                "background": rx.color_mode_cond(light="#ffffff", dark="#111111"),
+                "box_shadow": "0 8px 24px rgba(0, 0, 0, 0.2)",
+            },
+        ),
+        rx.script(src="/search.js"),
+        position="relative",
+    )
+
+
 def nav():
     return rx.box(
         rx.hstack(
@@ -47,6 +85,7 @@ def nav():
                 font_size="1.25rem",
             ),
             rx.spacer(),
+            search_box(),
             rx.hstack(
                 rx.link("Eventos", href="/events"),
                 rx.link("Blog", href="/blog"),
@@ -132,5 +171,10 @@ def footer():
     )
 
 
+def placeholder(text: str) -> rx.Component:
+    """``text`` shown until client code fills its container in."""
+    return rx.text(text, color="gray", custom_attrs={PLACEHOLDER_ATTR: ""})
+
+
 def page_wrapper(*children):
     return rx.box(nav(), rx.box(*children, style=styles["container"]), footer())
@@ -0,0 +1,279 @@
+"""
+Live events for deployments that run the Reflex backend (PYZGZ_LIVE_EVENTS=1).
+
+The static export bakes the events into /events at build time. In live mode
+/events is served from LiveEventsState instead:
+
+- one process-wide TTL cache (``cache``) holds the rendered upcoming and
+  recent past events;
+- a lifespan task (``refresher``) refreshes it every LIVE_TTL_S by running
+  scripts/fetch_meetup.py's sync_once (conditional requests, delta sync, the
+  event store) in a worker thread, then reading the store as events_page
+  does. Concurrent callers share the refresh in flight, so Meetup sees one
+  fetch per TTL however many sessions are open;
+- each open /events page runs LiveEventsState.watch, which waits for the
+  cache to change and pushes the new events over the websocket.
+
+Without PYZGZ_LIVE_EVENTS this module is not imported and the export is
+unchanged.
+"""
+
+from __future__ import annotations
+import asyncio
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+import reflex as rx
+
+from . import events_page
+from .layout import page_wrapper, styles
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+SCRIPTS_DIR = os.path.join(BASE_DIR, "scripts")
+# Seconds a fetched snapshot is served before it is refreshed
+LIVE_TTL_S = float(os.getenv("PYZGZ_LIVE_TTL") or 300)
+# A page stops listening for updates after this long (closed tabs included)
+WATCH_MAX_S = 6 * 3600
+
+Card = dict[str, str]
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    """Events as rendered by the live page, with when they were fetched."""
+
+    version: int
+    fetched_at: float  # time.time()
+    upcoming: list[Card] = field(default_factory=list)
+    past: list[Card] = field(default_factory=list)
+    error: str | None = None  # of the last fetch, if it failed
+
+
+def _card(ev: events_page.Event) -> Card:
+    return {
+        "title": ev.title,
+        "url": ev.url,
+        "when": ev.when_display,
+        "venue": ev.venue or "",
+        "group": ev.group or "",
+    }
+
+
+def _fetch() -> None:
+    """One fetch_meetup.py sync (into the event store and events.json)."""
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    import fetch_meetup
+
+    try:
+        asyncio.run(
+            fetch_meetup.sync_once(
+                fetch_meetup.load_groups(),
+                os.getenv("MEETUP_TOKEN"),
+                fetch_meetup.load_cache(),
+            )
+        )
+    finally:
+        fetch_meetup.metrics.finish()
+        fetch_meetup.write_metrics(fetch_meetup.METRICS_PATH, None)
+
+
+def _read() -> tuple[list[Card], list[Card]]:
+    upcoming, past = events_page._upcoming_and_past(
+        past_limit=events_page.PAST_PER_PAGE
+    )
+    return [_card(e) for e in upcoming], [_card(e) for e in past]
+
+
+class EventsCache:
+    """Process-wide TTL cache of the live events, refreshed one fetch at a time."""
+
+    def __init__(self, ttl: float = LIVE_TTL_S) -> None:
+        self.ttl = ttl
+        self.snapshot: Snapshot | None = None
+        self.fetches = 0
+        self._refreshing: asyncio.Task | None = None
+        self._changed: asyncio.Condition | None = None
+
+    def _condition(self) -> asyncio.Condition:
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        return self._changed
+
+    def fresh(self) -> bool:
+        return (
+            self.snapshot is not None
+            and time.time() - self.snapshot.fetched_at < self.ttl
+        )
+
+    async def get(self) -> Snapshot:
+        """The current snapshot, refreshed first if it is older than the TTL."""
+        if not self.fresh():
+            await self.refresh()
+        assert self.snapshot is not None
+        return self.snapshot
+
+    async def refresh(self) -> Snapshot:
+        """Fetch and reload; callers arriving meanwhile share the same refresh."""
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.create_task(self._refresh())
+        return await asyncio.shield(self._refreshing)
+
+    async def _refresh(self) -> Snapshot:
+        error = None
+        self.fetches += 1
+        try:
+            await asyncio.to_thread(_fetch)
+        except Exception as e:  # serve what the store has
+            error = f"{type(e).__name__}: {e}"
+            print(f"[live_events] fetch failed: {error}")
+        upcoming, past = await asyncio.to_thread(_read)
+        old = self.snapshot
+        changed = old is None or (upcoming, past) != (old.upcoming, old.past)
+        self.snapshot = Snapshot(
+            version=(old.version if old else 0) + int(changed),
+            fetched_at=time.time(),
+            upcoming=upcoming,
+            past=past,
+            error=error,
+        )
+        if changed:
+            async with self._condition():
+                self._condition().notify_all()
+        return self.snapshot
+
+    async def wait_for_change(self, version: int, timeout: float) -> Snapshot | None:
+        """The first snapshot newer than ``version``; None after ``timeout`` s."""
+        changed = self._condition()
+
+        def newer() -> bool:
+            return self.snapshot is not None and self.snapshot.version > version
+
+        try:
+            async with changed:
+                await asyncio.wait_for(changed.wait_for(newer), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return self.snapshot
+
+
+cache = EventsCache()
+
+
+async def refresher() -> None:
+    """Lifespan task: keep ``cache`` refreshed every LIVE_TTL_S."""
+    while True:
+        try:
+            await cache.refresh()
+        except Exception as e:  # keep refreshing; the old snapshot is served
+            print(f"[live_events] refresh failed: {e!r}")
+        await asyncio.sleep(cache.ttl)
+
+
+def _updated(snapshot: Snapshot) -> str:
+    when = datetime.fromtimestamp(snapshot.fetched_at, tz=events_page.SITE_TZ)
+    return when.strftime("%H:%M")
+
+
+class LiveEventsState(rx.State):
+    upcoming: list[Card] = []
+    past: list[Card] = []
+    updated: str = ""
+    _watching: bool = False
+
+    def _apply(self, snapshot: Snapshot) -> None:
+        self.upcoming = snapshot.upcoming
+        self.past = snapshot.past
+        self.updated = _updated(snapshot)
+
+    @rx.event(background=True)
+    async def watch(self):
+        """Show the cached events, then push every change until WATCH_MAX_S."""
+        async with self:
+            if self._watching:
+                return
+            self._watching = True
+        try:
+            snapshot = await cache.get()
+            deadline = time.monotonic() + WATCH_MAX_S
+            while snapshot is not None:
+                async with self:
+                    self._apply(snapshot)
+                snapshot = await cache.wait_for_change(
+                    snapshot.version, deadline - time.monotonic()
+                )
+        finally:
+            async with self:
+                self._watching = False
+
+
+def _live_card(ev: Any) -> rx.Component:
+    return rx.card(
+        rx.vstack(
+            rx.link(ev["title"], href=ev["url"], is_external=True, font_weight="bold"),
+            rx.text(ev["when"], color="gray"),
+            rx.cond(ev["venue"] != "", rx.text(ev["venue"])),
+            spacing="2",
+            align="start",
+        ),
+        width="100%",
+        align="center",
+    )
+
+
+def _live_grid(heading: str, events: Any) -> rx.Component:
+    return rx.cond(
+        events.length() > 0,
+        rx.vstack(
+            rx.heading(heading, size="5"),
+            rx.grid(
+                rx.foreach(events, _live_card),
+                columns={"base": "1", "md": "2"},
+                gap="4",
+                width="100%",
+                justify="center",
+            ),
+            spacing="3",
+            width="100%",
+            align="center",
+        ),
+    )
+
+
+def events() -> rx.Component:
+    """/events in live mode: upcoming and recent past events from the state."""
+    pages, years = events_page._archive_index()
+    return page_wrapper(
+        rx.section(
+            rx.vstack(
+                rx.heading("Eventos"),
+                rx.cond(
+                    LiveEventsState.updated != "",
+                    rx.text(
+                        f"Actualizado a las {LiveEventsState.updated}", color="gray"
+                    ),
+                    rx.spinner(),
+                ),
+                _live_grid("Próximos", LiveEventsState.upcoming),
+                _live_grid("Pasados", LiveEventsState.past),
+                rx.cond(
+                    pages > 1 or len(years) > 0,
+                    events_page._archive_nav(1, pages, years),
+                ),
+                rx.link(
+                    "Ver más en Meetup →",
+                    href=events_page.MEETUP_URL.format(group=events_page.DEFAULT_GROUP),
+                    is_external=True,
+                ),
+                spacing="5",
+                align="center",
+                width="100%",
+            ),
+            style=styles["section"],
+            on_mount=LiveEventsState.watch,
+        )
+    )
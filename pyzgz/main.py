@@ -1,17 +1,186 @@
 import reflex as rx
-from .index_page import index as index_page
-from .events_page import events as events_page
-from .blog_page import blog as blog_page
-from .talks_page import talks as talks_page
-from .about_page import about as about_page
-from .contact_page import contact as contact_page
+from importlib import import_module
+from typing import Callable, Iterator, NamedTuple
+import atexit
+import json
+import os
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+# Per-page compile times of the last build (see _report_timings)
+TIMINGS_PATH = os.path.join(BASE_DIR, ".cache", "page_timings.json")
+
+# ---------- Page registry ----------
+# (route, "module:function", title). Page modules are imported, and their
+# data loaded, only when reflex compiles the route, not when the app loads.
+PAGES: list[tuple[str, str, str]] = [
+    ("/", "index_page:index", "PythonZgz — Comunidad Python Zaragoza"),
+    ("/events", "events_page:events", "Eventos · PythonZgz"),
+    ("/blog", "blog_page:blog", "Blog · PythonZgz"),
+    # ("/comunity", "comunity_page:comunity", "Comunidad · PythonZgz"),
+    ("/talks", "talks_page:talks", "Proponer charla · PythonZgz"),
+    ("/about", "about_page:about", "Sobre · PythonZgz"),
+    ("/contact", "contact_page:contact", "Contacto · PythonZgz"),
+]
+# "module:function" returning (route, page, title[, add_page kwargs]) for
+# routes that depend on the data (archive pages, blog posts, ...),
+# registered after the page they follow. Unlike the pages, providers run
+# when the app loads: reflex 0.8 takes no routes once it starts compiling.
+# They only read the archive index (past start times, groups) and the
+# cached posts, about 60 ms with 10,000 events in the store.
+ROUTE_PROVIDERS: dict[str, str] = {
+    "/events": "events_page:archive_pages",
+    "/blog": "blog_page:blog_pages",
+}
+
+# PYZGZ_LIVE_EVENTS=1, for deployments running the backend: these routes are
+# served from live state (see live_events.py) instead of the exported data
+LIVE_EVENTS = os.getenv("PYZGZ_LIVE_EVENTS") == "1"
+LIVE_PAGES: dict[str, str] = {
+    "/events": "live_events:events",
+}
+# PYZGZ_TALKS_BACKEND=1: talk proposals are posted to this backend (see
+# talk_proposals.py) instead of the Google Form
+TALKS_BACKEND = os.getenv("PYZGZ_TALKS_BACKEND") == "1"
+TALKS_PAGES: dict[str, str] = {
+    "/talks": "talks_page:talks_form",
+}
+
+# Route (and the routes below it) -> "module:function" returning the data
+# the route renders, to skip unchanged exports (scripts/export_if_changed.py)
+DATA_INPUTS: dict[str, str] = {
+    "/events": "events_page:route_data",
+    "/blog": "blog_page:route_data",
+}
+
+
+class Route(NamedTuple):
+    """A page of the site, as given to ``app.add_page``."""
+
+    route: str
+    page: Callable[[], rx.Component]  # records its build time in page_timings
+    title: str
+    module: str  # page module it is built from
+    options: dict  # further add_page arguments (description, context, ...)
+
+
+# route -> seconds spent building the page (import + component tree)
+page_timings: dict[str, float] = {}
+# route -> Route, for every page register_pages() added to the app
+registered: dict[str, Route] = {}
+
+
+def _resolve(target: str) -> Callable:
+    module, _, name = target.partition(":")
+    return getattr(import_module(f".{module}", __package__), name)
+
+
+def timed_page(
+    route: str, page: str | Callable[[], rx.Component]
+) -> Callable[[], rx.Component]:
+    """A page function recording its build time in ``page_timings``.
+
+    ``page`` may be a "module:function" target, imported on the first build.
+    """
+    name = page.partition(":")[2] if isinstance(page, str) else page.__name__
+
+    def build() -> rx.Component:
+        t0 = time.perf_counter()
+        try:
+            fn = _resolve(page) if isinstance(page, str) else page
+            return fn()
+        finally:
+            page_timings[route] = time.perf_counter() - t0
+
+    build.__name__ = name
+    return build
+
+
+def routes() -> Iterator[Route]:
+    """Every page of the site, in registration order.
+
+    The PAGES (with their LIVE_PAGES/TALKS_PAGES replacements), each followed
+    by the routes of its ROUTE_PROVIDERS entry. Providers run on each call,
+    so the data-driven routes reflect the current data.
+    """
+    for route, target, title in PAGES:
+        if LIVE_EVENTS:
+            target = LIVE_PAGES.get(route, target)
+        if TALKS_BACKEND:
+            target = TALKS_PAGES.get(route, target)
+        yield Route(
+            route, timed_page(route, target), title, target.partition(":")[0], {}
+        )
+        if route in ROUTE_PROVIDERS:
+            provider = ROUTE_PROVIDERS[route]
+            module = provider.partition(":")[0]
+            for sub_route, page, sub_title, *extra in _resolve(provider)():
+                yield Route(
+                    sub_route,
+                    timed_page(sub_route, page),
+                    sub_title,
+                    module,
+                    extra[0] if extra else {},
+                )
+    if TALKS_BACKEND:
+        route = "/talks/enviada"  # talk_proposals.SENT_ROUTE
+        yield Route(
+            route,
+            timed_page(route, "talks_page:talk_sent"),
+            "Propuesta enviada · PythonZgz",
+            "talks_page",
+            {},
+        )
+
+
+def register_pages(app: rx.App) -> None:
+    for entry in routes():
+        app.add_page(entry.page, route=entry.route, title=entry.title, **entry.options)
+        registered[entry.route] = entry
+    if LIVE_EVENTS:
+        app.register_lifespan_task(_resolve("live_events:refresher"))
+
+
+def route_data(route: str) -> object | None:
+    """The data ``route`` renders, per DATA_INPUTS; None for static pages."""
+    for prefix, target in DATA_INPUTS.items():
+        if route == prefix or route.startswith(prefix + "/"):
+            return _resolve(target)(route)
+    return None
+
+
+def _report_timings() -> None:
+    """Write page_timings (slowest first) and, with PYZGZ_PAGE_TIMINGS=1, print them."""
+    if not page_timings:
+        return
+    ranked = sorted(page_timings.items(), key=lambda kv: kv[1], reverse=True)
+    try:
+        os.makedirs(os.path.dirname(TIMINGS_PATH), exist_ok=True)
+        with open(TIMINGS_PATH, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "total_s": round(sum(page_timings.values()), 6),
+                    "pages": {route: round(s, 6) for route, s in ranked},
+                },
+                f,
+                indent=2,
+            )
+    except OSError:
+        pass
+    if os.getenv("PYZGZ_PAGE_TIMINGS") == "1":
+        print(
+            f"[pyzgz] built {len(ranked)} pages in "
+            f"{sum(page_timings.values()) * 1000:.0f} ms; slowest:"
+        )
+        for route, seconds in ranked[:10]:
+            print(f"  {route:<32} {seconds * 1000:8.1f} ms")
+
 
 # ---------- App & routes ----------
-app = rx.App(theme=rx.theme(appearance="dark"))
-app.add_page(index_page, route="/", title="PythonZgz — Comunidad Python Zaragoza")
-app.add_page(events_page, route="/events", title="Eventos · PythonZgz")
-app.add_page(blog_page, route="/blog", title="Blog · PythonZgz")
-# app.add_page(comunity_page, route="/comunity", title="Comunidad · PythonZgz")
-app.add_page(talks_page, route="/talks", title="Proponer charla · PythonZgz")
-app.add_page(about_page, route="/about", title="Sobre · PythonZgz")
-app.add_page(contact_page, route="/contact", title="Contacto · PythonZgz")
+app = rx.App(
+    theme=rx.theme(appearance="dark"),
+    # The backend's own routes (POST /api/talks), only when it takes proposals
+    api_transformer=_resolve("talk_proposals:api_app")() if TALKS_BACKEND else None,
+)
+register_pages(app)
+atexit.register(_report_timings)
@@ -0,0 +1,478 @@
+"""
+Self-hosted talk proposals, for deployments running the Reflex backend
+(PYZGZ_TALKS_BACKEND=1).
+
+POST /api/talks takes the multipart form of talks_page.talks_form:
+- fields title, speaker, email, level and summary (required), duration and
+  message (optional); "website" is a honeypot that only bots fill in;
+- attachment: an optional PDF, written to UPLOAD_DIR chunk by chunk as the
+  body arrives (never held in memory), up to MAX_PDF_BYTES;
+- each client IP gets a token bucket of RATE_BURST submissions refilled one
+  every RATE_REFILL_S; beyond that the request is answered with 429 and
+  Retry-After before its body is read;
+- accepted proposals are inserted through ``queue``: one writer task takes
+  what concurrent submissions queued (up to BATCH_MAX rows) and inserts it
+  in a single transaction, in the WAL-mode SQLite database of
+  rxconfig.db_url (event_store.get_engine).
+
+Browsers posting the form are redirected (303) to /talks/enviada; clients
+sending ``Accept: application/json`` get {"ok": true, "id": n} or
+{"ok": false, "error": "..."}.
+
+Without PYZGZ_TALKS_BACKEND this module is not imported and /talks links to
+the Google Form.
+"""
+
+from __future__ import annotations
+import asyncio
+import html
+import math
+import os
+import re
+import time
+import uuid
+from functools import lru_cache
+from typing import Any
+
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from sqlalchemy.engine import Engine
+from sqlmodel import Field, Session, SQLModel
+from starlette.applications import Starlette
+from starlette.requests import ClientDisconnect, Request
+from starlette.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
+from starlette.routing import Route
+
+from . import event_store
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+SUBMIT_PATH = "/api/talks"
+SENT_ROUTE = "/talks/enviada"
+UPLOAD_DIR = os.getenv("PYZGZ_UPLOAD_DIR") or os.path.join(BASE_DIR, "uploads", "talks")
+MAX_PDF_BYTES = 10 * 1024 * 1024
+MAX_FIELD_BYTES = 20_000
+# Multipart framing and the text fields, on top of the PDF
+MAX_BODY_BYTES = MAX_PDF_BYTES + 256 * 1024
+PDF_MAGIC = b"%PDF-"
+REQUIRED = ("title", "speaker", "email", "level", "summary")
+OPTIONAL = ("duration", "message")
+HONEYPOT = "website"
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# Per-IP token bucket
+RATE_BURST = int(os.getenv("PYZGZ_TALKS_BURST") or 5)
+RATE_REFILL_S = float(os.getenv("PYZGZ_TALKS_REFILL") or 600)
+RATE_MAX_CLIENTS = 10_000
+# Behind a reverse proxy: take the client IP from its X-Forwarded-For
+TRUST_PROXY = os.getenv("PYZGZ_TRUST_PROXY") == "1"
+
+# Write queue
+BATCH_MAX = int(os.getenv("PYZGZ_TALKS_BATCH") or 64)
+BATCH_WAIT_S = 0.002  # extra wait for more rows once a batch has started
+QUEUE_MAX = 1_000
+
+
+class TalkProposal(SQLModel, table=True):
+    __tablename__ = "talk_proposals"
+
+    id: int | None = Field(default=None, primary_key=True)
+    created_at: int = Field(index=True)  # epoch ms, UTC
+    title: str
+    speaker: str
+    email: str
+    level: str
+    duration: int | None = None  # minutes
+    summary: str
+    message: str | None = None
+    attachment: str | None = None  # file name in UPLOAD_DIR
+    attachment_bytes: int | None = None
+
+
+class SubmissionError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@lru_cache(maxsize=None)
+def _engine() -> Engine:
+    engine = event_store.get_engine()
+    SQLModel.metadata.create_all(engine, tables=[TalkProposal.__table__])
+    return engine
+
+
+def _insert_batch(rows: list[dict[str, Any]]) -> list[int]:
+    """Insert ``rows`` in one transaction; their ids, in order."""
+    proposals = [TalkProposal(**row) for row in rows]
+    with Session(_engine(), expire_on_commit=False) as session:
+        session.add_all(proposals)
+        session.commit()
+    return [p.id for p in proposals]  # type: ignore[misc]
+
+
+class WriteQueue:
+    """Batches concurrent inserts into one transaction per round."""
+
+    def __init__(
+        self,
+        batch_max: int = BATCH_MAX,
+        batch_wait_s: float = BATCH_WAIT_S,
+        maxsize: int = QUEUE_MAX,
+    ) -> None:
+        self.batch_max = batch_max
+        self.batch_wait_s = batch_wait_s
+        self.maxsize = maxsize
+        self.batches = 0
+        self.rows = 0
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+
+    async def insert(self, row: dict[str, Any]) -> int:
+        """Queue ``row`` and wait for its id; asyncio.QueueFull when saturated."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.maxsize)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((row, future))
+        return await future
+
+    async def _batch(self, queue: asyncio.Queue) -> list[tuple[dict, asyncio.Future]]:
+        """The next batch: what is queued now, plus what arrives within batch_wait_s."""
+        batch = [await queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_wait_s
+        while len(batch) < self.batch_max:
+            try:
+                batch.append(queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        while True:
+            batch = await self._batch(self._queue)
+            try:
+                ids = await asyncio.to_thread(_insert_batch, [row for row, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.rows += len(batch)
+            for (_, future), row_id in zip(batch, ids):
+                if not future.done():
+                    future.set_result(row_id)
+
+
+class RateLimiter:
+    """Token bucket per client: ``burst`` requests, one more every ``refill_s``."""
+
+    def __init__(
+        self,
+        burst: int = RATE_BURST,
+        refill_s: float = RATE_REFILL_S,
+        max_clients: int = RATE_MAX_CLIENTS,
+    ) -> None:
+        self.burst = burst
+        self.refill_s = refill_s
+        self.max_clients = max_clients
+        self._buckets: dict[str, tuple[float, float]] = {}  # client -> (tokens, at)
+
+    def _tokens(self, client: str, now: float) -> float:
+        tokens, at = self._buckets.get(client, (self.burst, now))
+        return min(self.burst, tokens + (now - at) / self.refill_s)
+
+    def take(self, client: str, now: float | None = None) -> float:
+        """0 if ``client`` may go ahead (a token is spent), else seconds to wait."""
+        now = time.monotonic() if now is None else now
+        tokens = self._tokens(client, now)
+        if tokens < 1:
+            return (1 - tokens) * self.refill_s
+        if client not in self._buckets and len(self._buckets) >= self.max_clients:
+            self._prune(now)
+        self._buckets[client] = (tokens - 1, now)
+        return 0.0
+
+    def _prune(self, now: float) -> None:
+        """Forget clients whose bucket refilled; then the least recent half."""
+        self._buckets = {
+            c: b for c, b in self._buckets.items() if self._tokens(c, now) < self.burst
+        }
+        if len(self._buckets) >= self.max_clients:
+            recent = sorted(self._buckets.items(), key=lambda kv: kv[1][1])
+            self._buckets = dict(recent[len(recent) // 2 :])
+
+
+queue = WriteQueue()
+limiter = RateLimiter()
+
+
+def client_ip(request: Request) -> str:
+    if TRUST_PROXY:
+        forwarded = request.headers.get("x-forwarded-for", "")
+        if forwarded:
+            # The last hop is the one our proxy added
+            return forwarded.rsplit(",", 1)[-1].strip()
+    return request.client.host if request.client else "unknown"
+
+
+class _Form:
+    """Streaming multipart reader: text fields in memory, the PDF straight to disk."""
+
+    def __init__(self, upload_dir: str) -> None:
+        self.upload_dir = upload_dir
+        self.fields: dict[str, bytearray] = {}
+        self.path: str | None = None  # the .part file being written
+        self.size = 0
+        self._file: Any = None
+        self._head = b""
+        self._name: str | None = None
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: dict[bytes, bytes] = {}
+        self._target: bytearray | None = None
+
+    # ---- parser callbacks ----
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+        self._name = None
+        self._target = None
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition"))
+        name = options.get(b"name", b"").decode("utf-8", "replace")
+        if name == "attachment":
+            if options.get(b"filename"):
+                if self.path is not None:
+                    raise SubmissionError(400, "Solo se admite un PDF")
+                os.makedirs(self.upload_dir, exist_ok=True)
+                self.path = os.path.join(
+                    self.upload_dir, f"{uuid.uuid4().hex}.pdf.part"
+                )
+                self._file = open(self.path, "xb")
+            self._name = name
+        elif name in REQUIRED or name in OPTIONAL or name == HONEYPOT:
+            if name in self.fields:
+                raise SubmissionError(400, f"Campo repetido: {name}")
+            self._name = name
+            self._target = self.fields[name] = bytearray()
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        chunk = data[start:end]
+        if self._target is not None:
+            if len(self._target) + len(chunk) > MAX_FIELD_BYTES:
+                raise SubmissionError(413, f"El campo {self._name} es demasiado largo")
+            self._target += chunk
+        elif self._name == "attachment" and self._file is not None:
+            self.size += len(chunk)
+            if self.size > MAX_PDF_BYTES:
+                raise SubmissionError(
+                    413, f"El PDF supera {MAX_PDF_BYTES // (1024 * 1024)} MB"
+                )
+            if len(self._head) < len(PDF_MAGIC):
+                self._head += chunk[: len(PDF_MAGIC) - len(self._head)]
+                if not PDF_MAGIC.startswith(self._head):
+                    raise SubmissionError(415, "El adjunto debe ser un PDF")
+            self._file.write(chunk)
+
+    def _on_part_end(self) -> None:
+        if self._name == "attachment" and self._file is not None:
+            self._file.close()
+            self._file = None
+            if self.size and self._head != PDF_MAGIC:
+                raise SubmissionError(415, "El adjunto debe ser un PDF")
+
+    # ----
+
+    async def read(self, request: Request) -> None:
+        """Parse the body as it arrives; SubmissionError on bad or oversized input."""
+        ctype, options = parse_options_header(request.headers.get("content-type"))
+        boundary = options.get(b"boundary")
+        if ctype != b"multipart/form-data" or not boundary:
+            raise SubmissionError(415, "Se espera multipart/form-data")
+        parser = MultipartParser(
+            boundary,
+            {
+                "on_part_begin": self._on_part_begin,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+            },
+        )
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > MAX_BODY_BYTES:
+                raise SubmissionError(413, "La propuesta es demasiado grande")
+            parser.write(chunk)
+        parser.finalize()
+
+    def text(self, name: str) -> str:
+        try:
+            return bytes(self.fields.get(name, b"")).decode("utf-8").strip()
+        except UnicodeDecodeError:
+            raise SubmissionError(400, f"El campo {name} no es texto UTF-8") from None
+
+    def keep(self) -> str | None:
+        """Move the uploaded PDF into place; its file name, or None if there is none."""
+        if self.path is None or not self.size:
+            self.discard()
+            return None
+        final = self.path.removesuffix(".part")
+        os.replace(self.path, final)
+        self.path = None
+        return os.path.basename(final)
+
+    def discard(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+
+def _proposal(form: _Form) -> dict[str, Any]:
+    """The row to insert, from the validated fields."""
+    values = {name: form.text(name) for name in REQUIRED + OPTIONAL}
+    missing = [name for name in REQUIRED if not values[name]]
+    if missing:
+        raise SubmissionError(400, f"Faltan campos: {', '.join(missing)}")
+    if not EMAIL_RE.match(values["email"]):
+        raise SubmissionError(400, "El email no es válido")
+    duration = None
+    if values["duration"]:
+        if not values["duration"].isdigit() or not 1 <= int(values["duration"]) <= 240:
+            raise SubmissionError(400, "La duración debe estar entre 1 y 240 minutos")
+        duration = int(values["duration"])
+    return {
+        "created_at": int(time.time() * 1000),
+        "title": values["title"],
+        "speaker": values["speaker"],
+        "email": values["email"],
+        "level": values["level"],
+        "duration": duration,
+        "summary": values["summary"],
+        "message": values["message"] or None,
+    }
+
+
+def _wants_json(request: Request) -> bool:
+    return "application/json" in request.headers.get("accept", "")
+
+
+def _site_url() -> str:
+    from reflex.config import get_config
+
+    return (get_config().deploy_url or "").rstrip("/")
+
+
+def _error(
+    request: Request, status: int, message: str, headers: dict | None = None
+) -> Response:
+    if _wants_json(request):
+        return JSONResponse(
+            {"ok": False, "error": message}, status_code=status, headers=headers
+        )
+    body = (
+        f"<!doctype html><meta charset=utf-8><title>PythonZgz</title>"
+        f"<p>{html.escape(message)}</p>"
+        f'<p><a href="{html.escape(_site_url())}/talks">Volver al formulario</a></p>'
+    )
+    return HTMLResponse(body, status_code=status, headers=headers)
+
+
+def _accepted(request: Request, proposal_id: int) -> Response:
+    if _wants_json(request):
+        return JSONResponse({"ok": True, "id": proposal_id}, status_code=201)
+    return RedirectResponse(f"{_site_url()}{SENT_ROUTE}", status_code=303)
+
+
+async def submit(request: Request) -> Response:
+    wait = limiter.take(client_ip(request))
+    if wait:
+        return _error(
+            request,
+            429,
+            "Demasiadas propuestas seguidas; inténtalo más tarde",
+            {"Retry-After": str(math.ceil(wait))},
+        )
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > MAX_BODY_BYTES:
+        return _error(request, 413, "La propuesta es demasiado grande")
+
+    form = _Form(UPLOAD_DIR)
+    try:
+        await form.read(request)
+        row = _proposal(form)
+        spam = bool(form.text(HONEYPOT))
+    except SubmissionError as e:
+        form.discard()
+        return _error(request, e.status, e.message)
+    except MultipartParseError:
+        form.discard()
+        return _error(request, 400, "El formulario no es válido")
+    except ClientDisconnect:
+        form.discard()
+        return Response(status_code=400)
+    except Exception:
+        form.discard()
+        raise
+    if spam:
+        form.discard()
+        return _accepted(request, 0)
+
+    row["attachment"] = form.keep()
+    row["attachment_bytes"] = form.size if row["attachment"] else None
+    try:
+        proposal_id = await queue.insert(row)
+    except asyncio.QueueFull:
+        _remove_upload(row["attachment"])
+        return _error(
+            request, 503, "Servidor ocupado; inténtalo de nuevo", {"Retry-After": "1"}
+        )
+    except Exception:
+        _remove_upload(row["attachment"])
+        raise
+    return _accepted(request, proposal_id)
+
+
+def _remove_upload(name: str | None) -> None:
+    if name:
+        try:
+            os.remove(os.path.join(UPLOAD_DIR, name))
+        except OSError:
+            pass
+
+
+def api_app() -> Starlette:
+    """The routes of this module; main.py passes it to rx.App(api_transformer=...)."""
+    return Starlette(routes=[Route(SUBMIT_PATH, submit, methods=["POST"])])
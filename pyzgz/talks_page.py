@@ -27,38 +27,68 @@ def talks():
     )
 
 
-# Alternative version using Formspree (supports PDF upload)
-# FORMSPREE_TALKS_ENDPOINT = "https://formspree.io/f/xzznqalo"
+# Self-hosted form, posted to the Reflex backend (see talk_proposals.py);
+# used instead of talks() with PYZGZ_TALKS_BACKEND=1
+FORM_HTML = """
+<form action="{action}" method="POST" enctype="multipart/form-data">
+  <div style="display:flex; flex-direction:column; gap:12px; max-width:42rem; width:100%">
+    <input type="text" name="title" placeholder="Título de la charla" maxlength="200" required />
+    <input type="text" name="speaker" placeholder="Ponente (tu nombre)" maxlength="200" required />
+    <input type="email" name="email" placeholder="Email de contacto" maxlength="200" required />
+    <select name="level" required>
+      <option value="">Nivel</option>
+      <option value="intro">Introductorio</option>
+      <option value="intermedio">Intermedio</option>
+      <option value="avanzado">Avanzado</option>
+    </select>
+    <input type="number" name="duration" placeholder="Duración (minutos)" min="1" max="240" />
+    <textarea name="summary" rows="4" placeholder="Resumen" maxlength="5000" required></textarea>
+    <textarea name="message" rows="4" placeholder="Mensaje (opcional)" maxlength="5000"></textarea>
+    <label>Adjunta PDF (opcional, hasta {max_mb} MB): <input type="file" name="attachment" accept="application/pdf" /></label>
+    <input type="text" name="website" tabindex="-1" autocomplete="off" aria-hidden="true" style="position:absolute; left:-10000px" />
+    <button type="submit">Enviar</button>
+  </div>
+</form>
+"""
 
 
-# def talks_formspree():
-#     """Talk proposal via Formspree (supports PDF upload)."""
-#     form_html = f'''
-#     <form action="{FORMSPREE_TALKS_ENDPOINT}" method="POST" enctype="multipart/form-data">
-#       <div style="display:flex; flex-direction:column; gap:12px; max-width:42rem; width:100%">
-#         <input type="text" name="title" placeholder="Título de la charla" required />
-#         <input type="text" name="speaker" placeholder="Ponente (tu nombre)" required />
-#         <input type="email" name="email" placeholder="Email de contacto" required />
-#         <input type="text" name="level" placeholder="Nivel (intro, intermedio, avanzado)" required />
-#         <input type="number" name="duration" placeholder="Duración (minutos)" min="1" />
-#         <input type="text" name="summary" placeholder="Resumen" required />
-#         <textarea name="mensaje" rows="6" placeholder="Mensaje"></textarea>
-#         <label>Adjunta PDF (opcional): <input type="file" name="attachment" accept="application/pdf" /></label>
-#         <button type="submit">Enviar</button>
-#       </div>
-#     </form>
-#     <p style="margin-top: 8px; font-size: 0.9rem; color: #555;">Si lo prefieres, envíanos un email a <a href="mailto:{EMAIL}">{EMAIL}</a>.</p>
-#     '''
+def talks_form():
+    """Talk proposal form posted to this site's backend (with PDF upload)."""
+    from html import escape
 
-#     return page_wrapper(
-#         rx.section(
-#             rx.vstack(
-#                 rx.heading("Propón una charla"),
-#                 rx.text("Rellena el formulario o envíanos un email. Las propuestas se envían a través de Formspree."),
-#                 rx.html(form_html),
-#                 spacing="4",
-#                 align="center",
-#             ),
-#             style=styles["section"],
-#         )
-#     )
+    from reflex.config import get_config
+
+    from .talk_proposals import MAX_PDF_BYTES, SUBMIT_PATH
+
+    action = escape(get_config().api_url.rstrip("/") + SUBMIT_PATH)
+    form_html = FORM_HTML.format(action=action, max_mb=MAX_PDF_BYTES // (1024 * 1024))
+    return page_wrapper(
+        rx.section(
+            rx.vstack(
+                rx.heading("Propón una charla"),
+                rx.text("Rellena el formulario; el PDF con tu propuesta es opcional."),
+                rx.html(form_html),
+                rx.text("Como alternativa, puedes escribirnos a:"),
+                rx.link(EMAIL, href=f"mailto:{EMAIL}", is_external=True),
+                spacing="4",
+                align="center",
+            ),
+            style=styles["section"],
+        )
+    )
+
+
+def talk_sent():
+    """Where the form lands after a proposal is stored."""
+    return page_wrapper(
+        rx.section(
+            rx.vstack(
+                rx.heading("¡Gracias por tu propuesta!"),
+                rx.text("La hemos recibido; te escribiremos por email."),
+                rx.link("← Volver a charlas", href="/talks"),
+                spacing="4",
+                align="center",
+            ),
+            style=styles["section"],
+        )
+    )
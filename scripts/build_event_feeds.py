@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Write the event detail pages (assets/event/<key>.html), the events calendar
+(assets/events.ics) and JSON Feed (assets/feed.json).
+
+One streaming pass over the event records (the event store, the shards or
+assets/events.json, newest first; see events_page.records) writes the three
+entry by entry, without holding the event list in memory. Each entry is
+keyed like the detail pages (see pyzgz/event_details.py) and fingerprinted
+by its source record; the rendered VEVENT, feed item and detail page of
+unchanged records are reused (from .cache/event_feeds.json and the existing
+page), so only new and changed events are rendered. Pages of events no
+longer listed are removed.
+
+Every feed item carries date_modified, the last time its record changed;
+scripts/prerender.py uses it as the sitemap lastmod of the detail page.
+Unchanged events keep their date, so the output is byte-identical when no
+event changed: calendar apps polling events.ics get a cheap 304.
+
+The feeds (and the pages' canonical links) use absolute URLs when --base-url (or
+PYZGZ_SITE_URL) is given, root-relative ones otherwise.
+
+Usage:
+    uv run python scripts/build_event_feeds.py [--base-url URL] [--full]
+
+Exit codes: 0 on success, 1 if the files cannot be written.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ICS_PATH = os.path.join(ROOT_DIR, "assets", "events.ics")
+FEED_PATH = os.path.join(ROOT_DIR, "assets", "feed.json")
+MANIFEST_PATH = os.path.join(ROOT_DIR, ".cache", "event_feeds.json")
+# Bump when the rendering below (or event_details.page) changes, to re-render
+# every entry
+MANIFEST_VERSION = 2
+
+SITE_NAME = "PythonZgz"
+# Meetup events have no end time in our data; calendars get this duration
+EVENT_DURATION = timedelta(hours=2)
+# How often calendar apps are asked to poll events.ics
+REFRESH_INTERVAL = "PT6H"
+ICS_LINE_OCTETS = 75
+
+sys.path.insert(0, ROOT_DIR)
+from pyzgz import event_details, events_page  # noqa: E402
+from pyzgz.atomic_files import atomic_open, write_atomic  # noqa: E402
+
+PAGES_DIR = os.path.join(ROOT_DIR, "assets", event_details.DETAIL_DIR)
+
+Entry = Dict[str, Any]
+
+
+def _iso(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+def record_sha(record: Any) -> str:
+    data = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+# ---------- iCalendar (RFC 5545) ----------
+
+
+def ics_escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\n")
+        .replace("\n", "\\n")
+    )
+
+
+def ics_fold(line: str) -> str:
+    """``line`` folded to ICS_LINE_OCTETS octets per line, CRLF-terminated."""
+    out, current, size = [], "", 0
+    for ch in line:
+        n = len(ch.encode("utf-8"))
+        if size + n > ICS_LINE_OCTETS:
+            out.append(current)
+            current, size = " ", 1  # continuation lines start with a space
+        current += ch
+        size += n
+    out.append(current)
+    return "\r\n".join(out) + "\r\n"
+
+
+def _ics_time(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def ics_header() -> str:
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:-//{SITE_NAME}//Eventos//ES",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{SITE_NAME}",
+        f"X-WR-TIMEZONE:{events_page.SITE_TZ.key}",
+        f"REFRESH-INTERVAL;VALUE=DURATION:{REFRESH_INTERVAL}",
+        f"X-PUBLISHED-TTL:{REFRESH_INTERVAL}",
+    ]
+    return "".join(ics_fold(line) for line in lines)
+
+
+def ics_event(ev: events_page.Event, url: str, lastmod: str) -> str:
+    assert ev.when is not None
+    modified = _ics_time(datetime.fromisoformat(lastmod))
+    description = event_details.plain_text(ev.description)
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{ev.key}@{SITE_NAME.lower()}",
+        f"DTSTAMP:{modified}",
+        f"LAST-MODIFIED:{modified}",
+        f"DTSTART:{_ics_time(ev.when)}",
+        f"DTEND:{_ics_time(ev.when + EVENT_DURATION)}",
+        f"SUMMARY:{ics_escape(ev.title)}",
+        f"URL:{url}",
+    ]
+    if ev.venue:
+        lines.append(f"LOCATION:{ics_escape(ev.venue)}")
+    lines.append(
+        "DESCRIPTION:" + ics_escape("\n\n".join(filter(None, [description, ev.url])))
+    )
+    lines.append("END:VEVENT")
+    return "".join(ics_fold(line) for line in lines)
+
+
+# ---------- JSON Feed 1.1 ----------
+
+
+def feed_header(base_url: str) -> str:
+    head = json.dumps(
+        {
+            "version": "https://jsonfeed.org/version/1.1",
+            "title": f"Eventos · {SITE_NAME}",
+            "home_page_url": f"{base_url}/events",
+            "feed_url": f"{base_url}/feed.json",
+            "language": "es",
+        },
+        ensure_ascii=False,
+    )
+    return head[:-1] + ', "items": [\n'
+
+
+def feed_item(ev: events_page.Event, url: str, entry: Entry) -> str:
+    assert ev.when is not None
+    item: Dict[str, Any] = {
+        "id": ev.key,
+        "url": url,
+        "external_url": ev.url,
+        "title": ev.title,
+        "content_text": event_details.plain_text(ev.description) or ev.title,
+        "date_published": entry["first_seen"],
+        "date_modified": entry["lastmod"],
+        "_event": {
+            "start": _iso(ev.when),
+            "end": _iso(ev.when + EVENT_DURATION),
+            "venue": ev.venue,
+            "group": ev.group,
+        },
+    }
+    if ev.group:
+        item["tags"] = [ev.group]
+    return json.dumps(item, ensure_ascii=False)
+
+
+# ---------- Detail pages ----------
+
+
+def page_path(key: str) -> str:
+    return os.path.join(PAGES_DIR, f"{key}.html")
+
+
+def detail_page(ev: events_page.Event, url: str) -> str:
+    return event_details.page(
+        ev.title,
+        ev.when_display,
+        ev.venue,
+        ev.group,
+        ev.url,
+        event_details.plain_text(ev.description),
+        canonical=url if url.startswith(("https://", "http://")) else "",
+    )
+
+
+# ---------- Streaming pass ----------
+
+
+def _load_manifest(base_url: str) -> Dict[str, Entry]:
+    """Cached entries; their rendered text only if it was rendered for ``base_url``."""
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    entries = manifest.get("entries") if isinstance(manifest, dict) else None
+    if not isinstance(entries, dict):
+        return {}
+    if manifest.get("v") != MANIFEST_VERSION or manifest.get("base_url") != base_url:
+        # Keep the change history; the entries are rendered again
+        for entry in entries.values():
+            entry.pop("ics", None)
+            entry.pop("item", None)
+    return entries
+
+
+def entries(
+    records: Iterator[Any], cached: Dict[str, Entry], base_url: str, now: str
+) -> Iterator[Tuple[Entry, bool]]:
+    """(entry, rendered?) per dated event with a key; rendered only if it
+    changed or its detail page is missing. Rendered entries hold their page
+    under "page"."""
+    seen = set()
+    for record in records:
+        ev = events_page.Event.from_record(record)
+        if not ev.key or ev.when is None or ev.key in seen:
+            continue
+        seen.add(ev.key)
+        sha = record_sha(record)
+        old = cached.get(ev.key) or {}
+        reusable = "ics" in old and "item" in old
+        if old.get("sha") == sha and reusable and os.path.isfile(page_path(ev.key)):
+            yield old, False
+            continue
+        entry = {
+            "key": ev.key,
+            "sha": sha,
+            "first_seen": old.get("first_seen", now),
+            "lastmod": old["lastmod"] if old.get("sha") == sha else now,
+        }
+        url = f"{base_url}{ev.detail_route}"
+        entry["ics"] = ics_event(ev, url, entry["lastmod"])
+        entry["item"] = feed_item(ev, url, entry)
+        entry["page"] = detail_page(ev, url)
+        yield entry, True
+
+
+def build(base_url: str, full: bool = False) -> Dict[str, int]:
+    """Write the detail pages, both feeds and the manifest in one pass;
+    returns the counts."""
+    cached = {} if full else _load_manifest(base_url)
+    now = _iso(datetime.now(timezone.utc))
+    stats = {"events": 0, "rendered": 0, "reused": 0, "removed": 0}
+    kept: Dict[str, Entry] = {}
+    text = {"encoding": "utf-8", "newline": ""}
+    with atomic_open(ICS_PATH, **text) as ics, atomic_open(FEED_PATH, **text) as feed:
+        ics.write(ics_header())
+        feed.write(feed_header(base_url))
+        for entry, rendered in entries(events_page.records(), cached, base_url, now):
+            if stats["events"]:
+                feed.write(",\n")
+            if rendered:
+                write_atomic(page_path(entry["key"]), entry.pop("page").encode())
+            ics.write(entry["ics"])
+            feed.write(entry["item"])
+            kept[entry["key"]] = entry
+            stats["events"] += 1
+            stats["rendered" if rendered else "reused"] += 1
+        ics.write(ics_fold("END:VCALENDAR"))
+        feed.write("\n]}\n")
+    stats["removed"] = len(set(cached) - set(kept))
+    if os.path.isdir(PAGES_DIR):
+        # Pages of events no longer listed
+        for name in os.listdir(PAGES_DIR):
+            key, ext = os.path.splitext(name)
+            if ext == ".html" and key not in kept:
+                os.remove(os.path.join(PAGES_DIR, name))
+    with atomic_open(MANIFEST_PATH, encoding="utf-8") as f:
+        json.dump(
+            {"v": MANIFEST_VERSION, "base_url": base_url, "entries": kept},
+            f,
+            ensure_ascii=False,
+        )
+    return stats
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build events.ics and feed.json.")
+    parser.add_argument("--base-url", default=os.getenv("PYZGZ_SITE_URL") or "")
+    parser.add_argument("--full", action="store_true", help="render every entry again")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    try:
+        stats = build(args.base_url.rstrip("/"), args.full)
+    except OSError as e:
+        print(f"[feeds] Error: {e}")
+        return 1
+    print(
+        f"[feeds] {stats['events']} events: {stats['rendered']} rendered, "
+        f"{stats['reused']} reused, {stats['removed']} removed "
+        f"in {time.perf_counter() - t0:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Build the client-side search index (assets/search-index.json).
+
+Documents, in ranking order for equal scores:
+- the site's pages from pyzgz/main.py PAGES (their titles);
+- blog posts from blog/, newest first (title, tags, summary and body);
+- events from assets/events.json, newest first (name, venue, group and
+  description, HTML removed).
+
+Text is normalized as in assets/search.js, which queries the index in the
+browser: lowercased, accents folded (á -> a, ñ -> n, ü -> u) and split on
+anything that is not a letter or digit. Spanish stopwords and one-letter
+tokens are left out; plurals and other inflections are found by prefix
+search ("charla" also finds "charlas").
+
+Index layout (compact JSON):
+    {"v": 1, "stop": [stopwords],
+     "docs": [[title, url, subtitle, kind], ...],
+     "terms": [sorted terms],
+     "postings": [[delta-encoded doc*2 + in_title, ...], ...]}
+
+The index must fit in --budget KB (default 200). When it does not, fewer
+distinct body terms are kept per document (first occurrences first), down
+to titles only; if it still does not fit the build fails without writing.
+
+Usage:
+    uv run python scripts/build_search_index.py [--budget 200]
+    uv run python scripts/build_search_index.py --query "charla django"
+
+Exit codes: 0 on success, 1 if the index does not fit the budget.
+"""
+
+from __future__ import annotations
+import os
+import re
+import sys
+import gzip
+import json
+import time
+import argparse
+import unicodedata
+from bisect import bisect_left
+from html import unescape
+from typing import Any, Dict, List, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_PATH = os.path.join(ROOT_DIR, "assets", "search-index.json")
+INDEX_VERSION = 1
+DEFAULT_BUDGET_KB = 200
+# Distinct body terms kept per document, tried in order to fit the budget
+BODY_TERM_LIMITS: List[int | None] = [None, 400, 200, 100, 50, 25, 0]
+# Search behaviour shared with assets/search.js
+MAX_EXPANSIONS = 64  # index terms a query prefix may expand to
+MAX_RESULTS = 8
+
+_STOPWORDS_TEXT = """
+    a al algo ante antes como con contra cual cuando de del desde donde durante
+    e el ella ellas ellos en entre era es esa ese eso esta este esto estos estas
+    ha hay la las le les lo los mas me mi muy no nos o os para pero por que
+    se si sin sobre su sus te tu un una unas uno unos y ya
+    and by for in is of on or the to with
+"""
+STOPWORDS = frozenset(_STOPWORDS_TEXT.split())
+
+TOKEN_SPLIT_RE = re.compile(r"[^a-z0-9]+")
+TAG_RE = re.compile(r"<[^>]+>")
+MARKDOWN_LINK_RE = re.compile(r"\]\([^)]*\)")
+
+# A document: (title, url, subtitle, kind, body text)
+Doc = Tuple[str, str, str, str, str]
+
+sys.path.insert(0, ROOT_DIR)
+from pyzgz.atomic_files import write_atomic  # noqa: E402
+
+
+def fold(text: str) -> str:
+    """Lowercase and remove accents; must match fold() in assets/search.js."""
+    decomposed = unicodedata.normalize("NFD", text)
+    return "".join(c for c in decomposed if unicodedata.category(c) != "Mn").lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Index terms of ``text`` in order, without stopwords and one-letter tokens."""
+    return [
+        t for t in TOKEN_SPLIT_RE.split(fold(text)) if len(t) > 1 and t not in STOPWORDS
+    ]
+
+
+def _event_docs() -> List[Doc]:
+    from pyzgz import events_page
+
+    records = events_page._read_events_json() or []
+    dated = []
+    for ev in records:
+        event = events_page.Event.from_record(ev)
+        description = unescape(TAG_RE.sub(" ", ev.get("description") or ""))
+        dated.append(
+            (
+                event.when.timestamp() if event.when else 0.0,
+                (
+                    event.title,
+                    event.detail_route or event.url,
+                    event.when_display,
+                    "evento",
+                    " ".join(filter(None, [event.venue, event.group, description])),
+                ),
+            )
+        )
+    return [doc for _, doc in sorted(dated, key=lambda d: d[0], reverse=True)]
+
+
+def _post_docs() -> List[Doc]:
+    from pyzgz import blog_page
+
+    return [
+        (
+            post.title,
+            f"/blog/{post.slug}",
+            post.date_display,
+            "blog",
+            " ".join([*post.tags, post.summary, MARKDOWN_LINK_RE.sub("]", post.body)]),
+        )
+        for post in blog_page._load_posts()
+    ]
+
+
+def _page_docs() -> List[Doc]:
+    from pyzgz import main
+
+    return [
+        (title.split(" · ")[0].split(" — ")[0], route, "", "página", title)
+        for route, _, title in main.PAGES
+    ]
+
+
+def collect_docs() -> List[Doc]:
+    # Pages first (few, always relevant), then posts and events
+    return _page_docs() + _post_docs() + _event_docs()
+
+
+def doc_terms(docs: List[Doc]) -> List[Tuple[List[str], List[str]]]:
+    """(title terms, other body terms) of each doc, distinct and in text order."""
+    out = []
+    for title, _url, _sub, _kind, body in docs:
+        title_terms = list(dict.fromkeys(tokenize(title)))
+        seen = set(title_terms)
+        out.append(
+            (title_terms, [t for t in dict.fromkeys(tokenize(body)) if t not in seen])
+        )
+    return out
+
+
+def build_index(
+    docs: List[Doc],
+    body_terms: int | None = None,
+    terms: List[Tuple[List[str], List[str]]] | None = None,
+) -> Dict[str, Any]:
+    """The index of ``docs``, keeping at most ``body_terms`` body terms per doc.
+
+    ``terms`` is doc_terms(docs), when already computed.
+    """
+    postings: Dict[str, List[int]] = {}
+    for doc_id, (title_terms, body_only) in enumerate(terms or doc_terms(docs)):
+        for term in title_terms:
+            postings.setdefault(term, []).append(doc_id * 2 + 1)
+        for term in body_only[:body_terms]:
+            postings.setdefault(term, []).append(doc_id * 2)
+    sorted_terms = sorted(postings)
+    encoded = []
+    for term in sorted_terms:
+        ids = postings[term]  # increasing, as docs are visited in order
+        encoded.append([ids[0]] + [b - a for a, b in zip(ids, ids[1:])])
+    return {
+        "v": INDEX_VERSION,
+        "stop": sorted(STOPWORDS),
+        "docs": [[title, url, sub, kind] for title, url, sub, kind, _ in docs],
+        "terms": sorted_terms,
+        "postings": encoded,
+    }
+
+
+def dump(index: Dict[str, Any]) -> bytes:
+    return json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def fit_budget(docs: List[Doc], budget: int) -> Tuple[Dict[str, Any], bytes, Any]:
+    """The most complete index within ``budget`` bytes; (index, data, limit)."""
+    terms = doc_terms(docs)
+    for limit in BODY_TERM_LIMITS:
+        index = build_index(docs, limit, terms)
+        data = dump(index)
+        if len(data) <= budget:
+            return index, data, limit
+    raise ValueError(
+        f"the index needs {len(data) / 1024:.0f} KB even with titles only "
+        f"(budget {budget / 1024:.0f} KB)"
+    )
+
+
+def _decode(postings: List[int]) -> List[int]:
+    out, total = [], 0
+    for delta in postings:
+        total += delta
+        out.append(total)
+    return out
+
+
+def search(index: Dict[str, Any], query: str) -> List[List[str]]:
+    """Same ranking as assets/search.js, for checks from the command line.
+
+    Every query term must match (as an exact term or a prefix); exact and
+    title matches score higher, ties go to the newer document.
+    """
+    stop = set(index["stop"])
+    tokens = [t for t in TOKEN_SPLIT_RE.split(fold(query)) if t and t not in stop]
+    terms = index["terms"]
+    scores: Dict[int, int] | None = None
+    for token in tokens:
+        found: Dict[int, int] = {}
+        i = bisect_left(terms, token)
+        end = min(len(terms), i + MAX_EXPANSIONS)
+        while i < end and terms[i].startswith(token):
+            exact = terms[i] == token
+            for value in _decode(index["postings"][i]):
+                doc, in_title = divmod(value, 2)
+                score = (2 if exact else 1) * (2 if in_title else 1)
+                found[doc] = max(found.get(doc, 0), score)
+            i += 1
+        if scores is None:
+            scores = found
+        else:
+            scores = {d: s + found[d] for d, s in scores.items() if d in found}
+    ranked = sorted((scores or {}).items(), key=lambda kv: (-kv[1], kv[0]))
+    return [index["docs"][doc] for doc, _ in ranked[:MAX_RESULTS]]
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build the search index.")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET_KB, help="KB")
+    parser.add_argument("--out", default=OUTPUT_PATH)
+    parser.add_argument("--query", help="search the built index and exit")
+    args = parser.parse_args(argv)
+
+    if args.query is not None:
+        with open(args.out, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        t0 = time.perf_counter()
+        results = search(index, args.query)
+        dt = time.perf_counter() - t0
+        for title, url, sub, kind in results:
+            print(f"{kind:<7} {title} ({sub or url}) -> {url}")
+        print(f"[search] {len(results)} results in {dt * 1000:.2f} ms")
+        return 0
+
+    t0 = time.perf_counter()
+    docs = collect_docs()
+    try:
+        index, data, limit = fit_budget(docs, args.budget * 1024)
+    except ValueError as e:
+        print(f"[search] {e}")
+        return 1
+    write_atomic(args.out, data)
+    trimmed = "" if limit is None else f", body terms capped at {limit}/doc"
+    print(
+        f"[search] {len(docs)} docs, {len(index['terms'])} terms: "
+        f"{len(data) / 1024:.1f} KB ({len(gzip.compress(data)) / 1024:.1f} KB gzip, "
+        f"budget {args.budget} KB{trimmed}) in {time.perf_counter() - t0:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Static export, skipped when no route's inputs changed.
+
+This is not a per-route rebuild. Reflex bundles all routes into one client
+build (one route manifest for client-side navigation), so a changed route
+cannot be rebuilt on its own: the site is either exported whole or the
+last export is reused as is.
+
+Every route registered in pyzgz/main.py gets a fingerprint of its inputs:
+- the source of its page module and of every pyzgz module it imports
+  (layout.py, event_store.py, ...), followed transitively;
+- the data it renders (pyzgz.main.route_data: for the events pages, the
+  events on that page plus the archive/group navigation).
+On top of that, global inputs affect every route: rxconfig.py, the app
+entry modules, pyproject.toml/uv.lock, the export command and every asset
+except the event data and the files generated from it (DATA_ASSETS:
+events.json, calendar-index.json, data/, events.ics, feed.json,
+search-index.json). No page embeds those files; the browser fetches them.
+
+The fingerprints are kept in .cache/export/manifest.json together with the
+last exported zip. When neither the global inputs nor any route changed, the
+cached zip is reused and `reflex export` is skipped; its DATA_ASSETS are
+replaced with the current files, which reflex would only have copied
+verbatim. Otherwise the whole site is exported again, and the changed
+routes are listed so the cause is visible.
+
+Each run records its time and mode in the manifest and prints it next to
+the last full ("cold") build, so the saving is measurable.
+
+Usage:
+    uv run python scripts/export_if_changed.py [--force] [--dry-run]
+        [--command "uvx reflex export --frontend-only"] [--zip frontend.zip]
+
+Exit codes: 0 on success (built or reused), 1 if the export failed.
+"""
+
+from __future__ import annotations
+import os
+import ast
+import sys
+import json
+import time
+import shlex
+import shutil
+import hashlib
+import argparse
+import subprocess
+import zipfile
+from datetime import datetime, timezone
+from importlib import metadata
+from typing import Any, Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(ROOT_DIR, "pyzgz")
+ASSETS_DIR = os.path.join(ROOT_DIR, "assets")
+CACHE_DIR = os.path.join(ROOT_DIR, ".cache", "export")
+MANIFEST_PATH = os.path.join(CACHE_DIR, "manifest.json")
+CACHED_ZIP = os.path.join(CACHE_DIR, "frontend.zip")
+DEFAULT_COMMAND = "uvx reflex export --frontend-only"
+# Written by reflex export --frontend-only in the working directory
+EXPORT_ZIP = "frontend.zip"
+
+# Inputs of every route
+GLOBAL_FILES = ["rxconfig.py", "pyproject.toml", "uv.lock"]
+APP_MODULES = ["__init__", "pyzgz", "main"]
+# Event data and the files built from it: not global inputs. The pages that
+# render events track them per route (route_data); a reused export gets the
+# current files (refresh_data_assets)
+DATA_ASSETS = {
+    "events.json",
+    "calendar-index.json",
+    "data",
+    "event",
+    "events.ics",
+    "feed.json",
+    "search-index.json",
+}
+KEEP_BUILDS = 20
+
+sys.path.insert(0, ROOT_DIR)
+from pyzgz.atomic_files import atomic_open  # noqa: E402
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_digest(path: str) -> str:
+    try:
+        with open(path, "rb") as f:
+            return _sha256(f.read())
+    except OSError:
+        return "missing"
+
+
+def _local_imports(module: str) -> List[str]:
+    """pyzgz modules imported by pyzgz/<module>.py (relative or absolute)."""
+    path = os.path.join(APP_DIR, f"{module}.py")
+    try:
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), path)
+    except (OSError, SyntaxError):
+        return []
+    found = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            if node.level == 1 or node.module == "pyzgz":
+                names = [a.name for a in node.names] if not node.module else []
+                if node.level == 1 and node.module:
+                    names = [node.module.split(".")[0]]
+                found += names
+            elif node.module and node.module.startswith("pyzgz."):
+                found.append(node.module.split(".")[1])
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name.startswith("pyzgz."):
+                    found.append(alias.name.split(".")[1])
+    return [m for m in found if os.path.exists(os.path.join(APP_DIR, f"{m}.py"))]
+
+
+def module_closure(module: str) -> List[str]:
+    """``module`` and every pyzgz module it imports, transitively, sorted."""
+    seen = set()
+    pending = [module]
+    while pending:
+        m = pending.pop()
+        if m not in seen:
+            seen.add(m)
+            pending += _local_imports(m)
+    return sorted(seen)
+
+
+def _assets_digest() -> str:
+    digest = hashlib.sha256()
+    for dirpath, dirs, names in os.walk(ASSETS_DIR):
+        rel_dir = os.path.relpath(dirpath, ASSETS_DIR)
+        if rel_dir == ".":
+            dirs[:] = [d for d in dirs if d not in DATA_ASSETS]
+            names = [n for n in names if n not in DATA_ASSETS]
+        dirs.sort()
+        for name in sorted(names):
+            rel = os.path.normpath(os.path.join(rel_dir, name)).replace(os.sep, "/")
+            digest.update(
+                f"{rel}\0{_file_digest(os.path.join(dirpath, name))}\0".encode()
+            )
+    return digest.hexdigest()
+
+
+def _data_asset_files() -> Dict[str, str]:
+    """{path in the export: file in assets/} of the current DATA_ASSETS."""
+    files = {}
+    for name in sorted(DATA_ASSETS):
+        path = os.path.join(ASSETS_DIR, name)
+        if os.path.isfile(path):
+            files[name] = path
+        for dirpath, _, names in os.walk(path):
+            for file_name in names:
+                if file_name.startswith("."):
+                    continue  # temporary files; reflex skips hidden files too
+                full = os.path.join(dirpath, file_name)
+                files[os.path.relpath(full, ASSETS_DIR).replace(os.sep, "/")] = full
+    return files
+
+
+def refresh_data_assets(zip_path: str) -> int:
+    """Replace the DATA_ASSETS in the export at ``zip_path`` with the current
+    files; returns how many it now holds.
+
+    The export keeps them at its root, as reflex copies assets/ there.
+    """
+    files = _data_asset_files()
+    with atomic_open(zip_path, "wb") as out:
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as dst:
+            with zipfile.ZipFile(zip_path) as src:
+                for info in src.infolist():
+                    if info.filename.split("/", 1)[0] not in DATA_ASSETS:
+                        dst.writestr(info, src.read(info))
+            for arcname, path in files.items():
+                dst.write(path, arcname)
+    return len(files)
+
+
+def global_inputs(command: str) -> Dict[str, str]:
+    inputs = {name: _file_digest(os.path.join(ROOT_DIR, name)) for name in GLOBAL_FILES}
+    for module in APP_MODULES:
+        inputs[f"pyzgz/{module}.py"] = _file_digest(
+            os.path.join(APP_DIR, f"{module}.py")
+        )
+    inputs["assets"] = _assets_digest()
+    inputs["command"] = command
+    try:
+        inputs["reflex"] = metadata.version("reflex")
+    except metadata.PackageNotFoundError:
+        inputs["reflex"] = "missing"
+    return inputs
+
+
+def route_inputs() -> Dict[str, Dict[str, str]]:
+    """Per-route input digests: {route: {"code": ..., "data": ...}}."""
+    from pyzgz import main
+
+    code_digests: Dict[str, str] = {}
+    routes: Dict[str, Dict[str, str]] = {}
+    # Filled by register_pages() when pyzgz.main builds the app on import
+    for route, entry in main.registered.items():
+        module = entry.module
+        if module not in code_digests:
+            digest = hashlib.sha256()
+            for m in module_closure(module):
+                path = os.path.join(APP_DIR, f"{m}.py")
+                digest.update(f"{m}\0{_file_digest(path)}\0".encode())
+            code_digests[module] = digest.hexdigest()
+        data = main.route_data(route)
+        routes[route] = {
+            "code": code_digests[module],
+            "data": _sha256(repr(data).encode("utf-8")) if data is not None else "",
+        }
+    return routes
+
+
+def _load_manifest() -> Dict[str, Any]:
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def _save_manifest(manifest: Dict[str, Any]) -> None:
+    with atomic_open(MANIFEST_PATH, encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def diff_routes(
+    before: Dict[str, Dict[str, str]], after: Dict[str, Dict[str, str]]
+) -> Dict[str, List[str]]:
+    """Added, removed and changed (code or data) routes."""
+    return {
+        "added": sorted(set(after) - set(before)),
+        "removed": sorted(set(before) - set(after)),
+        "code": sorted(
+            r for r in after if r in before and before[r]["code"] != after[r]["code"]
+        ),
+        "data": sorted(
+            r
+            for r in after
+            if r in before
+            and before[r]["code"] == after[r]["code"]
+            and before[r]["data"] != after[r]["data"]
+        ),
+    }
+
+
+def _last_full_build(builds: List[Dict[str, Any]]) -> Dict[str, Any] | None:
+    return next((b for b in reversed(builds) if b.get("mode") == "full"), None)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Static export, skipped when nothing changed."
+    )
+    parser.add_argument("--command", default=DEFAULT_COMMAND, help="export command")
+    parser.add_argument("--zip", default=EXPORT_ZIP, help="zip the command writes")
+    parser.add_argument("--force", action="store_true", help="always export")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="only report what changed"
+    )
+    args = parser.parse_args(argv)
+    os.chdir(ROOT_DIR)
+
+    t0 = time.perf_counter()
+    manifest = _load_manifest()
+    current_global = global_inputs(args.command)
+    current_routes = route_inputs()
+    fingerprint_s = time.perf_counter() - t0
+
+    changed_global = sorted(
+        k
+        for k in current_global.keys() | manifest.get("global", {}).keys()
+        if current_global.get(k) != manifest.get("global", {}).get(k)
+    )
+    changes = diff_routes(manifest.get("routes", {}), current_routes)
+    changed_routes = sorted({r for routes in changes.values() for r in routes})
+    print(
+        f"[export] {len(current_routes)} routes fingerprinted in "
+        f"{fingerprint_s * 1000:.0f} ms"
+    )
+    if changed_global:
+        print(f"[export] global inputs changed: {', '.join(changed_global)}")
+    for kind, routes in changes.items():
+        if routes:
+            print(f"[export] {kind}: {', '.join(routes)}")
+
+    reuse = (
+        not args.force
+        and not changed_global
+        and not changed_routes
+        and os.path.exists(CACHED_ZIP)
+    )
+    if args.dry_run:
+        print(f"[export] would {'reuse the cached export' if reuse else 'export'}")
+        return 0
+
+    builds: List[Dict[str, Any]] = manifest.get("builds", [])
+    if reuse:
+        shutil.copyfile(CACHED_ZIP, args.zip)
+        refreshed = refresh_data_assets(args.zip)
+        print(f"[export] reused the cached export with {refreshed} current data files")
+        mode = "reused"
+    else:
+        print(f"[export] running: {args.command}")
+        result = subprocess.run(shlex.split(args.command), cwd=ROOT_DIR)
+        if result.returncode != 0 or not os.path.exists(args.zip):
+            print(f"[export] export failed (exit code {result.returncode})")
+            return 1
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        shutil.copyfile(args.zip, CACHED_ZIP)
+        mode = "full"
+    seconds = time.perf_counter() - t0
+
+    cold = _last_full_build(builds)
+    builds = (
+        builds
+        + [
+            {
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "mode": mode,
+                "seconds": round(seconds, 3),
+                "changed_routes": len(changed_routes),
+                "routes": len(current_routes),
+            }
+        ]
+    )[-KEEP_BUILDS:]
+    _save_manifest(
+        {"global": current_global, "routes": current_routes, "builds": builds}
+    )
+
+    line = f"[export] {mode}: {seconds:.1f}s"
+    if mode == "reused" and cold:
+        line += f" (last full build {cold['seconds']:.1f}s)"
+    elif mode == "full":
+        line += f", {len(changed_routes)} of {len(current_routes)} routes changed"
+    print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,209 +1,1424 @@
 #!/usr/bin/env python3
 """
-Fetch upcoming and past Meetup events for a group and write assets/events.json.
+Fetch upcoming and past Meetup events for one or more groups and write
+assets/events.json.
 
-Priority order:
-1) Use Meetup API (requires MEETUP_TOKEN via OAuth, and MEETUP_GROUP urlname).
-2) Fallback: parse the group's public iCal feed for upcoming events only.
+Sources, fetched concurrently over one pooled async client:
+- Meetup API (requires MEETUP_TOKEN via OAuth).
+- The group's public iCal feed (upcoming events only).
+Each source is retried with exponential backoff on timeouts, connection
+errors, 429 and 5xx. The results are merged and deduplicated by Meetup event
+id; when both sources have an event, the richer record wins. A failing or
+slow API no longer delays the iCal fetch.
+
+Groups: MEETUP_GROUPS (comma/space separated urlnames), else the file in
+MEETUP_GROUPS_FILE (default meetup_groups.txt: one urlname per line, `#`
+comments), else MEETUP_GROUP, else "python_zgz". Groups are fetched
+concurrently (at most MEETUP_GROUP_CONCURRENCY at a time) over one shared
+client, with requests to each host spaced to at most MEETUP_HOST_RATE per
+second. Every event is tagged with its group ("group" field) and all groups
+are merged into one output, newest first.
 
 Env vars:
-- MEETUP_GROUP (e.g. "python_zgz")
+- MEETUP_GROUPS / MEETUP_GROUPS_FILE / MEETUP_GROUP (see above)
 - MEETUP_TOKEN (OAuth token) [optional but recommended]
+- MEETUP_API_CONCURRENCY (pages fetched in parallel per group, default 4)
+- MEETUP_GROUP_CONCURRENCY (groups fetched in parallel, default 4)
+- MEETUP_HOST_RATE (max requests per second per host, default 10; 0 = off)
+- MEETUP_RETRIES (retries per request, default 2)
+
+The API is paginated: every page is fetched (concurrently, over one pooled
+async client) so older events are not lost. Requests are conditional:
+ETag/Last-Modified and a content hash per source are kept in a fetch cache,
+so an unchanged source is answered from the cache.
+
+Fetched events are upserted (keyed by Meetup event id) into the SQLite event
+store configured by rxconfig.db_url, which keeps the full history; the store
+is then exported to assets/events.json for the static build.
+
+Delta sync: after a successful API sync the store keeps a watermark per group (latest
+past event time and last sync). Later runs only ask the API for events since
+the watermark (all upcoming events plus the recent past); stored events in
+that window that are no longer returned (cancelled/deleted) are removed.
+The first run, or `--full`, re-downloads the whole history and reconciles
+everything.
+
+Daemon: `--daemon` keeps one client alive and syncs on an adaptive
+schedule: every POLL_MAX_S (6h) when no event is near, hourly in the week
+before the next event, every 15 min in its last day and every 5 min in its
+last 3 hours, when RSVPs and venue changes happen. events.json is only
+written, and the `--on-change` command (or MEETUP_ON_CHANGE) only run, when
+the exported events changed. Metrics (last sync, latency, change count) are
+written to .cache/fetch_meetup_daemon.json after every sync. Stored history
+is fully reconciled at least every FULL_SYNC_EVERY_MS (7 days).
+
+Metrics: every run records, per group and source, connect time, TTFB,
+download time, bytes, requests, parse and normalize time, plus the time to
+sync each group into the store and to write events.json, and every error
+with its type. They are written to .cache/fetch_meetup_metrics.json (or
+--metrics PATH) and, with --prometheus PATH, in the Prometheus text format
+(e.g. for node_exporter's textfile collector).
+
+Output: every file is written to a temporary file and renamed into place,
+so a crash never leaves a truncated events.json, and only rewritten when its
+content changed. `--compact` (or MEETUP_COMPACT=1) writes minified JSON.
+`--shards` (or MEETUP_SHARDS=1) also writes assets/data/: events-upcoming.json,
+one events-<year>.json per year of past events (Europe/Madrid) and
+events-index.json listing them with their counts and hashes, so the pages
+and client code load only the shard they need. Undated events are only in
+events.json.
+
+Usage:
+    python scripts/fetch_meetup.py [--full] [--compact] [--shards]
+    python scripts/fetch_meetup.py [--metrics PATH] [--prometheus PATH]
+    python scripts/fetch_meetup.py --daemon [--on-change "cmd"]
 
 Writes:
-- assets/events.json (list of events with fields: name, link, time(ms), venue{name}, description)
+- pyzgz.db (event store, see pyzgz/event_store.py)
+- assets/events.json (list of events with fields: name, link, time(ms), venue{name}, description, group)
+- assets/calendar-index.json (events by Europe/Madrid month, see pyzgz/calendar_index.py)
+- assets/data/events-{index,upcoming,<year>}.json (--shards only)
+- .cache/fetch_meetup.json (fetch cache, safe to delete)
+- .cache/fetch_meetup_metrics.json (stage metrics of the last run)
+- .cache/fetch_meetup_daemon.json (daemon metrics, --daemon only)
+
+Exit codes:
+- 0: events.json (or a shard, or the calendar index) written
+- 3: normalized events unchanged; outputs left untouched (skip the rebuild)
 """
 
 from __future__ import annotations
 import os
+import re
+import sys
 import json
-from typing import Any, Dict, List
+import time
+import random
+import signal
+import asyncio
+import argparse
+import hashlib
+from contextlib import contextmanager
+from datetime import datetime, timezone, tzinfo
+from functools import lru_cache
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Generator
+from typing import Iterable, Iterator, List, TypeVar
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import httpx
 
-ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets")
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from pyzgz import calendar_index, event_store  # noqa: E402
+from pyzgz.atomic_files import write_atomic  # noqa: E402
+from pyzgz.event_schema import validate_events  # noqa: E402
+
+ASSETS_DIR = os.path.join(ROOT_DIR, "assets")
 OUTPUT_PATH = os.path.join(ASSETS_DIR, "events.json")
+CALENDAR_PATH = calendar_index.INDEX_PATH
+SHARDS_DIR = os.path.join(ASSETS_DIR, "data")
+SHARD_INDEX = "events-index.json"
+SHARD_UPCOMING = "events-upcoming.json"
+SHARD_YEAR = "events-{year}.json"
+_SHARD_YEAR_RE = re.compile(r"^events-\d{4}\.json$")
+SITE_TZ = "Europe/Madrid"  # past events are sharded by their local year
+CACHE_DIR = os.getenv("MEETUP_CACHE_DIR") or os.path.join(ROOT_DIR, ".cache")
+CACHE_PATH = os.path.join(CACHE_DIR, "fetch_meetup.json")
+DAEMON_METRICS_PATH = os.path.join(CACHE_DIR, "fetch_meetup_daemon.json")
+METRICS_PATH = os.path.join(CACHE_DIR, "fetch_meetup_metrics.json")
+
+EXIT_UNCHANGED = 3
+
+HTTP_TIMEOUT = 20.0
+RETRIES = int(os.getenv("MEETUP_RETRIES") or 2)
+RETRY_BACKOFF = 0.5  # seconds before the first retry; doubles every attempt
+
+API_BASE = os.getenv("MEETUP_API_BASE") or "https://api.meetup.com"
+API_PAGE_SIZE = 200
+API_CONCURRENCY = int(os.getenv("MEETUP_API_CONCURRENCY") or 4)
+# Delta syncs re-fetch from a week before the watermark to catch late edits
+SYNC_OVERLAP_MS = 7 * 24 * 3600 * 1000
+# Daemon polling: (time left until the next event, seconds between polls),
+# tightest first; POLL_MAX_S when no event is that close
+HOUR_MS = 3600 * 1000
+POLL_SCHEDULE = [
+    (3 * HOUR_MS, 5 * 60),
+    (24 * HOUR_MS, 15 * 60),
+    (7 * 24 * HOUR_MS, 3600),
+]
+POLL_MIN_S = 60
+POLL_MAX_S = 6 * 3600
+FULL_SYNC_EVERY_MS = 7 * 24 * HOUR_MS
+ICAL_BASE = os.getenv("MEETUP_ICAL_BASE") or "https://www.meetup.com"
+DEFAULT_GROUP = "python_zgz"
+GROUPS_FILE = os.getenv("MEETUP_GROUPS_FILE") or os.path.join(
+    ROOT_DIR, "meetup_groups.txt"
+)
+GROUP_CONCURRENCY = int(os.getenv("MEETUP_GROUP_CONCURRENCY") or 4)
+HOST_RATE = float(os.getenv("MEETUP_HOST_RATE") or 10)
+# Timezone assumed for iCal times without Z or TZID (Meetup emits local time)
+ICAL_TZ = "Europe/Madrid"
+# iCal properties used by _ical_event; everything else is skipped while parsing
+_ICAL_KEYS = frozenset({"SUMMARY", "URL", "LOCATION", "DTSTART"})
+# RFC 5545 TEXT escapes (SUMMARY, LOCATION): \\ \; \, and \n or \N
+_ICAL_ESCAPE_RE = re.compile(r"\\([\\;,nN])")
+_ICAL_UNESCAPED = {"\\": "\\", ";": ";", ",": ",", "n": "\n", "N": "\n"}
 
 
 def _ensure_assets_dir() -> None:
     os.makedirs(ASSETS_DIR, exist_ok=True)
 
 
-def fetch_api(group: str, token: str) -> List[Dict[str, Any]]:
-    url = f"https://api.meetup.com/{group}/events"
-    # Request both upcoming and past (descending), large page size
-    params = {"status": "upcoming,past", "desc": "true", "page": 200}
-    headers = {"Authorization": f"Bearer {token}"}
-    with httpx.Client(timeout=20.0) as client:
-        r = client.get(url, params=params, headers=headers)
+def load_cache() -> Dict[str, Any]:
+    """Load the fetch cache (CACHE_PATH) to pass to sync_once. Returns {} on
+    any error."""
+    try:
+        with open(CACHE_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def _save_cache(cache: Dict[str, Any]) -> None:
+    write_atomic(CACHE_PATH, json.dumps(cache, ensure_ascii=False).encode("utf-8"))
+
+
+def _write_if_changed(path: str, data: bytes) -> bool:
+    """Atomically write ``data`` unless ``path`` already holds it."""
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    write_atomic(path, data)
+    return True
+
+
+def _dump_json(data: Any, compact: bool = False) -> bytes:
+    if compact:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    return text.encode("utf-8")
+
+
+def _conditional_headers(entry: Dict[str, Any] | None) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def _cached_events(
+    entry: Dict[str, Any] | None, r: httpx.Response, digest: str | None = None
+) -> List[Dict[str, Any]] | None:
+    """Return the cached events if the source did not change, else None.
+
+    ``digest`` is the body hash; pass None for a streamed response whose
+    body has not been read yet (only a 304 can be answered then).
+    """
+    if not entry or not isinstance(entry.get("events"), list):
+        return None
+    if r.status_code == 304:
+        return entry["events"]
+    if r.status_code == 200 and digest and entry.get("sha256") == digest:
+        return entry["events"]
+    return None
+
+
+def _remember(
+    cache: Dict[str, Any] | None,
+    key: str,
+    r: httpx.Response,
+    events: List[Dict[str, Any]],
+    digest: str,
+    **page: Any,
+) -> None:
+    """Cache ``events`` with the response's validators; ``page`` holds what
+    a 304 must answer for besides the events (e.g. API pagination)."""
+    if cache is None or r.status_code != 200:
+        return
+    cache[key] = {
+        "etag": r.headers.get("ETag"),
+        "last_modified": r.headers.get("Last-Modified"),
+        "sha256": digest,
+        "events": events,
+        **page,
+    }
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+T = TypeVar("T")
+
+
+class FetchMetrics:
+    """Stage timings and counters of one sync run, per (group, source).
+
+    Sources are "api" and "ical" (stages connect, ttfb, download, parse,
+    normalize, validate; counters requests, bytes, events, cache_hits,
+    invalid), "store" (syncing a group into the event store) and "export"
+    (writing events.json). For the streamed iCal feed, download overlaps
+    parse.
+    """
+
+    STAGES = (
+        "connect",
+        "ttfb",
+        "download",
+        "parse",
+        "normalize",
+        "validate",
+        "store",
+        "write",
+    )
+    COUNTERS = ("requests", "bytes", "events", "cache_hits", "invalid", "errors")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self.duration: float | None = None
+        self.entries: Dict[tuple[str, str], Dict[str, float]] = {}
+        self.errors: List[Dict[str, str]] = []
+
+    def add(self, group: str, source: str, key: str, value: float) -> None:
+        entry = self.entries.setdefault((group, source), {})
+        entry[key] = entry.get(key, 0) + value
+
+    @contextmanager
+    def timed(self, group: str, source: str, stage: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(group, source, stage, time.perf_counter() - t0)
+
+    def error(self, group: str, source: str, e: BaseException) -> None:
+        self.add(group, source, "errors", 1)
+        self.errors.append(
+            {
+                "group": group,
+                "source": source,
+                "type": type(e).__name__,
+                "message": str(e),
+            }
+        )
+
+    def trace(self, group: str, source: str) -> Callable[[str, dict], Awaitable[None]]:
+        """An httpx "trace" extension recording connect, TTFB and download."""
+        started: Dict[str, float] = {}
+
+        async def callback(name: str, info: dict) -> None:
+            # e.g. "http11.receive_response_headers.complete"
+            event, _, phase = name.rpartition(".")
+            step = event.rpartition(".")[2]
+            now = time.perf_counter()
+            if phase == "started":
+                started[step] = now
+            elif phase == "complete" and step in started:
+                if step in ("connect_tcp", "start_tls"):
+                    self.add(group, source, "connect", now - started[step])
+                elif step == "receive_response_headers":
+                    t0 = started.get("send_request_headers", started[step])
+                    self.add(group, source, "ttfb", now - t0)
+                elif step == "receive_response_body":
+                    self.add(group, source, "download", now - started[step])
+
+        return callback
+
+    def finish(self) -> None:
+        self.duration = time.perf_counter() - self._t0
+
+    def to_dict(self) -> Dict[str, Any]:
+        sources = []
+        for (group, source), values in self.entries.items():
+            row: Dict[str, Any] = {"group": group, "source": source}
+            for key in self.STAGES:
+                if key in values:
+                    row[f"{key}_s"] = round(values[key], 6)
+            for key in self.COUNTERS:
+                if key in values:
+                    row[key] = int(values[key])
+            sources.append(row)
+        return {
+            "started": datetime.fromtimestamp(
+                self.started, tz=timezone.utc
+            ).isoformat(),
+            "duration_s": round(self.duration, 6) if self.duration else None,
+            "sources": sources,
+            "errors": self.errors,
+        }
+
+    def to_prometheus(self, prefix: str = "pyzgz_fetch") -> str:
+        lines = [
+            f"# HELP {prefix}_stage_seconds Time per group, source and stage in the last run.",
+            f"# TYPE {prefix}_stage_seconds gauge",
+        ]
+        for (group, source), values in self.entries.items():
+            for key in self.STAGES:
+                if key in values:
+                    labels = _labels(group=group, source=source, stage=key)
+                    lines.append(
+                        f"{prefix}_stage_seconds{{{labels}}} {values[key]:.6f}"
+                    )
+        for key in self.COUNTERS:
+            lines += [
+                f"# HELP {prefix}_{key} {key.replace('_', ' ').capitalize()} per group and source in the last run.",
+                f"# TYPE {prefix}_{key} gauge",
+            ]
+            for (group, source), values in self.entries.items():
+                if key in values:
+                    labels = _labels(group=group, source=source)
+                    lines.append(f"{prefix}_{key}{{{labels}}} {int(values[key])}")
+        lines += [
+            f"# HELP {prefix}_duration_seconds Wall time of the last run.",
+            f"# TYPE {prefix}_duration_seconds gauge",
+            f"{prefix}_duration_seconds {self.duration or 0:.6f}",
+            f"# HELP {prefix}_last_run_timestamp_seconds Start of the last run.",
+            f"# TYPE {prefix}_last_run_timestamp_seconds gauge",
+            f"{prefix}_last_run_timestamp_seconds {self.started:.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _labels(**labels: str) -> str:
+    def esc(v: str) -> str:
+        return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+    return ",".join(f'{k}="{esc(v)}"' for k, v in labels.items())
+
+
+# Metrics of the current run; reset by sync_once()
+metrics = FetchMetrics()
+
+
+def load_groups() -> List[str]:
+    """Group urlnames from MEETUP_GROUPS, the groups file or MEETUP_GROUP."""
+    raw = os.getenv("MEETUP_GROUPS")
+    if raw:
+        names = raw.replace(",", " ").split()
+    else:
+        try:
+            with open(GROUPS_FILE, "r", encoding="utf-8") as f:
+                names = [line.split("#", 1)[0].strip() for line in f]
+        except OSError:
+            names = []
+        names = [n for n in names if n] or [os.getenv("MEETUP_GROUP") or DEFAULT_GROUP]
+    # Keep the configured order, drop duplicates
+    return list(dict.fromkeys(names))
+
+
+class HostRateLimiter:
+    """Space out requests to each host to at most ``rate`` per second.
+
+    Installed as an httpx request hook, so every request on the shared
+    client (API pages, iCal feeds, retries) waits for its host's next slot.
+    """
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+
+    async def __call__(self, request: httpx.Request) -> None:
+        if not self.interval:
+            return
+        now = asyncio.get_running_loop().time()
+        host = request.url.host
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def _retryable(e: Exception) -> bool:
+    """Timeouts, connection errors, 429 and 5xx are worth another attempt."""
+    if isinstance(e, httpx.HTTPStatusError):
+        status = e.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(e, httpx.TransportError)
+
+
+async def _with_retries(
+    fn: Callable[[], Awaitable[T]], what: str, retries: int = RETRIES
+) -> T:
+    """Await ``fn()``, retrying transient failures with exponential backoff."""
+    attempt = 0
+    while True:
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt >= retries or not _retryable(e):
+                raise
+            # Jitter keeps concurrent retries from hitting the host together
+            delay = RETRY_BACKOFF * 2**attempt * (0.5 + random.random())
+            attempt += 1
+            print(
+                f"[fetch_meetup] {what} failed ({e!r}); "
+                f"retry {attempt}/{retries} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+
+def _normalize_api_event(ev: Dict[str, Any]) -> Dict[str, Any]:
+    # Normalize minimal fields
+    name = ev.get("name")
+    link = ev.get("link") or ev.get("event_url")
+    time_ms = ev.get("time")  # epoch ms
+    venue = None
+    if isinstance(ev.get("venue"), dict):
+        vname = ev["venue"].get("name")
+        if vname:
+            venue = {"name": vname}
+    # Per request: use SUMMARY as description; in API 'name' is the closest
+    desc = name
+    return {
+        "name": name,
+        "link": link,
+        "time": time_ms,
+        "venue": venue,
+        "description": desc,
+    }
+
+
+class IncompleteListing(Exception):
+    """The API listed fewer events than its X-Total-Count announced."""
+
+
+async def _fetch_api_page(
+    client: httpx.AsyncClient,
+    group: str,
+    offset: int,
+    headers: Dict[str, str],
+    cache: Dict[str, Any] | None,
+    page_size: int,
+    query: Dict[str, str],
+) -> tuple[List[Dict[str, Any]], bool, int | None, int]:
+    """Fetch one API page. Returns (events, has_next, total_count, records).
+
+    ``records`` counts the page as sent, cancelled events included; whether
+    there is a next page is decided on it, not on the events kept. A 304
+    answers with the events and pagination cached with the page.
+    """
+    url = f"{API_BASE}/{group}/events"
+    mode = "delta" if "no_earlier_than" in query else "full"
+    key = f"api:{group}:{mode}:{offset}"
+    entry = cache.get(key) if cache is not None else None
+    if entry and "has_next" not in entry:
+        entry = None  # cached before pagination was kept: fetch it again
+    params = {**query, "page": page_size, "offset": offset}
+    r = await client.get(
+        url,
+        params=params,
+        headers={**headers, **_conditional_headers(entry)},
+        extensions={"trace": metrics.trace(group, "api")},
+    )
+    metrics.add(group, "api", "requests", 1)
+    metrics.add(group, "api", "bytes", r.num_bytes_downloaded)
+    total = r.headers.get("X-Total-Count")
+    total_count = int(total) if total and total.isdigit() else None
+    digest = _sha256(r.content) if r.status_code == 200 else None
+    cached = _cached_events(entry, r, digest)
+    if cached is not None:
+        assert entry is not None
+        metrics.add(group, "api", "cache_hits", 1)
+        events = cached
+        has_next, records = entry["has_next"], entry.get("records", len(cached))
+        if r.status_code == 304 and total_count is None:
+            total_count = entry.get("total")
+    else:
         r.raise_for_status()
-        data = r.json()
+        with metrics.timed(group, "api", "parse"):
+            data = r.json()
         if not isinstance(data, list):
-            return []
-        events: List[Dict[str, Any]] = []
-        for ev in data:
-            # Normalize minimal fields
-            name = ev.get("name")
-            link = ev.get("link") or ev.get("event_url")
-            time_ms = ev.get("time")  # epoch ms
-            venue = None
-            if isinstance(ev.get("venue"), dict):
-                vname = ev["venue"].get("name")
-                if vname:
-                    venue = {"name": vname}
-            # Per request: use SUMMARY as description; in API 'name' is the closest
-            desc = name
-            events.append(
-                {
-                    "name": name,
-                    "link": link,
-                    "time": time_ms,
-                    "venue": venue,
-                    "description": desc,
-                }
+            return [], False, total_count, 0
+        # Cancelled events are left out, so sync_events prunes them
+        with metrics.timed(group, "api", "normalize"):
+            events = [
+                _normalize_api_event(ev)
+                for ev in data
+                if isinstance(ev, dict) and ev.get("status") != "cancelled"
+            ]
+        records = len(data)
+        has_next = "next" in r.links or records >= page_size
+    metrics.add(group, "api", "events", len(events))
+    if digest:
+        _remember(
+            cache,
+            key,
+            r,
+            events,
+            digest,
+            has_next=has_next,
+            total=total_count,
+            records=records,
+        )
+    return events, has_next, total_count, records
+
+
+async def iter_api_events(
+    client: httpx.AsyncClient,
+    group: str,
+    token: str,
+    cache: Dict[str, Any] | None = None,
+    concurrency: int = API_CONCURRENCY,
+    page_size: int = API_PAGE_SIZE,
+    since_ms: int | None = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield normalized API events page by page, as each page arrives.
+
+    With ``since_ms`` only events starting at or after it are requested
+    (delta sync: every upcoming event plus the recent past); without it the
+    group's whole history is fetched.
+
+    The first page tells whether there is more and, when the API sends
+    X-Total-Count, how many pages there are. Remaining pages are fetched
+    concurrently (at most ``concurrency`` in flight); without a total count,
+    offsets are requested in windows of ``concurrency`` pages until a window
+    contains the last page.
+
+    Raises IncompleteListing, after the events it got, when the pages held
+    fewer records than X-Total-Count: sync_events would take the listing
+    as complete and prune the events it is missing.
+    """
+    headers = {"Authorization": f"Bearer {token}"}
+    # Request both upcoming and past (descending)
+    query = {"status": "upcoming,past", "desc": "true"}
+    if since_ms is not None:
+        query["no_earlier_than"] = _api_local_time(since_ms)
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    Page = tuple[List[Dict[str, Any]], bool, int | None, int]
+
+    async def fetch_page(offset: int) -> Page:
+        async with sem:
+            return await _fetch_api_page(
+                client, group, offset, headers, cache, page_size, query
             )
-        return events
-
-
-def fetch_ical(group: str) -> List[Dict[str, Any]]:
-    # Fallback: parse iCal feed (usually upcoming events only)
-    ical_url = f"https://www.meetup.com/{group}/events/ical/"
-    with httpx.Client(timeout=20.0) as client:
-        r = client.get(ical_url)
-        if r.status_code != 200:
-            return []
-        raw_lines = r.text.splitlines()
-
-    # Unfold folded lines per RFC 5545 (lines starting with space continue previous)
-    lines: List[str] = []
-    for raw in raw_lines:
-        if raw.startswith(" ") and lines:
-            lines[-1] += raw[1:]
+
+    async def page(offset: int) -> Page:
+        # The semaphore is released while a failed page waits to be retried
+        return await _with_retries(
+            lambda: fetch_page(offset), f"API page {offset} ({group})"
+        )
+
+    events, has_next, total, received = await page(0)
+    for ev in events:
+        yield ev
+
+    last = -(-total // page_size) if total is not None else None
+    next_offset = 1
+    while has_next and (last is None or next_offset < last):
+        stop = last if last is not None else next_offset + max(1, concurrency)
+        tasks = [asyncio.create_task(page(o)) for o in range(next_offset, stop)]
+        has_next = last is None
+        try:
+            for fut in asyncio.as_completed(tasks):
+                events, more, _, records = await fut
+                received += records
+                if not more:
+                    has_next = False
+                for ev in events:
+                    yield ev
+        finally:
+            for task in tasks:
+                task.cancel()
+        next_offset = stop
+    if total is not None and received < total:
+        raise IncompleteListing(f"{group}: {received} of {total} events listed")
+
+
+async def fetch_api_async(
+    group: str,
+    token: str,
+    cache: Dict[str, Any] | None = None,
+    concurrency: int = API_CONCURRENCY,
+    since_ms: int | None = None,
+    client: httpx.AsyncClient | None = None,
+) -> List[Dict[str, Any]]:
+    """All API events; uses ``client`` if given, else a pool of its own.
+
+    The pages are still parsed and normalized as they arrive
+    (iter_api_events), but collected: the store sync merges them with the
+    iCal feed and prunes what the complete listing no longer has.
+    """
+    if client is None:
+        limits = httpx.Limits(max_connections=max(1, concurrency))
+        async with httpx.AsyncClient(timeout=HTTP_TIMEOUT, limits=limits) as client:
+            return await fetch_api_async(
+                group, token, cache, concurrency, since_ms, client
+            )
+    return [
+        ev
+        async for ev in iter_api_events(
+            client,
+            group,
+            token,
+            cache,
+            concurrency=concurrency,
+            since_ms=since_ms,
+        )
+    ]
+
+
+def fetch_api(
+    group: str,
+    token: str,
+    cache: Dict[str, Any] | None = None,
+    since_ms: int | None = None,
+) -> List[Dict[str, Any]]:
+    return asyncio.run(fetch_api_async(group, token, cache, since_ms=since_ms))
+
+
+def _api_local_time(ms: int) -> str:
+    """Epoch ms as the group-local ISO time the API expects (no offset)."""
+    local = datetime.fromtimestamp(ms / 1000, tz=_zone(None))
+    return local.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+@lru_cache(maxsize=None)
+def _zone(tzid: str | None) -> tzinfo:
+    """ZoneInfo for a TZID, memoized; unknown or missing TZIDs use ICAL_TZ."""
+    try:
+        return ZoneInfo(tzid or ICAL_TZ)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(ICAL_TZ)
+
+
+def _parse_dtstart(value: str, tzid: str | None) -> int | None:
+    """Parse a DTSTART value into epoch ms, dispatching on its shape.
+
+    Accepted shapes: YYYYMMDD, YYYYMMDDTHHMM and YYYYMMDDTHHMMSS, optionally
+    ending in Z (UTC). Without Z the value is local time in ``tzid``;
+    Meetup feeds usually emit Europe/Madrid local time.
+    """
+    utc = value.endswith("Z")
+    v = value[:-1] if utc else value
+    n = len(v)
+    if n not in (8, 13, 15) or (n > 8 and v[8] != "T") or not v[:8].isdigit():
+        return None
+    try:
+        if n == 8:
+            dt = datetime(int(v[:4]), int(v[4:6]), int(v[6:8]))
         else:
-            lines.append(raw)
+            dt = datetime(
+                int(v[:4]),
+                int(v[4:6]),
+                int(v[6:8]),
+                int(v[9:11]),
+                int(v[11:13]),
+                int(v[13:15]) if n == 15 else 0,
+            )
+    except ValueError:
+        return None
+    dt = dt.replace(tzinfo=timezone.utc if utc else _zone(tzid))
+    return int(dt.timestamp() * 1000)
 
-    events: List[Dict[str, Any]] = []
-    cur: Dict[str, Any] | None = None
 
-    for raw in lines:
-        line = raw.strip()
+def _ical_parser(
+    out: List[Dict[str, Any]],
+    build: Callable[[Dict[str, str]], Dict[str, Any]] | None = None,
+) -> Generator[None, str | None, None]:
+    """Coroutine that parses the iCal lines sent to it into ``out``.
+
+    Send raw lines as they arrive, then None at the end of the input. Folded
+    lines (RFC 5545 continuations start with space/tab) are joined first, so
+    a property is parsed once the line after it arrives; every finished
+    VEVENT is appended to ``out``, as built by ``build`` (_ical_event by
+    default). Works the same for a sync iterator and an async HTTP stream.
+    """
+    build = build or _ical_event
+    cur: Dict[str, str] | None = None
+    parts: List[str] = []
+    while True:
+        raw = yield
+        if raw is not None and raw[:1] in (" ", "\t") and parts:
+            parts.append(raw[1:])
+            continue
+        prev, parts = parts, [raw] if raw is not None else []
+        if not prev:
+            continue
+        line = "".join(prev).strip()
         if line == "BEGIN:VEVENT":
             cur = {}
             continue
         if line == "END:VEVENT":
             if cur:
-                # DTSTART may appear as DTSTART or DTSTART;TZID=...
-                dt = cur.get("DTSTART")
-                tzid = cur.get("DTSTART_TZID")
-                time_ms = None
-                if isinstance(dt, str) and dt:
-                    from datetime import datetime, timezone
-                    from zoneinfo import ZoneInfo
-
-                    # Try several common formats
-                    fmts = [
-                        "%Y%m%dT%H%M%SZ",  # UTC with Z
-                        "%Y%m%dT%H%M%S",  # no Z
-                        "%Y%m%dT%H%M",  # minutes precision
-                    ]
-                    for fmt in fmts:
-                        try:
-                            dt_obj = datetime.strptime(dt, fmt)
-                            # If the string ends with Z, it's already UTC.
-                            # If no Z and TZID provided, localize with that tz.
-                            if dt.endswith("Z"):
-                                dt_obj = dt_obj.replace(tzinfo=timezone.utc)
-                            elif tzid:
-                                try:
-                                    dt_obj = dt_obj.replace(tzinfo=ZoneInfo(tzid))
-                                except Exception:
-                                    # Fallback to Europe/Madrid if TZID unknown
-                                    dt_obj = dt_obj.replace(
-                                        tzinfo=ZoneInfo("Europe/Madrid")
-                                    )
-                            else:
-                                # No tz info; assume Europe/Madrid as Meetup feed usually emits local time
-                                dt_obj = dt_obj.replace(
-                                    tzinfo=ZoneInfo("Europe/Madrid")
-                                )
-                            # Convert to UTC for storage
-                            dt_obj = dt_obj.astimezone(timezone.utc)
-                            time_ms = int(dt_obj.timestamp() * 1000)
-                            break
-                        except Exception:
-                            continue
-
-                events.append(
-                    {
-                        "name": cur.get("SUMMARY"),
-                        "link": cur.get("URL"),
-                        "time": time_ms,
-                        "venue": (
-                            {"name": cur.get("LOCATION")}
-                            if cur.get("LOCATION")
-                            else None
-                        ),
-                        # Per request: use SUMMARY as description in iCal too
-                        # "description": cur.get("SUMMARY"),
-                    }
-                )
+                out.append(build(cur))
             cur = None
             continue
-
         if cur is None:
             continue
 
         # KEY:VALUE or KEY;PARAM=...:VALUE
-        if ":" in line:
-            left, value = line.split(":", 1)
-            value = value.strip()
-            # Extract base key and params
-            if ";" in left:
-                base, param_str = left.split(";", 1)
-                base_key = base.strip().upper()
-                # Very light param parsing (e.g., TZID=Europe/Madrid)
-                params = {}
-                for part in param_str.split(";"):
-                    if "=" in part:
-                        k, v = part.split("=", 1)
-                        params[k.strip().upper()] = v.strip()
-            else:
-                base_key = left.strip().upper()
-                params = {}
-
-            cur[base_key] = value
-            # Capture TZID for DTSTART if present
-            if base_key == "DTSTART" and "TZID" in params:
-                cur["DTSTART_TZID"] = params["TZID"]
-        else:
-            # No colon; ignore
-            pass
+        left, sep, value = line.partition(":")
+        if not sep:
+            continue
+        base, _, param_str = left.partition(";")
+        key = base.strip().upper()
+        if key not in _ICAL_KEYS:
+            continue
+        cur[key] = value.strip()
+        # Capture TZID for DTSTART if present (e.g. TZID=Europe/Madrid)
+        if key == "DTSTART" and param_str:
+            for part in param_str.split(";"):
+                k, eq, v = part.partition("=")
+                if eq and k.strip().upper() == "TZID":
+                    cur["DTSTART_TZID"] = v.strip().strip('"')
+
+
+def _ical_text(value: str | None) -> str | None:
+    """Unescape an RFC 5545 TEXT value (``Sala 1\\, Etopia`` -> ``Sala 1, Etopia``)."""
+    if not value or "\\" not in value:
+        return value
+    return _ICAL_ESCAPE_RE.sub(lambda m: _ICAL_UNESCAPED[m.group(1)], value)
 
+
+def _ical_event(props: Dict[str, str]) -> Dict[str, Any]:
+    location = _ical_text(props.get("LOCATION"))
+    dtstart = props.get("DTSTART")
+    return {
+        "name": _ical_text(props.get("SUMMARY")),
+        "link": props.get("URL"),
+        "time": (
+            _parse_dtstart(dtstart, props.get("DTSTART_TZID")) if dtstart else None
+        ),
+        "venue": {"name": location} if location else None,
+        # Per request: use SUMMARY as description in iCal too
+        # "description": props.get("SUMMARY"),
+    }
+
+
+def iter_ical_events(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Parse iCal lines incrementally, yielding one normalized event per VEVENT."""
+    out: List[Dict[str, Any]] = []
+    parser = _ical_parser(out)
+    next(parser)
+    send = parser.send
+    for raw in lines:
+        send(raw)
+        if out:
+            yield from out
+            out.clear()
+    send(None)
+    yield from out
+
+
+async def fetch_ical_async(
+    group: str,
+    cache: Dict[str, Any] | None = None,
+    client: httpx.AsyncClient | None = None,
+) -> List[Dict[str, Any]]:
+    """Events from the iCal feed (usually upcoming events only), parsed as it streams."""
+    if client is None:
+        async with httpx.AsyncClient(timeout=HTTP_TIMEOUT) as client:
+            return await fetch_ical_async(group, cache, client)
+    ical_url = f"{ICAL_BASE}/{group}/events/ical/"
+    key = f"ical:{group}"
+    entry = cache.get(key) if cache is not None else None
+    headers = _conditional_headers(entry)
+    trace = {"trace": metrics.trace(group, "ical")}
+    metrics.add(group, "ical", "requests", 1)
+    async with client.stream("GET", ical_url, headers=headers, extensions=trace) as r:
+        cached = _cached_events(entry, r)
+        if cached is not None:
+            metrics.add(group, "ical", "cache_hits", 1)
+            metrics.add(group, "ical", "events", len(cached))
+            return cached
+        r.raise_for_status()
+
+        def build(props: Dict[str, str]) -> Dict[str, Any]:
+            t0 = time.perf_counter()
+            ev = _ical_event(props)
+            normalize[0] += time.perf_counter() - t0
+            return ev
+
+        # Hash the feed while it streams through the parser. Lines are split
+        # per chunk (not with aiter_lines) to keep the per-line cost low.
+        digest = hashlib.sha256()
+        events: List[Dict[str, Any]] = []
+        normalize = [0.0]
+        parser = _ical_parser(events, build)
+        next(parser)
+        pending = ""
+        busy = 0.0  # time spent hashing/parsing, excluding network waits
+        async for chunk in r.aiter_text():
+            t0 = time.perf_counter()
+            digest.update(chunk.encode("utf-8"))
+            lines = (pending + chunk).split("\n")
+            pending = lines.pop()
+            for line in lines:
+                parser.send(line.rstrip("\r"))
+            busy += time.perf_counter() - t0
+        t0 = time.perf_counter()
+        if pending:
+            parser.send(pending.rstrip("\r"))
+        parser.send(None)
+        busy += time.perf_counter() - t0
+    metrics.add(group, "ical", "bytes", r.num_bytes_downloaded)
+    metrics.add(group, "ical", "parse", busy - normalize[0])
+    metrics.add(group, "ical", "normalize", normalize[0])
+    metrics.add(group, "ical", "events", len(events))
+    _remember(cache, key, r, events, digest.hexdigest())
     return events
 
 
-def main() -> int:
-    group = os.getenv("MEETUP_GROUP") or "python_zgz"
-    token = os.getenv("MEETUP_TOKEN")
-    _ensure_assets_dir()
+def fetch_ical(group: str, cache: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
+    return asyncio.run(fetch_ical_async(group, cache))
+
 
-    events: List[Dict[str, Any]] = []
+def _richness(ev: Dict[str, Any]) -> int:
+    return sum(1 for v in ev.values() if v not in (None, "", {}, []))
+
+
+def merge_events(*sources: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge event lists into one, deduplicated by Meetup event id.
+
+    On conflict the richer record (more non-empty fields) wins; ties keep the
+    record from the earlier source. A dict from id to position in the result
+    keeps this O(n). Events without an id are kept as they are.
+    """
+    merged: List[Dict[str, Any]] = []
+    index: Dict[str, int] = {}
+    for events in sources:
+        for ev in events:
+            key = event_store.event_id(ev)
+            if key is None:
+                merged.append(ev)
+                continue
+            i = index.get(key)
+            if i is None:
+                index[key] = len(merged)
+                merged.append(ev)
+            elif _richness(ev) > _richness(merged[i]):
+                merged[i] = ev
+    return merged
+
+
+async def fetch_sources(
+    group: str,
+    token: str | None,
+    cache: Dict[str, Any] | None = None,
+    since_ms: int | None = None,
+    concurrency: int = API_CONCURRENCY,
+    client: httpx.AsyncClient | None = None,
+) -> Dict[str, List[Dict[str, Any]] | Exception]:
+    """Fetch the API (with a token) and the iCal feed concurrently.
+
+    Both share one pooled client. Returns {source: events or the exception
+    it failed with}, API first.
+    """
+    if client is None:
+        limits = httpx.Limits(max_connections=max(1, concurrency) + 1)
+        async with httpx.AsyncClient(timeout=HTTP_TIMEOUT, limits=limits) as client:
+            return await fetch_sources(
+                group, token, cache, since_ms, concurrency, client
+            )
+    jobs: Dict[str, Awaitable[List[Dict[str, Any]]]] = {}
     if token:
+        jobs["api"] = fetch_api_async(
+            group, token, cache, concurrency, since_ms, client
+        )
+    jobs["ical"] = _with_retries(
+        lambda: fetch_ical_async(group, cache, client), f"iCal fetch ({group})"
+    )
+    results = await asyncio.gather(*jobs.values(), return_exceptions=True)
+    return dict(zip(jobs, results))
+
+
+async def fetch_groups(
+    groups: List[str],
+    token: str | None,
+    cache: Dict[str, Any] | None = None,
+    since_by_group: Dict[str, int | None] | None = None,
+    concurrency: int = API_CONCURRENCY,
+    group_concurrency: int = GROUP_CONCURRENCY,
+    rate: float = HOST_RATE,
+    client: httpx.AsyncClient | None = None,
+) -> Dict[str, Dict[str, List[Dict[str, Any]] | Exception]]:
+    """fetch_sources() for every group, ``group_concurrency`` groups at a time.
+
+    All groups share one client (``client``, else one from shared_client())
+    whose requests are rate limited per host. Returns {group: {source:
+    events or exception}} in ``groups`` order.
+    """
+    if client is None:
+        async with shared_client(concurrency, group_concurrency, rate) as client:
+            return await fetch_groups(
+                groups,
+                token,
+                cache,
+                since_by_group,
+                concurrency,
+                group_concurrency,
+                rate,
+                client,
+            )
+    since_by_group = since_by_group or {}
+    sem = asyncio.Semaphore(max(1, group_concurrency))
+
+    async def one(group: str) -> Dict[str, List[Dict[str, Any]] | Exception]:
+        async with sem:
+            return await fetch_sources(
+                group, token, cache, since_by_group.get(group), concurrency, client
+            )
+
+    results = await asyncio.gather(*(one(g) for g in groups))
+    return dict(zip(groups, results))
+
+
+def shared_client(
+    concurrency: int = API_CONCURRENCY,
+    group_concurrency: int = GROUP_CONCURRENCY,
+    rate: float = HOST_RATE,
+) -> httpx.AsyncClient:
+    """The pooled, per-host rate limited client fetch_groups() uses."""
+    limits = httpx.Limits(
+        max_connections=max(1, group_concurrency) * (max(1, concurrency) + 1)
+    )
+    hooks = {"request": [HostRateLimiter(rate)]}
+    return httpx.AsyncClient(timeout=HTTP_TIMEOUT, limits=limits, event_hooks=hooks)
+
+
+def _now_ms() -> int:
+    return int(datetime.now(timezone.utc).timestamp() * 1000)
+
+
+def _parse_args(argv: List[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Fetch Meetup events and write assets/events.json."
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="full reconciliation: re-download the whole history and drop "
+        "stored events the API no longer returns",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        default=os.getenv("MEETUP_COMPACT") == "1",
+        help="write minified JSON",
+    )
+    parser.add_argument(
+        "--shards",
+        action="store_true",
+        default=os.getenv("MEETUP_SHARDS") == "1",
+        help=f"also write upcoming/per-year shards and an index to "
+        f"{os.path.relpath(SHARDS_DIR, ROOT_DIR)}/",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="keep running and sync on an adaptive schedule",
+    )
+    parser.add_argument(
+        "--on-change",
+        default=os.getenv("MEETUP_ON_CHANGE"),
+        metavar="CMD",
+        help="shell command run after events.json changed (e.g. a rebuild)",
+    )
+    parser.add_argument(
+        "--metrics",
+        default=os.getenv("MEETUP_METRICS", METRICS_PATH),
+        metavar="PATH",
+        help="where to write the stage metrics of the run as JSON",
+    )
+    parser.add_argument(
+        "--prometheus",
+        default=os.getenv("MEETUP_PROMETHEUS"),
+        metavar="PATH",
+        help="also write the stage metrics in the Prometheus text format",
+    )
+    return parser.parse_args(argv)
+
+
+def _sync_group(
+    group: str,
+    results: Dict[str, List[Dict[str, Any]] | Exception],
+    since: int | None,
+    now_ms: int,
+) -> None:
+    """Validate and merge one group's sources, tag them and sync them into the store.
+
+    Each source is validated against the event schema before merging, so an
+    invalid record from one source does not shadow a valid one from another.
+    """
+    fetched: Dict[str, List[Dict[str, Any]]] = {}
+    for name, result in results.items():
+        if isinstance(result, Exception):
+            metrics.error(group, name, result)
+            print(f"[fetch_meetup] {group}: {name} fetch failed: {result!r}")
+            continue
+        with metrics.timed(group, name, "validate"):
+            valid, invalid = validate_events(result)
+        for index, reason in invalid:
+            link = (
+                result[index].get("link") if isinstance(result[index], dict) else None
+            )
+            print(f"[fetch_meetup] {group}: invalid {name} event {link!r}: {reason}")
+        metrics.add(group, name, "invalid", len(invalid))
+        fetched[name] = list(valid)
+    if not fetched:
+        return
+    if "api" not in fetched:
+        # The feed lists upcoming events only
+        since = now_ms
+
+    with metrics.timed(group, "store", "normalize"):
+        # API records are complete and replace the stored event; iCal records
+        # (no description) only fill in fields, see event_store.upsert_events
+        from_ical = {id(ev) for ev in fetched.get("ical", ())}
+        events: List[Dict[str, Any]] = []
+        partial: List[Dict[str, Any]] = []
+        for ev in merge_events(*fetched.values()):
+            (partial if id(ev) in from_ical else events).append({**ev, "group": group})
+    with metrics.timed(group, "store", "store"):
+        removed = event_store.sync_events(events, since, group=group, partial=partial)
+    merged = len(events) + len(partial)
+    metrics.add(group, "store", "events", merged)
+    mode = "full" if since is None else "delta"
+    print(
+        f"[fetch_meetup] {group}: {'+'.join(fetched)} {mode} sync: "
+        + ", ".join(f"{len(v)} from {k}" for k, v in fetched.items())
+        + f", {merged} merged, {removed} removed"
+    )
+    if "api" in fetched:
+        event_store.save_sync_state(
+            f"api:{group}",
+            watermark=event_store.latest_time_before(now_ms, group),
+            last_sync=now_ms,
+            full=since is None,
+        )
+
+
+def _since_by_group(
+    groups: List[str],
+    token: str | None,
+    full: bool,
+    now_ms: int,
+    full_every_ms: int | None = None,
+) -> Dict[str, int | None]:
+    """Start of the delta window per group; None means a full sync.
+
+    Events starting at or after it are fetched completely, so stored events
+    in that window that did not come back were cancelled or deleted.
+    """
+    since_by_group: Dict[str, int | None] = {g: None for g in groups}
+    if not token or full:
+        return since_by_group
+    for group in groups:
+        state = event_store.get_sync_state(f"api:{group}")
+        if state is None or state.watermark is None:
+            continue
+        if full_every_ms and (state.last_full_sync or 0) < now_ms - full_every_ms:
+            continue
+        since_by_group[group] = state.watermark - SYNC_OVERLAP_MS
+    return since_by_group
+
+
+def shard_events(
+    events: List[Dict[str, Any]], now_ms: int, compact: bool = False
+) -> Dict[str, bytes]:
+    """Split events (newest first) into the shard files, keyed by file name.
+
+    Upcoming events (soonest first) go to SHARD_UPCOMING, past ones (latest
+    first) to one SHARD_YEAR per Europe/Madrid year, and SHARD_INDEX lists
+    the shards with their event counts and hashes.
+    """
+    tz = ZoneInfo(SITE_TZ)
+    upcoming: List[Dict[str, Any]] = []
+    by_year: Dict[int, List[Dict[str, Any]]] = {}
+    for ev in events:
+        t = ev.get("time")
+        if not isinstance(t, (int, float)):
+            continue
+        if t >= now_ms:
+            upcoming.append(ev)
+        else:
+            year = datetime.fromtimestamp(t / 1000, tz=tz).year
+            by_year.setdefault(year, []).append(ev)
+    upcoming.reverse()
+
+    files: Dict[str, bytes] = {SHARD_UPCOMING: _dump_json(upcoming, compact)}
+    index: Dict[str, Any] = {
+        "timezone": SITE_TZ,
+        "groups": sorted({ev["group"] for ev in events if ev.get("group")}),
+        "upcoming": {"path": SHARD_UPCOMING, "count": len(upcoming)},
+        "years": [],
+    }
+    index["upcoming"]["sha256"] = _sha256(files[SHARD_UPCOMING])
+    for year in sorted(by_year, reverse=True):
+        name = SHARD_YEAR.format(year=year)
+        files[name] = _dump_json(by_year[year], compact)
+        index["years"].append(
+            {
+                "year": year,
+                "path": name,
+                "count": len(by_year[year]),
+                "sha256": _sha256(files[name]),
+            }
+        )
+    files[SHARD_INDEX] = _dump_json(index, compact)
+    return files
+
+
+def _export(compact: bool = False, shards: bool = False) -> bool:
+    """Export the whole store (newest first) to OUTPUT_PATH; False if unchanged.
+
+    The calendar index (CALENDAR_PATH) is built in the same pass. Files are
+    written atomically and only when their content changed; with ``shards``
+    the shard files in SHARDS_DIR are exported too.
+    """
+    with metrics.timed("", "export", "normalize"):
+        events = event_store.all_events()
+        outputs = {
+            OUTPUT_PATH: _dump_json(events, compact),
+            CALENDAR_PATH: calendar_index.dumps(calendar_index.build(events)),
+        }
+        if shards:
+            for name, data in shard_events(events, _now_ms(), compact).items():
+                outputs[os.path.join(SHARDS_DIR, name)] = data
+    metrics.add("", "export", "events", len(events))
+
+    with metrics.timed("", "export", "write"):
+        written = [
+            path for path, data in outputs.items() if _write_if_changed(path, data)
+        ]
+        if shards:
+            # Years that no longer have events (e.g. all pruned)
+            for name in os.listdir(SHARDS_DIR):
+                path = os.path.join(SHARDS_DIR, name)
+                if _SHARD_YEAR_RE.match(name) and path not in outputs:
+                    os.remove(path)
+                    written.append(path)
+    if not written:
+        print(f"Events unchanged ({len(events)}); left {OUTPUT_PATH} untouched")
+        return False
+    names = ", ".join(os.path.relpath(p, ASSETS_DIR) for p in written)
+    print(f"Wrote {len(events)} events ({names})")
+    return True
+
+
+async def sync_once(
+    groups: List[str],
+    token: str | None,
+    cache: Dict[str, Any],
+    full: bool = False,
+    client: httpx.AsyncClient | None = None,
+    full_every_ms: int | None = None,
+    compact: bool = False,
+    shards: bool = False,
+) -> bool:
+    """Fetch every group, sync the store and export it; True if it changed.
+
+    Stage metrics of the run are left in ``metrics``.
+    """
+    metrics.reset()
+    now_ms = _now_ms()
+    since_by_group = _since_by_group(groups, token, full, now_ms, full_every_ms)
+    results = await fetch_groups(groups, token, cache, since_by_group, client=client)
+    _save_cache(cache)
+    for group, group_results in results.items():
+        _sync_group(group, group_results, since_by_group[group], now_ms)
+    changed = _export(compact, shards)
+    metrics.finish()
+    return changed
+
+
+def write_metrics(json_path: str | None, prometheus_path: str | None) -> None:
+    """Write ``metrics`` as JSON and/or Prometheus text (atomically)."""
+    if json_path:
+        _write_metrics(json_path, metrics.to_dict())
+    if prometheus_path:
+        write_atomic(prometheus_path, metrics.to_prometheus().encode("utf-8"))
+
+
+def poll_delay(now_ms: int, next_event_ms: int | None) -> float:
+    """Seconds until the next daemon poll, shorter as the next event nears.
+
+    Uses the POLL_SCHEDULE row for the time left until ``next_event_ms``,
+    but wakes up no later than when the next, tighter row starts to apply.
+    """
+    every: float = POLL_MAX_S
+    until_tighter: float | None = None
+    if next_event_ms is not None and next_event_ms > now_ms:
+        left = next_event_ms - now_ms
+        for horizon, seconds in POLL_SCHEDULE:
+            if left <= horizon:
+                every = seconds
+                break
+            until_tighter = (left - horizon) / 1000
+    if until_tighter is not None:
+        every = min(every, until_tighter)
+    return max(POLL_MIN_S, every)
+
+
+def _next_event_ms(now_ms: int) -> int | None:
+    nxt = event_store.upcoming(now_ms, limit=1)
+    return nxt[0]["time"] if nxt else None
+
+
+def _write_metrics(path: str, data: Dict[str, Any]) -> None:
+    write_atomic(path, json.dumps(data, indent=2).encode("utf-8"))
+
+
+async def _run_hook(cmd: str) -> None:
+    """Run the on-change command; failures are logged, not raised."""
+    try:
+        proc = await asyncio.create_subprocess_shell(cmd)
+        code = await proc.wait()
+    except OSError as e:
+        print(f"[fetch_meetup] on-change hook failed: {e}")
+        return
+    if code:
+        print(f"[fetch_meetup] on-change hook exited with {code}")
+
+
+def _iso(ms: int | None) -> str | None:
+    if ms is None:
+        return None
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).isoformat()
+
+
+async def run_daemon(
+    groups: List[str],
+    token: str | None,
+    cache: Dict[str, Any],
+    full: bool = False,
+    on_change: str | None = None,
+    metrics_path: str = DAEMON_METRICS_PATH,
+    metrics_json: str | None = None,
+    prometheus_path: str | None = None,
+    compact: bool = False,
+    shards: bool = False,
+) -> int:
+    """Sync forever on the poll_delay() schedule until SIGINT/SIGTERM.
+
+    After every sync the daemon counters (with the run's stage metrics under
+    "last_run") go to ``metrics_path``, and the stage metrics alone to
+    ``metrics_json``/``prometheus_path`` as in a one-shot run.
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
         try:
-            events = fetch_api(group, token)
-        except Exception as e:
-            print(f"[fetch_meetup] API fetch failed: {e}")
-    if not events:
-        try:
-            events = fetch_ical(group)
-        except Exception as e:
-            print(f"[fetch_meetup] iCal fetch failed: {e}")
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):  # e.g. Windows
+            pass
+
+    stats: Dict[str, Any] = {
+        "started": _iso(_now_ms()),
+        "groups": groups,
+        "syncs": 0,
+        "errors": 0,
+        "changes": 0,
+        "last_sync": None,
+        "last_sync_ok": None,
+        "last_latency_s": None,
+        "last_change": None,
+        "next_poll": None,
+    }
+    async with shared_client() as client:
+        first = True
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            changed = False
+            try:
+                changed = await sync_once(
+                    groups,
+                    token,
+                    cache,
+                    full=full and first,
+                    client=client,
+                    full_every_ms=FULL_SYNC_EVERY_MS,
+                    compact=compact,
+                    shards=shards,
+                )
+                stats["last_sync_ok"] = True
+            except Exception as e:  # keep the daemon alive
+                print(f"[fetch_meetup] sync failed: {e!r}")
+                metrics.error("", "sync", e)
+                metrics.finish()
+                stats["errors"] += 1
+                stats["last_sync_ok"] = False
+            first = False
+            now_ms = _now_ms()
+            stats["syncs"] += 1
+            stats["last_sync"] = _iso(now_ms)
+            stats["last_latency_s"] = round(time.perf_counter() - t0, 3)
+            if changed:
+                stats["changes"] += 1
+                stats["last_change"] = stats["last_sync"]
+                if on_change:
+                    await _run_hook(on_change)
 
-    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-        json.dump(events, f, ensure_ascii=False, indent=2)
-    print(f"Wrote {len(events)} events to {OUTPUT_PATH}")
+            delay = poll_delay(now_ms, _next_event_ms(now_ms))
+            stats["next_poll"] = _iso(now_ms + int(delay * 1000))
+            stats["last_run"] = metrics.to_dict()
+            _write_metrics(metrics_path, stats)
+            write_metrics(metrics_json, prometheus_path)
+            print(
+                f"[fetch_meetup] daemon: sync took {stats['last_latency_s']}s, "
+                f"changed={changed}, next poll in {delay / 60:.1f} min"
+            )
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+    print("[fetch_meetup] daemon stopped")
     return 0
 
 
+def main(argv: List[str] | None = None) -> int:
+    args = _parse_args(argv)
+    groups = load_groups()
+    token = os.getenv("MEETUP_TOKEN")
+    _ensure_assets_dir()
+    cache = load_cache()
+    if args.daemon:
+        return asyncio.run(
+            run_daemon(
+                groups,
+                token,
+                cache,
+                full=args.full,
+                on_change=args.on_change,
+                metrics_json=args.metrics,
+                prometheus_path=args.prometheus,
+                compact=args.compact,
+                shards=args.shards,
+            )
+        )
+
+    try:
+        changed = asyncio.run(
+            sync_once(
+                groups,
+                token,
+                cache,
+                full=args.full,
+                compact=args.compact,
+                shards=args.shards,
+            )
+        )
+    finally:
+        metrics.finish()
+        write_metrics(args.metrics, args.prometheus)
+    if changed and args.on_change:
+        asyncio.run(_run_hook(args.on_change))
+    return 0 if changed else EXIT_UNCHANGED
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
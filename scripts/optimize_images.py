@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Build-time image optimization for assets/.
+
+For every image in IMAGES, write resized WebP and AVIF variants at the widths
+the pages actually render (1x and 2x) to assets/img/, plus
+assets/img/manifest.json, which pyzgz.images.responsive_image reads to emit
+srcset/sizes. The favicon is rewritten in place as a compact multi-resolution
+ICO. Inputs whose content hash did not change since the last run are skipped.
+
+Requires Pillow (optional, not a runtime dependency):
+    uv run --with pillow python scripts/optimize_images.py [--force]
+
+Writes:
+- assets/img/<name>-<width>.{avif,webp} and assets/img/manifest.json
+- assets/favicon.ico (only if the re-encoded icon is smaller)
+- .cache/optimize_images.json (content-hash cache, safe to delete)
+"""
+
+from __future__ import annotations
+import os
+import io
+import json
+import hashlib
+import argparse
+from typing import Any, Dict, List
+
+try:
+    from PIL import Image, features
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None  # type: ignore[assignment]
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS_DIR = os.path.join(ROOT_DIR, "assets")
+OUTPUT_DIR = os.path.join(ASSETS_DIR, "img")
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, "manifest.json")
+CACHE_DIR = os.path.join(ROOT_DIR, ".cache")
+CACHE_PATH = os.path.join(CACHE_DIR, "optimize_images.json")
+
+# Asset -> widths (CSS px x 1 and x 2) at which the pages render it
+IMAGES: Dict[str, List[int]] = {
+    "logo.png": [200, 400],  # index_page: width="200px"
+}
+# Best format first; <source> elements are emitted in this order
+FORMATS: Dict[str, Dict[str, Any]] = {
+    "avif": {"mime": "image/avif", "save": {"quality": 50}},
+    "webp": {"mime": "image/webp", "save": {"quality": 80, "method": 6}},
+}
+FAVICON = "favicon.ico"
+FAVICON_SIZES = [(16, 16), (32, 32), (48, 48)]
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _load_json(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def _saving(before: int, after: int) -> str:
+    pct = 100 * (before - after) / before if before else 0
+    return f"{before:>9,} B -> {after:>9,} B  (saved {before - after:,} B, {pct:.0f}%)"
+
+
+def optimize_image(name: str, widths: List[int]) -> Dict[str, Any]:
+    """Write the variants of assets/<name>; returns its manifest entry."""
+    stem = os.path.splitext(name)[0]
+    src_path = os.path.join(ASSETS_DIR, name)
+    original = os.path.getsize(src_path)
+    entry: Dict[str, Any] = {"sources": {}}
+    with Image.open(src_path) as im:
+        im.load()
+        entry["width"], entry["height"] = im.size
+        for fmt, spec in FORMATS.items():
+            if not features.check(fmt):
+                print(f"[optimize_images] Pillow lacks {fmt} support; skipped")
+                continue
+            variants = []
+            for w in sorted({min(w, im.width) for w in widths}):
+                h = round(im.height * w / im.width)
+                out_name = f"{stem}-{w}.{fmt}"
+                out_path = os.path.join(OUTPUT_DIR, out_name)
+                im.resize((w, h), Image.Resampling.LANCZOS).save(
+                    out_path, fmt.upper(), **spec["save"]
+                )
+                size = os.path.getsize(out_path)
+                variants.append([f"/img/{out_name}", w, size])
+                print(f"  {name} -> img/{out_name}: {_saving(original, size)}")
+            entry["sources"][spec["mime"]] = variants
+    return entry
+
+
+def optimize_favicon(path: str) -> int:
+    """Re-encode an ICO with FAVICON_SIZES only; returns the new size in bytes."""
+    with Image.open(path) as im:
+        im.load()
+        # Pillow opens the largest frame of an ICO
+        buf = io.BytesIO()
+        im.save(buf, "ICO", sizes=FAVICON_SIZES)
+    data = buf.getvalue()
+    before = os.path.getsize(path)
+    if len(data) < before:
+        with open(path, "wb") as f:
+            f.write(data)
+        print(f"  {FAVICON}: {_saving(before, len(data))}")
+        return len(data)
+    print(f"  {FAVICON}: already compact ({before:,} B)")
+    return before
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Optimize images in assets/.")
+    parser.add_argument("--force", action="store_true", help="ignore the cache")
+    args = parser.parse_args(argv)
+    if Image is None:
+        print(
+            "[optimize_images] Pillow is not installed; run with `uv run --with pillow`"
+        )
+        return 1
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    cache = {} if args.force else _load_json(CACHE_PATH)
+    manifest = _load_json(MANIFEST_PATH)
+    config = json.dumps([FORMATS, FAVICON_SIZES], sort_keys=True)
+
+    for name, widths in IMAGES.items():
+        with open(os.path.join(ASSETS_DIR, name), "rb") as f:
+            key = _sha256(f.read() + json.dumps(widths).encode() + config.encode())
+        entry = manifest.get(name)
+        outputs_exist = entry and all(
+            os.path.exists(os.path.join(ASSETS_DIR, url.lstrip("/")))
+            for variants in entry["sources"].values()
+            for url, *_ in variants
+        )
+        if cache.get(name) == key and outputs_exist:
+            print(f"  {name}: unchanged, skipped")
+            continue
+        manifest[name] = optimize_image(name, widths)
+        cache[name] = key
+
+    # The favicon is rewritten in place: skip it if it is the file we wrote
+    fav_path = os.path.join(ASSETS_DIR, FAVICON)
+    if os.path.exists(fav_path):
+        with open(fav_path, "rb") as f:
+            fav_hash = _sha256(f.read())
+        if cache.get(FAVICON) == fav_hash:
+            print(f"  {FAVICON}: unchanged, skipped")
+        else:
+            optimize_favicon(fav_path)
+            with open(fav_path, "rb") as f:
+                cache[FAVICON] = _sha256(f.read())
+
+    _write_json(MANIFEST_PATH, manifest)
+    _write_json(CACHE_PATH, cache)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
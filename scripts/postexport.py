@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Post-process the static export (`reflex export --frontend-only`) for hosting.
+
+Steps:
+- Content-hash static files the pages reference (logo, images, events.json,
+  ...): a copy named <stem>.<hash8><ext> is written next to the original and
+  every reference in HTML/JS/CSS/JSON is rewritten to it. Originals are kept
+  so external links (favicon, events.json) keep working.
+- Write .gz (and .br when the `brotli` module is available) siblings for
+  text assets, when they are smaller than the original.
+- Write cache-manifest.json (hash, size, encodings and Cache-Control per
+  file) and a `_headers` file for hosts that read it: hashed files are
+  cached for a year as immutable, HTML is revalidated on every visit and
+  other unhashed files are cached for 5 minutes.
+
+Files under assets/ are already fingerprinted by the bundler and are cached
+as immutable, unless a reference inside them had to be rewritten (their
+name no longer tracks their content, so they are revalidated instead).
+
+Usage (works locally on the export zip, no GitHub needed):
+    uv run --with brotli python scripts/postexport.py frontend.zip --out docs
+    uv run python scripts/postexport.py docs          # in place, no brotli
+
+Exit codes: 0 on success, 1 on bad input.
+"""
+
+from __future__ import annotations
+import os
+import re
+import sys
+import gzip
+import json
+import shutil
+import hashlib
+import zipfile
+import argparse
+from typing import Any, Dict, List
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MANIFEST_NAME = "cache-manifest.json"
+HEADERS_NAME = "_headers"
+
+# Directory where the bundler puts its own fingerprinted output
+BUNDLER_DIR = "assets"
+# Files whose references are rewritten and which get .gz/.br siblings
+TEXT_EXTS = {
+    ".html",
+    ".js",
+    ".mjs",
+    ".css",
+    ".json",
+    ".xml",
+    ".svg",
+    ".txt",
+    ".map",
+    ".ics",
+    ".webmanifest",
+}
+# Files that get a content-hashed copy when something references them
+HASHABLE_EXTS = {
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".webp",
+    ".avif",
+    ".svg",
+    ".ico",
+    ".json",
+    ".css",
+    ".js",
+    ".woff",
+    ".woff2",
+    ".ttf",
+    ".pdf",
+}
+# Never renamed: fetched by well-known URL or host configuration
+KEEP_NAMES = {
+    "index.html",
+    "404.html",
+    "robots.txt",
+    "sitemap.xml",
+    "CNAME",
+    # Subscribed to by calendar apps and feed readers
+    "events.ics",
+    "feed.json",
+}
+COMPRESS_MIN_BYTES = 256
+
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDATE = "public, max-age=0, must-revalidate"
+CACHE_SHORT = "public, max-age=300"
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _hashed_name(rel: str, digest: str) -> str:
+    stem, ext = os.path.splitext(rel)
+    return f"{stem}.{digest[:8]}{ext}"
+
+
+def _walk(out_dir: str) -> List[str]:
+    """Relative posix paths of every file in ``out_dir``, sorted."""
+    files = []
+    for dirpath, _dirs, names in os.walk(out_dir):
+        for name in names:
+            path = os.path.join(dirpath, name)
+            files.append(os.path.relpath(path, out_dir).replace(os.sep, "/"))
+    return sorted(files)
+
+
+def _read(out_dir: str, rel: str) -> bytes:
+    with open(os.path.join(out_dir, rel), "rb") as f:
+        return f.read()
+
+
+def _write(out_dir: str, rel: str, data: bytes) -> None:
+    with open(os.path.join(out_dir, rel), "wb") as f:
+        f.write(data)
+
+
+def prepare(src: str, out_dir: str | None) -> str:
+    """Extract a zip (or copy a directory) to ``out_dir``; returns the dir to process."""
+    if os.path.isdir(src) and out_dir is None:
+        return src
+    if out_dir is None:
+        raise ValueError("--out is required when the input is a zip file")
+    out_abs = os.path.abspath(out_dir)
+    if out_abs in (ROOT_DIR, os.path.abspath(os.sep)) or out_abs == os.getcwd():
+        raise ValueError(f"refusing to replace {out_abs}")
+    if os.path.exists(out_abs):
+        shutil.rmtree(out_abs)
+    if os.path.isdir(src):
+        shutil.copytree(src, out_abs)
+    elif zipfile.is_zipfile(src):
+        with zipfile.ZipFile(src) as zf:
+            zf.extractall(out_abs)
+    else:
+        raise ValueError(f"{src} is neither a directory nor a zip file")
+    return out_abs
+
+
+def _reference_re(paths: List[str]) -> re.Pattern[bytes]:
+    """Match root-relative references ("/logo.png") to any of ``paths``."""
+    alternatives = b"|".join(
+        re.escape(p.encode("utf-8")) for p in sorted(paths, key=len, reverse=True)
+    )
+    # Preceded by a quote, paren, space, comma or '=' and followed by the
+    # end of the URL (quote, paren, space, comma, query, fragment, escape)
+    return re.compile(rb"(?<=[\"'(\s,=])/(" + alternatives + rb")(?=[\"'\s),?#\\])")
+
+
+def fingerprint(out_dir: str, files: List[str]) -> Dict[str, Any]:
+    """Write hashed copies of referenced static files and rewrite references.
+
+    Returns {"renamed": {original: hashed}, "rewritten": [files changed]}.
+    """
+    text_files = [f for f in files if os.path.splitext(f)[1] in TEXT_EXTS]
+    candidates = [
+        f
+        for f in files
+        if os.path.splitext(f)[1] in HASHABLE_EXTS
+        and not f.startswith(BUNDLER_DIR + "/")
+        and os.path.basename(f) not in KEEP_NAMES
+    ]
+    texts = {f: _read(out_dir, f) for f in text_files}
+    if not candidates:
+        return {"renamed": {}, "rewritten": []}
+
+    # Only files something actually points at are worth a hashed copy
+    pattern = _reference_re(candidates)
+    referenced = set()
+    for data in texts.values():
+        referenced.update(m.decode("utf-8") for m in pattern.findall(data))
+
+    # Referenced files may reference each other (e.g. CSS -> image): hash
+    # leaves first so the parents' hashes cover the rewritten content
+    renamed: Dict[str, str] = {}
+    pending = sorted(referenced)
+    while pending:
+        progress = False
+        for rel in list(pending):
+            data = texts.get(rel)
+            if data is not None:
+                deps = {m.decode("utf-8") for m in pattern.findall(data)}
+                if (deps & set(pending)) - {rel}:
+                    continue
+                data = _rewrite(pattern, data, renamed)
+                texts[rel] = data
+            else:
+                data = _read(out_dir, rel)
+            hashed = _hashed_name(rel, _sha256(data))
+            _write(out_dir, hashed, data)
+            renamed[rel] = hashed
+            pending.remove(rel)
+            progress = True
+        if not progress:
+            # Reference cycle: leave the rest unhashed
+            print(f"[postexport] Reference cycle, not hashed: {', '.join(pending)}")
+            break
+
+    rewritten = []
+    for rel in text_files:
+        if rel in renamed:
+            continue
+        data = _rewrite(pattern, texts[rel], renamed)
+        if data != texts[rel]:
+            _write(out_dir, rel, data)
+            rewritten.append(rel)
+    return {"renamed": renamed, "rewritten": rewritten}
+
+
+def _rewrite(pattern: re.Pattern[bytes], data: bytes, renamed: Dict[str, str]) -> bytes:
+    def repl(m: re.Match[bytes]) -> bytes:
+        rel = m.group(1).decode("utf-8")
+        return ("/" + renamed.get(rel, rel)).encode("utf-8")
+
+    return pattern.sub(repl, data)
+
+
+def precompress(out_dir: str, rel: str, data: bytes) -> Dict[str, int]:
+    """Write .gz/.br siblings that are smaller than ``data``; returns their sizes."""
+    encodings: Dict[str, int] = {}
+    if len(data) < COMPRESS_MIN_BYTES:
+        return encodings
+    compressed = {"gzip": (".gz", gzip.compress(data, compresslevel=9, mtime=0))}
+    if brotli is not None:
+        compressed["br"] = (".br", brotli.compress(data, quality=11))
+    for encoding, (suffix, blob) in compressed.items():
+        if len(blob) < len(data):
+            _write(out_dir, rel + suffix, blob)
+            encodings[encoding] = len(blob)
+    return encodings
+
+
+def cache_control(rel: str, hashed: set, modified: set) -> str:
+    if rel.endswith(".html"):
+        return CACHE_REVALIDATE
+    if rel in hashed:
+        return CACHE_IMMUTABLE
+    if rel.startswith(BUNDLER_DIR + "/"):
+        return CACHE_REVALIDATE if rel in modified else CACHE_IMMUTABLE
+    return CACHE_SHORT
+
+
+def postprocess(out_dir: str) -> Dict[str, Any]:
+    """Fingerprint, precompress and write the cache manifest for ``out_dir``."""
+    files = _walk(out_dir)
+    if MANIFEST_NAME in files:
+        raise ValueError(f"{out_dir} was already post-processed ({MANIFEST_NAME})")
+    result = fingerprint(out_dir, files)
+    hashed = set(result["renamed"].values())
+    modified = set(result["rewritten"])
+
+    manifest: Dict[str, Any] = {"files": {}, "assets": {}}
+    for rel, hashed_rel in result["renamed"].items():
+        manifest["assets"]["/" + rel] = "/" + hashed_rel
+    totals = {"files": 0, "identity": 0, "gzip": 0, "br": 0}
+    for rel in sorted(set(files) | hashed):
+        data = _read(out_dir, rel)
+        entry: Dict[str, Any] = {
+            "sha256": _sha256(data),
+            "size": len(data),
+            "cache_control": cache_control(rel, hashed, modified),
+        }
+        if os.path.splitext(rel)[1] in TEXT_EXTS:
+            entry["encodings"] = precompress(out_dir, rel, data)
+            totals["identity"] += len(data)
+            for encoding in ("gzip", "br"):
+                totals[encoding] += entry["encodings"].get(encoding, len(data))
+        manifest["files"]["/" + rel] = entry
+        totals["files"] += 1
+
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    with open(os.path.join(out_dir, HEADERS_NAME), "w", encoding="utf-8") as f:
+        for path, entry in manifest["files"].items():
+            f.write(f"{path}\n  Cache-Control: {entry['cache_control']}\n")
+    return {**result, "totals": totals}
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Post-process the static export.")
+    parser.add_argument("src", help="export zip or directory")
+    parser.add_argument(
+        "--out", help="directory to extract/copy into (default: process src in place)"
+    )
+    args = parser.parse_args(argv)
+    try:
+        out_dir = prepare(args.src, args.out)
+        result = postprocess(out_dir)
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        print(f"[postexport] Error: {e}")
+        return 1
+
+    totals = result["totals"]
+    print(
+        f"[postexport] {len(result['renamed'])} files hashed, "
+        f"{len(result['rewritten'])} files rewritten, {totals['files']} in manifest"
+    )
+    if brotli is None:
+        print("[postexport] brotli not installed; only .gz written")
+    for encoding in ("gzip", "br"):
+        if encoding == "br" and brotli is None:
+            continue
+        before, after = totals["identity"], totals[encoding]
+        pct = 100 * (before - after) / before if before else 0
+        print(
+            f"[postexport] text assets {encoding}: {before:,} B -> {after:,} B "
+            f"({pct:.0f}% smaller)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
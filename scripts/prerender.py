@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Make sure every exported route ships its content in the HTML, and write the sitemap.
+
+Run on the export (zip or directory) before scripts/postexport.py. For
+every route registered in pyzgz/main.py:
+- find its HTML file and check that it already contains the page's content:
+  the text the page's component tree renders outside the nav and footer
+  (headings, event cards, post titles). `reflex export` prerenders routes
+  by default (--ssr), so this normally holds; without it, or when a page
+  renders its content on the client, the HTML is an empty shell until the
+  JS bundle has loaded and run. Placeholder text the client replaces
+  (layout.placeholder) does not count, and a route with nothing else to
+  check is reported as lacking content;
+- with --render, load the routes missing content in headless Chromium and
+  write the rendered document as the route's HTML. The JS bundle still
+  loads and hydrates on top of it;
+- report the time to first content (TTFC) of each route before and after:
+  modelled on a slow mobile link from the bytes the browser must download
+  before the content can show (--measure model, the default), or measured
+  in throttled headless Chromium (--measure browser).
+
+With --base-url (or PYZGZ_SITE_URL) sitemap.xml is rewritten with absolute
+URLs for every route that has an HTML file and every event detail page
+(event/<key>.html, written by scripts/build_event_feeds.py), dated by the
+last change of its event (date_modified in feed.json); Reflex's sitemap uses
+relative paths when rxconfig has no deploy_url.
+
+Chromium is optional, only for --render and --measure browser:
+    uv run --with playwright python -m playwright install chromium
+    uv run --with playwright python scripts/prerender.py docs --render
+
+Usage:
+    uv run python scripts/prerender.py frontend.zip --out docs [--base-url URL]
+    uv run python scripts/prerender.py docs              # in place
+
+Writes .cache/prerender.json (per-route report). Exit codes: 0 on success,
+1 on bad input, 2 if routes still lack content after the stage (--strict).
+"""
+
+from __future__ import annotations
+import os
+import re
+import sys
+import json
+import argparse
+import threading
+import zipfile
+from functools import partial
+from html import escape, unescape
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List
+from xml.etree.ElementTree import Element, SubElement, tostring
+
+from postexport import ROOT_DIR, prepare
+
+REPORT_PATH = os.path.join(ROOT_DIR, ".cache", "prerender.json")
+# Strings a page renders that identify its content, checked in its HTML
+MARKERS = 5
+MARKER_MIN_CHARS = 12
+# Model of a slow mobile connection (close to Chrome's "Slow 4G" preset)
+RTT_S = 0.15
+BANDWIDTH_BPS = 1.6e6 / 8
+BROWSER_TIMEOUT_MS = 30_000
+
+_TAG_RE = re.compile(rb"<[^>]+>")
+_SCRIPT_RE = re.compile(
+    rb'<(?:script[^>]+src|link[^>]+rel="modulepreload"[^>]+href)="(/[^"]+)"'
+)
+
+
+def _texts(component: Any) -> Iterator[str]:
+    """Literal strings rendered by ``component`` and its children, in order,
+    leaving out placeholders."""
+    from reflex.components.base.bare import Bare
+    from reflex.vars.sequence import LiteralStringVar
+
+    from pyzgz.layout import PLACEHOLDER_ATTR
+
+    if PLACEHOLDER_ATTR in (getattr(component, "custom_attrs", None) or {}):
+        return
+    if isinstance(component, Bare) and isinstance(component.contents, LiteralStringVar):
+        yield component.contents._var_value
+    for child in getattr(component, "children", []):
+        yield from _texts(child)
+
+
+def route_markers() -> Dict[str, List[str]]:
+    """{url path: strings that show the page's content} for every route."""
+    sys.path.insert(0, ROOT_DIR)
+    from pyzgz import layout, main
+
+    chrome = set(_texts(layout.nav())) | set(_texts(layout.footer()))
+    routes = {}
+    for path, entry in main.registered.items():
+        texts = dict.fromkeys(
+            t.strip()
+            for t in _texts(entry.page())
+            if len(t.strip()) >= MARKER_MIN_CHARS and t not in chrome
+        )
+        routes[path] = list(texts)[:MARKERS]
+    return routes
+
+
+def event_lastmods(out_dir: str) -> Dict[str, str]:
+    """{url path: sitemap lastmod} of the event detail pages in the export,
+    from the date_modified of their item in feed.json."""
+    sys.path.insert(0, ROOT_DIR)
+    from pyzgz import event_details
+
+    try:
+        with open(os.path.join(out_dir, "feed.json"), "r", encoding="utf-8") as f:
+            feed = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    items = feed.get("items") if isinstance(feed, dict) else None
+    lastmods = {}
+    for item in items or []:
+        try:
+            path, lastmod = event_details.detail_url(item["id"]), item["date_modified"]
+        except (KeyError, TypeError):
+            continue
+        if os.path.isfile(os.path.join(out_dir, path.lstrip("/"))):
+            lastmods[path] = lastmod
+    return lastmods
+
+
+def _ms(seconds: float | None) -> str:
+    return "n/a" if seconds is None else f"{seconds * 1000:.0f} ms"
+
+
+def html_file(out_dir: str, path: str) -> str | None:
+    """The exported HTML of ``path`` (route/index.html or route.html)."""
+    rel = path.strip("/")
+    candidates = [os.path.join(rel, "index.html"), f"{rel}.html"] if rel else []
+    for candidate in candidates or ["index.html"]:
+        full = os.path.join(out_dir, candidate)
+        if os.path.isfile(full):
+            return full
+    return None
+
+
+def content_offset(html: bytes, markers: List[str]) -> int | None:
+    """Bytes of ``html`` up to the end of the first marker found; None if none is."""
+    offsets = []
+    for marker in markers:
+        # Text nodes are HTML-escaped; match either form
+        for form in {marker, escape(marker, quote=False)}:
+            i = html.find(form.encode("utf-8"))
+            if i >= 0:
+                offsets.append(i + len(form.encode("utf-8")))
+    return min(offsets) if offsets else None
+
+
+def _visible_text(html: bytes) -> str:
+    return unescape(_TAG_RE.sub(b" ", html).decode("utf-8", "replace"))
+
+
+def modelled_ttfc(out_dir: str, html: bytes, markers: List[str]) -> float:
+    """Seconds to first content on the RTT_S/BANDWIDTH_BPS link.
+
+    Content in the HTML shows once the bytes up to it have arrived. Otherwise
+    it waits for the whole HTML, then for the scripts it references (fetched
+    in parallel, one more round trip) before they render it.
+    """
+    offset = content_offset(html, markers)
+    # DNS/TCP/TLS setup plus the request itself
+    ttfc = 2 * RTT_S
+    if offset is not None:
+        return ttfc + offset / BANDWIDTH_BPS
+    scripts = 0
+    for src in dict.fromkeys(_SCRIPT_RE.findall(html)):
+        path = os.path.join(out_dir, src.decode().lstrip("/"))
+        if os.path.isfile(path):
+            scripts += os.path.getsize(path)
+    return ttfc + RTT_S + (len(html) + scripts) / BANDWIDTH_BPS
+
+
+class _Handler(SimpleHTTPRequestHandler):
+    """Static server resolving /route to route.html as hosts like Pages do."""
+
+    def translate_path(self, path: str) -> str:
+        full = super().translate_path(path)
+        if not os.path.exists(full) and os.path.isfile(f"{full}.html"):
+            return f"{full}.html"
+        return full
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class _Server:
+    def __init__(self, out_dir: str) -> None:
+        handler = partial(_Handler, directory=out_dir)
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        host, port = self.httpd.server_address[:2]
+        self.url = f"http://{host}:{port}"
+
+    def __enter__(self) -> "_Server":
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _playwright():
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        raise RuntimeError(
+            "playwright is not installed; run with "
+            "`uv run --with playwright` after `python -m playwright install chromium`"
+        ) from None
+    return sync_playwright
+
+
+def _wait_for_markers(page: Any, markers: List[str]) -> float:
+    """Seconds since navigation start until a marker is in the document."""
+    page.wait_for_function(
+        "markers => markers.some(m => document.body && document.body.innerText.includes(m))",
+        arg=markers,
+        timeout=BROWSER_TIMEOUT_MS,
+        polling=16,
+    )
+    return page.evaluate("performance.now()") / 1000
+
+
+def render(out_dir: str, paths: Dict[str, List[str]]) -> Dict[str, str]:
+    """Render ``paths`` in headless Chromium; {path: rendered HTML}."""
+    rendered = {}
+    with _Server(out_dir) as server, _playwright()() as pw:
+        browser = pw.chromium.launch()
+        page = browser.new_page()
+        for path, markers in paths.items():
+            page.goto(server.url + path, wait_until="networkidle")
+            if markers:
+                _wait_for_markers(page, markers)
+            rendered[path] = page.content()
+        browser.close()
+    return rendered
+
+
+def measure(out_dir: str, paths: Dict[str, List[str]]) -> Dict[str, float | None]:
+    """TTFC of ``paths`` in headless Chromium on a throttled connection."""
+    results: Dict[str, float | None] = {}
+    with _Server(out_dir) as server, _playwright()() as pw:
+        browser = pw.chromium.launch()
+        for path, markers in paths.items():
+            context = browser.new_context()
+            page = context.new_page()
+            cdp = context.new_cdp_session(page)
+            cdp.send(
+                "Network.emulateNetworkConditions",
+                {
+                    "offline": False,
+                    "latency": RTT_S * 1000,
+                    "downloadThroughput": BANDWIDTH_BPS,
+                    "uploadThroughput": BANDWIDTH_BPS,
+                },
+            )
+            cdp.send("Network.setCacheDisabled", {"cacheDisabled": True})
+            page.goto(server.url + path, wait_until="commit")
+            try:
+                results[path] = _wait_for_markers(page, markers) if markers else None
+            except Exception:
+                results[path] = None
+            context.close()
+        browser.close()
+    return results
+
+
+def write_sitemap(
+    out_dir: str, base_url: str, paths: List[str], lastmods: Dict[str, str]
+) -> str:
+    urlset = Element("urlset", xmlns="http://www.sitemaps.org/schemas/sitemap/0.9")
+    for path in sorted(paths):
+        url = SubElement(urlset, "url")
+        SubElement(url, "loc").text = base_url.rstrip("/") + path
+        if path in lastmods:
+            SubElement(url, "lastmod").text = lastmods[path]
+    data = b'<?xml version="1.0" encoding="UTF-8"?>\n' + tostring(urlset) + b"\n"
+    target = os.path.join(out_dir, "sitemap.xml")
+    with open(target, "wb") as f:
+        f.write(data)
+    return target
+
+
+def _ttfc(out_dir: str, paths: Dict[str, List[str]], mode: str) -> Dict[str, Any]:
+    if mode == "browser":
+        return measure(out_dir, paths)
+    ttfc = {}
+    for path, markers in paths.items():
+        target = html_file(out_dir, path)
+        if target is not None:
+            with open(target, "rb") as f:
+                ttfc[path] = modelled_ttfc(out_dir, f.read(), markers)
+    return ttfc
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Prerender check and sitemap.")
+    parser.add_argument("src", help="export zip or directory")
+    parser.add_argument("--out", help="directory to extract/copy into")
+    parser.add_argument(
+        "--render", action="store_true", help="render routes missing content"
+    )
+    parser.add_argument("--force", action="store_true", help="render every route")
+    parser.add_argument("--measure", choices=["model", "browser"], default="model")
+    parser.add_argument("--base-url", default=os.getenv("PYZGZ_SITE_URL"))
+    parser.add_argument(
+        "--strict", action="store_true", help="exit 2 if a route lacks content"
+    )
+    args = parser.parse_args(argv)
+    try:
+        out_dir = prepare(args.src, args.out)
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        print(f"[prerender] Error: {e}")
+        return 1
+
+    routes = route_markers()
+    missing_file = [p for p in routes if html_file(out_dir, p) is None]
+    for path in missing_file:
+        print(f"[prerender] {path}: no HTML file in the export")
+    exported = {p: m for p, m in routes.items() if p not in missing_file}
+
+    def lacking() -> Dict[str, List[str]]:
+        out = {}
+        for path, markers in exported.items():
+            with open(html_file(out_dir, path), "rb") as f:  # type: ignore[arg-type]
+                html = f.read()
+            if args.force or not markers or content_offset(html, markers) is None:
+                out[path] = markers
+        return out
+
+    before = _ttfc(out_dir, exported, args.measure)
+    todo = lacking()
+    if todo:
+        print(f"[prerender] {len(todo)} routes without content: {', '.join(todo)}")
+    if todo and args.render:
+        try:
+            for path, html in render(out_dir, todo).items():
+                with open(html_file(out_dir, path), "w", encoding="utf-8") as f:  # type: ignore[arg-type]
+                    f.write(html)
+        except Exception as e:
+            print(f"[prerender] Error: cannot render: {e}")
+            return 1
+        todo = {p: m for p, m in lacking().items() if not args.force}
+    after = _ttfc(out_dir, exported, args.measure) if args.render else before
+
+    report: Dict[str, Any] = {"measure": args.measure, "routes": {}}
+    print(f"[prerender] time to first content ({args.measure}):")
+    for path in exported:
+        b, a = before.get(path), after.get(path)
+        report["routes"][path] = {
+            "markers": exported[path],
+            "content_in_html": path not in todo,
+            "ttfc_before_s": b,
+            "ttfc_after_s": a,
+        }
+        print(f"  {path:<28} {_ms(b):>9} -> {_ms(a):>9}")
+    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+    with open(REPORT_PATH, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.base_url:
+        events = event_lastmods(out_dir)
+        paths = list(exported) + list(events)
+        target = write_sitemap(out_dir, args.base_url, paths, events)
+        print(
+            f"[prerender] wrote {target} ({len(exported)} routes, "
+            f"{len(events)} event pages)"
+        )
+    else:
+        print("[prerender] no --base-url/PYZGZ_SITE_URL; sitemap.xml left as is")
+    if todo:
+        print(f"[prerender] still without content: {', '.join(todo)}")
+        return 2 if args.strict else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
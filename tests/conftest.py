@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# pyzgz and the scripts (fetch_meetup, ...) import like they do when run
+for path in (ROOT_DIR, os.path.join(ROOT_DIR, "scripts")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """An empty event store in ``tmp_path``."""
+    from pyzgz import event_store
+
+    monkeypatch.setenv("PYZGZ_DB_URL", f"sqlite:///{tmp_path / 'events.db'}")
+    event_store.get_engine.cache_clear()
+    yield
+    event_store.get_engine.cache_clear()
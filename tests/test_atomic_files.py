@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+from pyzgz.atomic_files import atomic_open, write_atomic
+
+
+def test_replaces_the_file_and_keeps_its_mode(tmp_path):
+    path = tmp_path / "events.json"
+    write_atomic(str(path), b"[]")
+    assert os.stat(path).st_mode & 0o777 == 0o644
+    os.chmod(path, 0o600)
+    write_atomic(str(path), b"[1]")
+    assert path.read_bytes() == b"[1]"
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+
+def test_an_error_leaves_the_old_file(tmp_path):
+    path = tmp_path / "events.json"
+    path.write_bytes(b"[]")
+    with pytest.raises(RuntimeError):
+        with atomic_open(str(path), "wb") as f:
+            f.write(b"[1, 2")
+            raise RuntimeError("interrupted")
+    assert path.read_bytes() == b"[]"
+    assert os.listdir(tmp_path) == ["events.json"]
+
+
+def test_creates_missing_directories(tmp_path):
+    path = tmp_path / "data" / "events-index.json"
+    with atomic_open(str(path), encoding="utf-8") as f:
+        f.write("{}")
+    assert path.read_text() == "{}"
@@ -0,0 +1,126 @@
+import json
+import os
+
+import pytest
+
+from pyzgz import blog_page
+
+POST = """---
+title: "Nix your python mess"
+author: Ada
+tags: [nix, packaging]
+---
+
+Entornos **reproducibles** con [Nix](https://nixos.org).
+
+## Más
+"""
+
+
+@pytest.fixture
+def blog(tmp_path, monkeypatch):
+    """An empty blog/ and post cache in ``tmp_path``."""
+    monkeypatch.setattr(blog_page, "BLOG_DIR", str(tmp_path / "blog"))
+    monkeypatch.setattr(blog_page, "CACHE_PATH", str(tmp_path / "blog_posts.json"))
+    monkeypatch.setattr(blog_page, "_posts_cache", None)
+    os.makedirs(tmp_path / "blog")
+    return tmp_path / "blog"
+
+
+def test_front_matter_values():
+    meta, body = blog_page._split_front_matter(
+        "\ufeff---\ntitle: 'Hola: mundo'\n# comment\n\nDraft: TRUE\ntags: [a, 'b', ]\n---\n\nTexto\n"
+    )
+    assert meta == {"title": "Hola: mundo", "draft": True, "tags": ["a", "b"]}
+    assert body == "Texto"
+
+
+@pytest.mark.parametrize(
+    "text, error",
+    [
+        ("title: x\n", "missing front matter"),
+        ("---\ntitle: x\n", "not closed"),
+        ("---\njust text\n---\n", "line 2"),
+    ],
+)
+def test_malformed_front_matter(text, error):
+    with pytest.raises(ValueError, match=error):
+        blog_page._split_front_matter(text)
+
+
+def test_parse_post_defaults_from_the_file_name():
+    post = blog_page.parse_post("2025-04-24-nix.md", POST, "sha")
+    assert (post.slug, post.date, post.author) == ("nix", "2025-04-24", "Ada")
+    assert post.tags == ("nix", "packaging")
+    assert post.summary == "Entornos reproducibles con Nix."
+    assert blog_page.parse_post("x.md", "---\ntitle: x\ndraft: true\n---\n", "") is None
+
+
+@pytest.mark.parametrize(
+    "name, text, error",
+    [
+        ("2025-01-01-a.md", "---\nauthor: x\n---\n", "'title' is required"),
+        ("sin-fecha.md", "---\ntitle: x\n---\n", "'date' is required"),
+        ("2025-13-01-a.md", "---\ntitle: x\n---\n", "not a yyyy-mm-dd"),
+        ("2025-01-01-page.md", "---\ntitle: x\n---\n", "invalid slug"),
+        ("2025-01-01-a.md", "---\ntitle: x\nslug: Con Espacios\n---\n", "invalid slug"),
+    ],
+)
+def test_invalid_posts(name, text, error):
+    with pytest.raises(ValueError, match=error):
+        blog_page.parse_post(name, text, "")
+
+
+def _load():
+    blog_page._posts_cache = None  # as in a new build process
+    return blog_page._load_posts()
+
+
+def test_posts_are_parsed_only_when_their_content_changes(blog):
+    for day in range(1, 4):
+        (blog / f"2025-01-0{day}-post-{day}.md").write_text(POST)
+    (blog / "_plantilla.md").write_text(POST)
+    (blog / "2025-01-09-roto.md").write_text("sin front matter")
+
+    posts = _load()
+    assert [p.slug for p in posts] == ["post-3", "post-2", "post-1"]
+    assert blog_page.blog_stats == {"posts": 3, "parsed": 3, "reused": 0}
+    with open(blog_page.CACHE_PATH, encoding="utf-8") as f:
+        cache = json.load(f)
+    assert cache["version"] == blog_page.CACHE_VERSION
+    assert sorted(cache["files"]) == [f"2025-01-0{d}-post-{d}.md" for d in (1, 2, 3)]
+
+    assert _load() == posts
+    assert blog_page.blog_stats == {"posts": 3, "parsed": 0, "reused": 3}
+
+    # Same content, new stat: read and hashed again, not parsed
+    os.utime(blog / "2025-01-01-post-1.md", ns=(0, 0))
+    assert _load() == posts
+    assert blog_page.blog_stats["parsed"] == 0
+
+    (blog / "2025-01-02-post-2.md").write_text(POST.replace("Ada", "Grace"))
+    posts = _load()
+    assert blog_page.blog_stats == {"posts": 3, "parsed": 1, "reused": 2}
+    assert posts[1].author == "Grace"
+
+
+def test_corrupt_cache_is_rebuilt(blog):
+    (blog / "2025-01-01-a.md").write_text(POST)
+    with open(blog_page.CACHE_PATH, "w", encoding="utf-8") as f:
+        f.write('{"version": 1, "files": {"2025-01-01-a.md": {"post": {"slug": 1}}}}')
+    assert [p.slug for p in _load()] == ["a"]
+    assert blog_page.blog_stats["parsed"] == 1
+
+
+def test_duplicate_slug_keeps_the_newest(blog):
+    (blog / "2025-01-01-a.md").write_text(POST)
+    (blog / "2025-02-01-b.md").write_text(POST.replace("---\n\n", "slug: a\n---\n\n"))
+    [post] = _load()
+    assert post.date == "2025-02-01"
+
+
+def test_removed_post_page_is_not_found(blog):
+    (blog / "2025-01-01-a.md").write_text(POST)
+    [(_, page, _)] = [r for r in blog_page.blog_pages() if r[0] == "/blog/a"]
+    os.remove(blog / "2025-01-01-a.md")
+    assert "Entrada no encontrada" in str(page())
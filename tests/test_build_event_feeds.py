@@ -0,0 +1,74 @@
+import json
+import os
+
+import pytest
+
+import build_event_feeds
+import prerender
+from pyzgz import event_details, event_store
+
+START_MS = 1_700_000_000_000
+DAY_MS = 24 * 3600 * 1000
+
+
+pytestmark = pytest.mark.usefixtures("store")
+
+
+@pytest.fixture
+def out(tmp_path, monkeypatch):
+    """Point the feeds, pages and manifest at ``tmp_path``."""
+    monkeypatch.setattr(build_event_feeds, "ICS_PATH", str(tmp_path / "events.ics"))
+    monkeypatch.setattr(build_event_feeds, "FEED_PATH", str(tmp_path / "feed.json"))
+    monkeypatch.setattr(build_event_feeds, "PAGES_DIR", str(tmp_path / "event"))
+    monkeypatch.setattr(
+        build_event_feeds, "MANIFEST_PATH", str(tmp_path / "event_feeds.json")
+    )
+    return tmp_path
+
+
+def _event(i, name=None):
+    return {
+        "name": name or f"Charla {i}",
+        "link": f"https://www.meetup.com/python_zgz/events/{1000 + i}/",
+        "time": START_MS - i * DAY_MS,
+    }
+
+
+def _feed(out):
+    with open(out / "feed.json", encoding="utf-8") as f:
+        return {item["id"]: item for item in json.load(f)["items"]}
+
+
+def test_pages_are_rendered_only_when_their_event_changes(out):
+    event_store.upsert_events([_event(i) for i in range(3)])
+    stats = build_event_feeds.build("https://example.org")
+    assert (stats["rendered"], stats["reused"]) == (3, 0)
+    assert sorted(os.listdir(out / "event")) == ["1000.html", "1001.html", "1002.html"]
+    before = _feed(out)
+
+    event_store.upsert_events([_event(1, "Charla renombrada")])
+    stats = build_event_feeds.build("https://example.org")
+    assert (stats["rendered"], stats["reused"]) == (1, 2)
+    assert "Charla renombrada" in (out / "event" / "1001.html").read_text()
+    after = _feed(out)
+    assert after["1000"]["date_modified"] == before["1000"]["date_modified"]
+    assert after["1001"]["date_modified"] >= before["1001"]["date_modified"]
+
+
+def test_missing_and_stale_pages(out):
+    event_store.upsert_events([_event(i) for i in range(2)])
+    build_event_feeds.build("")
+    os.remove(out / "event" / "1000.html")
+    (out / "event" / "999.html").write_text("gone")
+    stats = build_event_feeds.build("")
+    assert (stats["rendered"], stats["reused"]) == (1, 1)
+    assert sorted(os.listdir(out / "event")) == ["1000.html", "1001.html"]
+
+
+def test_sitemap_lastmod_of_event_pages(out):
+    event_store.upsert_events([_event(i) for i in range(2)])
+    build_event_feeds.build("https://example.org")
+    os.remove(out / "event" / "1001.html")  # not exported: not in the sitemap
+    lastmods = prerender.event_lastmods(str(out))
+    feed = _feed(out)
+    assert lastmods == {event_details.detail_url("1000"): feed["1000"]["date_modified"]}
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+import build_search_index
+from build_search_index import build_index, fit_budget, fold, search, tokenize
+
+DOCS = [
+    ("Introducción a Pandas", "/event/1.html", "ene 2026", "evento", "Etopia"),
+    ("Python en la educación", "/blog/educacion", "", "post", "Pandas en clase"),
+    ("Comunidad", "/comunidad", "", "pagina", "Código de conducta"),
+]
+
+
+def test_fold_lowercases_and_strips_accents():
+    assert fold("Introducción Ñandú PYTHON") == "introduccion nandu python"
+
+
+def test_tokenize_drops_stopwords_and_single_letters():
+    assert tokenize("La introducción a R y a Python") == ["introduccion", "python"]
+
+
+def test_search_folds_queries_and_ranks_title_hits_first():
+    index = build_index(DOCS)
+    assert [url for _, url, _, _ in search(index, "pandas")] == [
+        "/event/1.html",
+        "/blog/educacion",
+    ]
+    assert [url for _, url, _, _ in search(index, "EDUCACIÓN")] == ["/blog/educacion"]
+    assert [url for _, url, _, _ in search(index, "cod")] == ["/comunidad"]
+    assert search(index, "pandas comunidad") == []
+
+
+def test_body_terms_are_cut_to_fit_the_budget():
+    body = " ".join(f"termino{i}" for i in range(1000))
+    docs = [("Charla", "/event/1.html", "", "evento", body)]
+    full = len(build_search_index.dump(build_index(docs)))
+    index, data, limit = fit_budget(docs, full - 1)
+    assert limit == 400
+    assert len(data) <= full - 1
+    assert json.loads(data) == index
+    assert search(index, "termino399") and not search(index, "termino400")
+    _, _, limit = fit_budget(docs, len(build_search_index.dump(build_index(docs, 0))))
+    assert limit == 0
+
+
+def test_budget_too_small_for_titles_raises():
+    with pytest.raises(ValueError):
+        fit_budget(DOCS, 100)
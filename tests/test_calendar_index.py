@@ -0,0 +1,46 @@
+import json
+
+from pyzgz import calendar_index, event_store
+
+LINK = "https://www.meetup.com/python_zgz/events/{}/"
+
+
+def _event(id, time, name="Charla"):
+    return {"name": name, "link": LINK.format(id), "time": time}
+
+
+EVENTS = [
+    _event(3, 1768500000000, "Python y datos"),  # 2026-01-15 19:00 Madrid
+    _event(2, 1735687800000),  # 2024-12-31 23:30 UTC, 2025-01-01 in Madrid
+    _event(1, 1735660800000, "Antes"),  # 2024-12-31 17:00 Madrid
+    {"name": "Sin fecha", "link": LINK.format(4)},
+]
+
+
+def test_build_buckets_by_local_month_in_start_order():
+    index = calendar_index.build(EVENTS)
+    assert index["tz"] == "Europe/Madrid"
+    assert index["counts"] == {"2024-12": 1, "2025-01": 1, "2026-01": 1}
+    assert calendar_index.month_rows(index, 2025, 1) == [[1, "00:30", "Charla", "2"]]
+    assert calendar_index.month_rows(index, 2026, 1) == [
+        [15, "19:00", "Python y datos", "3"]
+    ]
+    assert calendar_index.month_rows(index, 2025, 2) == []
+
+
+def test_rows_link_to_the_event_key():
+    ev = {"name": "Sin id", "link": "https://example.org/charla", "time": 1}
+    [[_, _, _, key]] = calendar_index.build([ev])["months"]["1970-01"]
+    assert key == event_store.event_key(ev)
+
+
+def test_load_round_trips_and_rejects_invalid_files(tmp_path):
+    path = tmp_path / "calendar-index.json"
+    assert calendar_index.load(str(path)) is None
+    index = calendar_index.build(EVENTS)
+    path.write_bytes(calendar_index.dumps(index))
+    assert calendar_index.load(str(path)) == index
+    path.write_text(json.dumps({**index, "v": 0}) + " ")
+    assert calendar_index.load(str(path)) is None
+    path.write_text("{")
+    assert calendar_index.load(str(path)) is None
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from pyzgz.event_schema import validate_events, validate_events_json
+
+GOOD = {"name": "Charla", "link": "https://www.meetup.com/x/events/1/", "time": 1}
+OLD = {"title": "Charla", "url": "https://example.org", "date": "2019-05-01"}
+
+
+def test_valid_records_pass_in_one_strict_pass():
+    valid, invalid = validate_events([GOOD, OLD])
+    assert valid == [GOOD, OLD]
+    assert invalid == []
+
+
+def test_invalid_records_are_dropped_and_reported():
+    records = [GOOD, {"name": "Charla", "time": "pronto"}, "no", OLD]
+    valid, invalid = validate_events(records)
+    assert valid == [GOOD, OLD]
+    assert [i for i, _ in invalid] == [1, 2]
+    assert invalid[0][1].startswith("time: ")
+
+
+def test_unknown_keys_are_dropped():
+    valid, invalid = validate_events([{**GOOD, "rsvps": 12}])
+    assert valid == [GOOD]
+    assert invalid == []
+
+
+def test_json_is_validated_in_the_same_way():
+    raw = json.dumps([GOOD, {"venue": 3}])
+    valid, invalid = validate_events_json(raw)
+    assert valid == [GOOD]
+    assert [i for i, _ in invalid] == [1]
+
+
+@pytest.mark.parametrize("data", [{"events": []}, None, "[]"])
+def test_not_a_list_raises(data):
+    with pytest.raises(ValueError):
+        validate_events(data)
+
+
+@pytest.mark.parametrize("raw", [b'[{"name": "Char', b"{}", b""])
+def test_truncated_or_non_list_json_raises(raw):
+    with pytest.raises(ValueError):
+        validate_events_json(raw)
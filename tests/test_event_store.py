@@ -0,0 +1,43 @@
+import pytest
+
+from pyzgz import event_store
+
+LINK = "https://www.meetup.com/python_zgz/events/123/"
+
+
+pytestmark = pytest.mark.usefixtures("store")
+
+
+def _event(**fields):
+    return {"name": "Charla", "link": LINK, "time": 1_768_500_000_000, **fields}
+
+
+def test_api_record_clears_removed_venue():
+    event_store.upsert_events(
+        [_event(venue={"name": "Etopia"}, description="Charla de Python")]
+    )
+    event_store.upsert_events([_event(venue=None, description=None)])
+    (ev,) = event_store.all_events()
+    assert ev["venue"] is None
+    assert ev["description"] is None
+
+
+def test_partial_record_keeps_stored_fields():
+    event_store.upsert_events(
+        [_event(venue={"name": "Etopia"}, description="Charla de Python")]
+    )
+    # The iCal feed has no description
+    event_store.upsert_events(
+        [_event(name="Charla (nueva hora)", venue={"name": "Etopia"})], partial=True
+    )
+    (ev,) = event_store.all_events()
+    assert ev["name"] == "Charla (nueva hora)"
+    assert ev["description"] == "Charla de Python"
+
+
+def test_sync_events_counts_partial_records_as_seen():
+    other = "https://www.meetup.com/python_zgz/events/456/"
+    event_store.upsert_events([_event(), _event(link=other)])
+    removed = event_store.sync_events([], None, partial=[_event(link=other)])
+    assert removed == 1
+    assert [ev["link"] for ev in event_store.all_events()] == [other]
@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from pyzgz import event_details, event_store, events_page
+
+DAY_MS = 24 * 3600 * 1000
+NOW_MS = int(datetime.now(timezone.utc).timestamp() * 1000)
+
+
+pytestmark = pytest.mark.usefixtures("store")
+
+
+def _events(n, groups=("python_zgz", "pydata_zgz")):
+    """``n`` past events, one a day back from today, plus one upcoming."""
+    return [
+        {
+            "name": f"Charla {i}",
+            "link": f"https://www.meetup.com/python_zgz/events/{1000 + i}/",
+            "time": NOW_MS + (DAY_MS if i == 0 else -i * DAY_MS),
+            "group": groups[i % len(groups)],
+        }
+        for i in range(n + 1)
+    ]
+
+
+def _years(events):
+    return {
+        datetime.fromtimestamp(ev["time"] / 1000, tz=events_page.SITE_TZ).year
+        for ev in events
+        if ev["time"] < NOW_MS
+    }
+
+
+@pytest.mark.parametrize("n", [30, 3000])
+def test_route_count_is_bounded_by_years_and_groups(n):
+    events = _events(n)
+    event_store.upsert_events(events)
+    routes = [route for route, *_ in events_page.archive_pages()]
+
+    pages = min(-(-n // events_page.PAST_PER_PAGE), events_page.MAX_PAST_PAGES)
+    # /events/page/2.., one per year, calendar, one per group; event detail
+    # pages are static files, not routes
+    assert len(routes) == (pages - 1) + len(_years(events)) + 1 + 2
+    assert len(routes) <= events_page.MAX_PAST_PAGES + len(_years(events)) + 2
+    assert not [r for r in routes if r.startswith(f"/{event_details.DETAIL_DIR}/")]
+
+
+def test_detail_page_has_the_event_in_the_html():
+    html = event_details.page(
+        "Charla <Python>",
+        "17 Dec 2025, 17:30",
+        "Etopia",
+        None,
+        "https://www.meetup.com/python_zgz/events/312391398/",
+        event_details.plain_text("<p>Uno</p><p>Dos &amp; tres</p>"),
+        canonical="https://example.org/event/312391398.html",
+    )
+    assert "<h1>Charla &lt;Python&gt;</h1>" in html
+    assert "<p>Etopia</p>" in html
+    assert "<p>Uno</p>\n<p>Dos &amp; tres</p>" in html
+    assert 'href="https://www.meetup.com/python_zgz/events/312391398/"' in html
+    assert (
+        '<link rel="canonical" href="https://example.org/event/312391398.html">' in html
+    )
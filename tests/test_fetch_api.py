@@ -0,0 +1,149 @@
+import asyncio
+import hashlib
+import json
+
+import httpx
+import pytest
+
+import fetch_meetup
+from pyzgz import event_store
+
+GROUP = "python_zgz"
+START_MS = 1_700_000_000_000
+DAY_MS = 24 * 3600 * 1000
+
+
+class MockApi:
+    """Meetup's events listing, ``page`` events per offset, newest first.
+
+    Optionally with a Link header, X-Total-Count (or a wrong one) and
+    ETags; the group's iCal feed is empty.
+    """
+
+    def __init__(
+        self, n, cancelled=(), link=False, total=None, etag=False, listed=None
+    ):
+        self.events = [
+            {
+                "name": f"Charla {i}",
+                "link": f"https://www.meetup.com/{GROUP}/events/{1000 + i}/",
+                "time": START_MS - i * DAY_MS,
+                "status": "cancelled" if i in cancelled else "past",
+            }
+            for i in range(n)
+        ]
+        self.link = link
+        self.total = total
+        self.etag = etag
+        self.listed = listed  # serve only the first ``listed`` events
+        self.offsets = []
+
+    def __call__(self, request):
+        if "/ical/" in request.url.path:
+            return httpx.Response(200, text="BEGIN:VCALENDAR\r\nEND:VCALENDAR\r\n")
+        size = int(request.url.params["page"])
+        offset = int(request.url.params["offset"])
+        self.offsets.append(offset)
+        events = self.events[: self.listed]
+        body = json.dumps(events[offset * size : (offset + 1) * size]).encode()
+        headers = {}
+        if self.total is not None:
+            headers["X-Total-Count"] = str(self.total)
+        if self.link and (offset + 1) * size < len(events):
+            headers["Link"] = f'<{request.url}&next=1>; rel="next"'
+        if self.etag:
+            headers["ETag"] = f'"{hashlib.sha256(body).hexdigest()}"'
+            if request.headers.get("If-None-Match") == headers["ETag"]:
+                return httpx.Response(304, headers=headers)
+        return httpx.Response(200, content=body, headers=headers)
+
+
+def _client(api):
+    return httpx.AsyncClient(transport=httpx.MockTransport(api))
+
+
+def _list(api, cache=None, page_size=10, concurrency=4):
+    async def run():
+        async with _client(api) as client:
+            return [
+                ev
+                async for ev in fetch_meetup.iter_api_events(
+                    client,
+                    GROUP,
+                    "token",
+                    cache,
+                    concurrency=concurrency,
+                    page_size=page_size,
+                )
+            ]
+
+    return asyncio.run(run())
+
+
+def test_link_header_pagination():
+    api = MockApi(25, link=True)
+    assert len(_list(api)) == 25
+
+
+def test_cancelled_event_does_not_end_pagination():
+    # Page 0 keeps 9 of its 10 events; it is still a full page
+    api = MockApi(25, cancelled={3})
+    assert len(_list(api, concurrency=1)) == 24
+    assert api.offsets == [0, 1, 2]
+
+
+def test_total_count_pagination():
+    api = MockApi(25, total=25)
+    assert len(_list(api)) == 25
+    assert sorted(api.offsets) == [0, 1, 2]
+
+
+def test_short_last_page_ends_pagination():
+    api = MockApi(20, cancelled={15})
+    assert len(_list(api, concurrency=1)) == 19
+    # Page 1 is full; page 2 comes back empty
+    assert api.offsets == [0, 1, 2]
+
+
+def test_304_page_keeps_its_pagination():
+    api = MockApi(25, cancelled={3}, etag=True)
+    cache = {}
+    first = _list(api, cache, concurrency=1)
+    api.offsets.clear()
+    assert _list(api, cache, concurrency=1) == first
+    assert api.offsets == [0, 1, 2]
+
+
+def test_fewer_events_than_total_count_is_incomplete():
+    api = MockApi(25, total=30)
+    with pytest.raises(fetch_meetup.IncompleteListing):
+        _list(api)
+
+
+def _full_sync(api, cache):
+    async def fetch():
+        async with _client(api) as client:
+            return await fetch_meetup.fetch_groups(
+                [GROUP], "token", cache, {GROUP: None}, client=client
+            )
+
+    results = asyncio.run(fetch())
+    fetch_meetup._sync_group(GROUP, results[GROUP], None, START_MS + DAY_MS)
+
+
+@pytest.mark.usefixtures("store")
+def test_full_sync_after_304_keeps_every_event():
+    # The default page size; the first page has a cancelled event
+    api = MockApi(450, cancelled={3}, etag=True)
+    cache = {}
+    _full_sync(api, cache)
+    assert event_store.count() == 449
+    _full_sync(api, cache)
+    assert event_store.count() == 449
+
+
+@pytest.mark.usefixtures("store")
+def test_incomplete_full_sync_prunes_nothing():
+    _full_sync(MockApi(450), {})
+    _full_sync(MockApi(450, total=450, listed=200), {})
+    assert event_store.count() == 450
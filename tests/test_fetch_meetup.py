@@ -0,0 +1,129 @@
+import json
+import os
+
+import pytest
+
+import fetch_meetup
+from fetch_meetup import HOUR_MS, POLL_MAX_S, POLL_MIN_S
+from pyzgz import event_store
+
+FEED = "\r\n".join(
+    [
+        "BEGIN:VCALENDAR",
+        "BEGIN:VEVENT",
+        r"SUMMARY:Python\, datos\; y C:\\temp",
+        "DTSTART;TZID=Europe/Madrid:20260115T190000",
+        "URL:https://www.meetup.com/python_zgz/events/123/",
+        r"LOCATION:Etopia\, Av. de la Autonomía 7\nZaragoza",
+        "END:VEVENT",
+        "END:VCALENDAR",
+    ]
+)
+
+NOW_MS = 1767225600000  # 2026-01-01T00:00Z
+
+
+def _event(id, time, **fields):
+    link = f"https://www.meetup.com/python_zgz/events/{id}/"
+    return {"name": f"Charla {id}", "link": link, "time": time, **fields}
+
+
+def test_ical_text_values_are_unescaped():
+    (ev,) = fetch_meetup.iter_ical_events(FEED.splitlines())
+    assert ev["name"] == "Python, datos; y C:\\temp"
+    assert ev["venue"] == {"name": "Etopia, Av. de la Autonomía 7\nZaragoza"}
+    # 19:00 in Madrid (CET) is 18:00 UTC
+    assert ev["time"] == 1768500000000
+
+
+def test_ical_text_without_escapes_is_unchanged():
+    assert fetch_meetup._ical_text("Sala 1") == "Sala 1"
+    assert fetch_meetup._ical_text(None) is None
+
+
+def test_merge_keeps_the_richer_record_in_first_position():
+    ical = [_event(1, NOW_MS), _event(2, NOW_MS)]
+    api = [_event(2, NOW_MS, venue={"name": "Etopia"}, description="Python")]
+    merged = fetch_meetup.merge_events(ical, api)
+    assert merged == [ical[0], api[0]]
+    # Same richness: the earlier source wins
+    assert fetch_meetup.merge_events(ical, [_event(1, 0)]) == ical
+
+
+def test_merge_keeps_events_without_an_id():
+    anonymous = {"description": "sin enlace ni fecha"}
+    merged = fetch_meetup.merge_events([anonymous], [anonymous, _event(1, NOW_MS)])
+    assert merged == [anonymous, anonymous, _event(1, NOW_MS)]
+
+
+@pytest.mark.parametrize(
+    "left_ms, delay",
+    [
+        (None, POLL_MAX_S),
+        (-HOUR_MS, POLL_MAX_S),  # the event already started
+        (HOUR_MS, 5 * 60),
+        (3 * HOUR_MS + 10 * 60_000, 10 * 60),  # until the 5 min row applies
+        (3 * HOUR_MS + 1000, POLL_MIN_S),
+        (12 * HOUR_MS, 15 * 60),
+        (3 * 24 * HOUR_MS, 3600),
+        (7 * 24 * HOUR_MS + HOUR_MS, 3600),  # until the hourly row applies
+        (30 * 24 * HOUR_MS, POLL_MAX_S),
+    ],
+)
+def test_poll_delay_tightens_as_the_next_event_nears(left_ms, delay):
+    next_ms = None if left_ms is None else NOW_MS + left_ms
+    assert fetch_meetup.poll_delay(NOW_MS, next_ms) == delay
+
+
+def test_shards_split_upcoming_and_local_years():
+    events = [
+        _event(1, 1768500000000, group="python_zgz"),  # upcoming
+        _event(2, 1748797200000),  # 2025-06-01
+        _event(3, 1735687800000, group="pydata_zgz"),  # 2025-01-01 00:30 Madrid
+        _event(4, 1717261200000),  # 2024-06-01
+    ]
+    files = fetch_meetup.shard_events(events, NOW_MS)
+    index = json.loads(files["events-index.json"])
+    assert index["groups"] == ["pydata_zgz", "python_zgz"]
+    assert index["upcoming"]["count"] == 1
+    assert [(y["year"], y["count"]) for y in index["years"]] == [(2025, 2), (2024, 1)]
+    assert [ev["link"] for ev in json.loads(files["events-2025.json"])] == [
+        events[1]["link"],
+        events[2]["link"],
+    ]
+    for shard in [index["upcoming"], *index["years"]]:
+        assert shard["sha256"] == fetch_meetup._sha256(files[shard["path"]])
+
+
+@pytest.fixture
+def assets(tmp_path, monkeypatch):
+    """Export paths in ``tmp_path`` and a fixed now."""
+    monkeypatch.setattr(fetch_meetup, "ASSETS_DIR", str(tmp_path))
+    monkeypatch.setattr(fetch_meetup, "OUTPUT_PATH", str(tmp_path / "events.json"))
+    monkeypatch.setattr(fetch_meetup, "CALENDAR_PATH", str(tmp_path / "cal.json"))
+    monkeypatch.setattr(fetch_meetup, "SHARDS_DIR", str(tmp_path / "data"))
+    monkeypatch.setattr(fetch_meetup, "_now_ms", lambda: NOW_MS)
+    return tmp_path
+
+
+@pytest.mark.usefixtures("store")
+def test_export_writes_changed_files_only(assets):
+    event_store.upsert_events([_event(1, 1768500000000), _event(2, 1748797200000)])
+    stale = assets / "data" / "events-2019.json"
+    stale.parent.mkdir()
+    stale.write_text("[]")
+
+    assert fetch_meetup._export(shards=True) is True
+    assert not stale.exists()
+    assert sorted(os.listdir(assets / "data")) == [
+        "events-2025.json",
+        "events-index.json",
+        "events-upcoming.json",
+    ]
+    assert len(json.loads((assets / "events.json").read_text())) == 2
+    assert (assets / "cal.json").exists()
+
+    mtimes = {p: p.stat().st_mtime_ns for p in assets.rglob("*.json")}
+    assert fetch_meetup._export(shards=True) is False
+    assert {p: p.stat().st_mtime_ns for p in assets.rglob("*.json")} == mtimes
+    assert not [p for p in assets.rglob(".*")]  # no temp files left behind
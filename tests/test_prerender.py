@@ -0,0 +1,16 @@
+import reflex as rx
+
+import prerender
+from pyzgz import layout
+
+
+def test_placeholders_are_not_content():
+    shell = rx.box(rx.heading("Evento"), layout.placeholder("Cargando evento…"))
+    assert list(prerender._texts(shell)) == ["Evento"]
+
+
+def test_content_offset():
+    html = b"<main><h1>Pr\xc3\xb3ximos eventos</h1><p>Tom &amp; Jerry</p></main>"
+    assert prerender.content_offset(html, ["Próximos eventos"]) == html.index(b"</h1>")
+    assert prerender.content_offset(html, ["Tom & Jerry"]) is not None
+    assert prerender.content_offset(html, ["Cargando evento…"]) is None
@@ -0,0 +1,162 @@
+import asyncio
+import os
+
+import pytest
+from sqlmodel import Session, select
+from starlette.testclient import TestClient
+
+from pyzgz import talk_proposals
+from pyzgz.talk_proposals import RateLimiter, TalkProposal, WriteQueue
+
+PDF = b"%PDF-1.4\n" + b"x" * 1000
+FIELDS = {
+    "title": "Nix your python mess",
+    "speaker": "Ada",
+    "email": "ada@example.org",
+    "level": "intermedio",
+    "summary": "Entornos reproducibles",
+    "duration": "30",
+}
+JSON = {"Accept": "application/json"}
+
+
+pytestmark = pytest.mark.usefixtures("store")
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """The API on a fresh database, upload dir, queue and rate limiter."""
+    talk_proposals._engine.cache_clear()
+    monkeypatch.setattr(talk_proposals, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(talk_proposals, "queue", WriteQueue())
+    monkeypatch.setattr(talk_proposals, "limiter", RateLimiter(burst=3, refill_s=60))
+    with TestClient(talk_proposals.api_app()) as client:
+        yield client
+    talk_proposals._engine.cache_clear()
+
+
+def _post(client, fields=FIELDS, files=None):
+    files = dict(files or {})
+    files.update({name: (None, value) for name, value in fields.items()})
+    return client.post(talk_proposals.SUBMIT_PATH, files=files, headers=JSON)
+
+
+def _proposals():
+    with Session(talk_proposals._engine()) as session:
+        return session.exec(select(TalkProposal)).all()
+
+
+def _uploads():
+    if not os.path.isdir(talk_proposals.UPLOAD_DIR):
+        return []
+    return sorted(os.listdir(talk_proposals.UPLOAD_DIR))
+
+
+def test_accepts_a_proposal_with_its_pdf(client):
+    r = _post(client, files={"attachment": ("charla.pdf", PDF, "application/pdf")})
+    assert r.status_code == 201
+    assert r.json() == {"ok": True, "id": 1}
+    [proposal] = _proposals()
+    assert (proposal.title, proposal.duration) == ("Nix your python mess", 30)
+    assert _uploads() == [proposal.attachment]
+    assert proposal.attachment_bytes == len(PDF)
+
+
+def test_browsers_are_redirected(client):
+    r = client.post(
+        talk_proposals.SUBMIT_PATH,
+        files={name: (None, value) for name, value in FIELDS.items()},
+        follow_redirects=False,
+    )
+    assert r.status_code == 303
+    assert r.headers["location"].endswith(talk_proposals.SENT_ROUTE)
+
+
+@pytest.mark.parametrize(
+    "fields, files, status",
+    [
+        ({**FIELDS, "email": "no"}, None, 400),
+        ({k: v for k, v in FIELDS.items() if k != "title"}, None, 400),
+        ({**FIELDS, "duration": "999"}, None, 400),
+        ({**FIELDS, "summary": b"\xff\xfe"}, None, 400),
+        ({**FIELDS, "website": b"\xff\xfe"}, None, 400),
+        ({**FIELDS, "message": "x" * 30_000}, None, 413),
+        (
+            FIELDS,
+            {"attachment": ("charla.pdf", b"MZ not a pdf", "application/pdf")},
+            415,
+        ),
+    ],
+)
+def test_rejects_bad_input_and_keeps_nothing(client, fields, files, status):
+    r = _post(client, fields, files)
+    assert r.status_code == status
+    assert r.json()["ok"] is False
+    assert _proposals() == []
+    assert _uploads() == []
+
+
+def test_rejects_an_oversized_pdf(client, monkeypatch):
+    monkeypatch.setattr(talk_proposals, "MAX_PDF_BYTES", 512)
+    r = _post(client, files={"attachment": ("charla.pdf", PDF, "application/pdf")})
+    assert r.status_code == 413
+    assert _uploads() == []
+
+
+def test_rejects_a_malformed_body(client):
+    r = client.post(
+        talk_proposals.SUBMIT_PATH,
+        content=b"--b\r\nno headers here",
+        headers={**JSON, "Content-Type": "multipart/form-data; boundary=zz"},
+    )
+    assert r.status_code == 400
+    r = client.post(talk_proposals.SUBMIT_PATH, json=FIELDS, headers=JSON)
+    assert r.status_code == 415
+
+
+def test_honeypot_is_answered_but_not_stored(client):
+    r = _post(client, {**FIELDS, "website": "http://spam.example"})
+    assert r.status_code == 201
+    assert _proposals() == []
+
+
+def test_rate_limit_answers_429_before_reading_the_body(client):
+    for _ in range(3):
+        assert _post(client).status_code == 201
+    r = _post(client)
+    assert r.status_code == 429
+    assert 0 < int(r.headers["Retry-After"]) <= 60
+    assert len(_proposals()) == 3
+
+
+def test_rate_limiter_refills():
+    limiter = RateLimiter(burst=2, refill_s=10)
+    assert limiter.take("a", now=0) == limiter.take("a", now=0) == 0
+    assert limiter.take("a", now=0) == pytest.approx(10)
+    assert limiter.take("b", now=0) == 0  # buckets are per client
+    assert limiter.take("a", now=5) == pytest.approx(5)
+    assert limiter.take("a", now=10) == 0
+
+
+def test_rate_limiter_forgets_clients_past_max():
+    limiter = RateLimiter(burst=1, refill_s=10, max_clients=4)
+    for i in range(10):
+        assert limiter.take(str(i), now=i) == 0
+    assert len(limiter._buckets) <= 4
+    assert limiter.take("9", now=9) > 0  # the most recent are kept
+
+
+def test_write_queue_batches_concurrent_inserts():
+    talk_proposals._engine.cache_clear()
+    queue = WriteQueue(batch_wait_s=0.05)
+    row = {k: v for k, v in FIELDS.items() if k != "duration"}
+
+    async def insert_many():
+        return await asyncio.gather(
+            *(queue.insert({**row, "created_at": i}) for i in range(10))
+        )
+
+    ids = asyncio.run(insert_many())
+    assert sorted(ids) == list(range(1, 11))
+    assert (queue.batches, queue.rows) == (1, 10)
+    talk_proposals._engine.cache_clear()